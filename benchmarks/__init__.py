@@ -0,0 +1,4 @@
+"""
+Offline benchmarks for LinkedIntel.
+They run against the in-memory FakeDriver and fixture pages, no browser needed.
+"""
@@ -0,0 +1,184 @@
+import json
+import random
+from html import escape
+
+import lxml.html
+
+from config import LINKEDIN_FEED_URL
+
+FIRST_NAMES = ["Jane", "John", "Priya", "Wei", "Carlos", "Amara", "Lena", "Omar", "Sofia", "Kenji"]
+LAST_NAMES = ["Doe", "Smith", "Sharma", "Chen", "Garcia", "Okafor", "Fischer", "Haddad", "Rossi", "Tanaka"]
+OCCUPATIONS = ["Software Engineer", "Product Manager", "Data Scientist", "Recruiter", "Founder", "Designer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries"]
+POST_TEMPLATES = [
+    "I'm happy to share that I'm starting a new position as {occupation} at {company}!",
+    "We just launched our new {topic} platform. Here is what we learned building it over the last year.",
+    "We're hiring! Apply now for {occupation} roles at {company}. #hiring #jobs #careers #work",
+    "Three lessons about {topic} that nobody told me when I started my career as a {occupation}.",
+    "Excited to be speaking at the {topic} summit next week. Join our webinar and register today.",
+]
+TOPICS = ["AI", "cloud", "python", "leadership", "data engineering", "security"]
+
+
+def person(rng, index):
+    first = rng.choice(FIRST_NAMES)
+    last = rng.choice(LAST_NAMES)
+    return {
+        "name": f"{first} {last}",
+        "profile_id": f"{first.lower()}-{last.lower()}-{index}",
+        "occupation": rng.choice(OCCUPATIONS),
+        "company": rng.choice(COMPANIES),
+    }
+
+
+def post_text(rng):
+    return rng.choice(POST_TEMPLATES).format(
+        occupation=rng.choice(OCCUPATIONS), company=rng.choice(COMPANIES), topic=rng.choice(TOPICS)
+    )
+
+
+def feed_post_html(urn, author, text, sponsored=False):
+    """Markup of one feed post matching the selectors in core.selector_registry"""
+    profile_url = f"https://www.linkedin.com/in/{author['profile_id']}/"
+    sub_description = "Promoted" if sponsored else "2h"
+    return (
+        f'<div class="feed-shared-update-v2" data-urn="{urn}">'
+        f'<a class="update-components-actor__meta-link" href="{profile_url}">'
+        f'<span class="update-components-actor__title"><span><span aria-hidden="true">{escape(author["name"])}</span></span></span>'
+        f'<span class="update-components-actor__sub-description"><span aria-hidden="true">{sub_description}</span></span>'
+        f'</a>'
+        f'<div class="feed-shared-update-v2__description">{escape(text)}</div>'
+        f'<div class="feed-shared-social-actions">'
+        f'<button aria-label="React Like" aria-pressed="false">Like</button>'
+        f'<button class="comment-button">Comment</button>'
+        f'</div>'
+        f'<div class="comments-comment-box" style="display:none">'
+        f'<div class="ql-editor" contenteditable="true"></div>'
+        f'<button class="comments-comment-box__submit-button--cr">Post</button>'
+        f'</div>'
+        f'</div>'
+    )
+
+
+def feed_update_json(urn, author, text):
+    """One feed update as the normalized feed API returns it, matching feed_post_html"""
+    return {
+        "$type": "com.linkedin.voyager.dash.feed.Update",
+        "entityUrn": f"urn:li:fsd_update:({urn},MAIN_FEED,EMPTY,DEFAULT,false)",
+        "metadata": {"backendUrn": urn, "trackingId": "fixture"},
+        "actor": {
+            "name": {"$type": "com.linkedin.voyager.dash.common.text.TextViewModel", "text": author["name"]},
+            "description": {"text": f"{author['occupation']} at {author['company']}"},
+            "navigationContext": {"actionTarget": f"https://www.linkedin.com/in/{author['profile_id']}/"},
+        },
+        "commentary": {"text": {"text": text}},
+        "socialDetail": {"*totalSocialActivityCounts": f"urn:li:fsd_socialActivityCounts:{urn}"},
+    }
+
+
+def feed_response_json(updates):
+    """Normalized feed API response body listing `updates` in feed order"""
+    return json.dumps({
+        "data": {
+            "$type": "com.linkedin.restli.common.CollectionResponse",
+            "*elements": [update["entityUrn"] for update in updates],
+            "paging": {"start": 0, "count": len(updates)},
+        },
+        "included": [
+            {"$type": "com.linkedin.voyager.dash.feed.SocialActivityCounts", "numLikes": 3},
+            *reversed(updates),
+        ],
+    })
+
+
+FEED_RESPONSE_URL = "https://www.linkedin.com/voyager/api/feed/dash/feedUpdates?q=feed&count=10"
+
+
+def feed_page_html(count, seed=0, start=0):
+    rng = random.Random(seed)
+    posts = "".join(
+        feed_post_html(f"urn:li:activity:{7000000000000000000 + i}", person(rng, i), post_text(rng))
+        for i in range(start, start + count)
+    )
+    return f'<html><body><main class="scaffold-finite-scroll__content">{posts}</main></body></html>'
+
+
+class FeedFixture:
+    """
+    Feed source for a FakeDriver: every visit serves a fresh batch of posts and
+    scrolling appends more, like LinkedIn's infinite scroll.
+    Once attached to a driver, each batch is also emitted as a feed API response.
+    """
+
+    def __init__(self, batch_size=10, seed=0):
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.next_index = 0
+        self.driver = None
+
+    def attach(self, driver):
+        self.driver = driver
+        return self
+
+    def _batch(self):
+        """Markup of the next batch of posts, emitting the matching API response"""
+        markup, updates = [], []
+        for _ in range(self.batch_size):
+            index = self.next_index
+            self.next_index += 1
+            urn, author, text = f"urn:li:activity:{7000000000000000000 + index}", person(self.rng, index), post_text(self.rng)
+            markup.append(feed_post_html(urn, author, text))
+            updates.append(feed_update_json(urn, author, text))
+        if self.driver is not None:
+            self.driver.emit_response(FEED_RESPONSE_URL, feed_response_json(updates))
+        return markup
+
+    def page(self, url=None):
+        posts = "".join(self._batch())
+        return f'<html><body><main class="scaffold-finite-scroll__content">{posts}</main></body></html>'
+
+    def on_scroll(self, driver):
+        containers = driver.root.cssselect("main.scaffold-finite-scroll__content")
+        if not containers:
+            return
+        for post in self._batch():
+            containers[0].append(lxml.html.fragment_fromstring(post))
+
+    def pages(self):
+        return {LINKEDIN_FEED_URL: self.page}
+
+
+def search_result_html(profile):
+    return (
+        f'<li class="reusable-search__result-container">'
+        f'<span class="entity-result__title-text"><a href="https://www.linkedin.com/in/{profile["profile_id"]}/">{escape(profile["name"])}</a></span>'
+        f'<div class="entity-result__primary-subtitle">{escape(profile["occupation"])}</div>'
+        f'<div class="entity-result__secondary-subtitle">{escape(profile["company"])}</div>'
+        f'<button class="artdeco-button" aria-label="Connect with {escape(profile["name"])}">Connect</button>'
+        f'</li>'
+    )
+
+
+def search_page_html(count, seed=0, start=0):
+    rng = random.Random(seed)
+    results = "".join(search_result_html(person(rng, i)) for i in range(start, start + count))
+    return f'<html><body><ul class="reusable-search__entity-result-list">{results}</ul></body></html>'
+
+
+def connection_card_html(profile, connected_time="Connected 2 weeks ago"):
+    return (
+        f'<li class="mn-connection-card">'
+        f'<a class="mn-connection-card__link" href="https://www.linkedin.com/in/{profile["profile_id"]}/">'
+        f'<span class="mn-connection-card__name">{escape(profile["name"])}</span>'
+        f'<span class="mn-connection-card__occupation">{escape(profile["occupation"])} at {escape(profile["company"])}</span>'
+        f'</a>'
+        f'<time class="time-badge">{connected_time}</time>'
+        f'<button aria-label="Message {escape(profile["name"])}">Message</button>'
+        f'</li>'
+    )
+
+
+def connections_page_html(count, seed=0, start=0):
+    rng = random.Random(seed)
+    cards = "".join(connection_card_html(person(rng, i)) for i in range(start, start + count))
+    return f'<html><body><ul class="mn-connection-grid">{cards}</ul></body></html>'
@@ -0,0 +1,33 @@
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+
+from core.connections_index import ConnectionsIndex
+
+EMPTY_HISTORY = {"likes": {}, "comments": {}, "connections": {}, "messages": {}}
+
+
+def isolate_history(component, directory):
+    """Point a component's history file at a scratch directory and start it empty"""
+    component.history_path = Path(directory) / "history.json"
+    component.action_history = {key: {} for key in EMPTY_HISTORY}
+    if hasattr(component, "connections"):
+        component.connections = ConnectionsIndex(Path(directory) / "connections_index.json", clock=component.clock)
+    return component
+
+
+@contextmanager
+def scratch_dir():
+    with tempfile.TemporaryDirectory(prefix="linkedintel-bench-") as directory:
+        yield Path(directory)
+
+
+def report(name, items, elapsed, commands):
+    """Print throughput and WebDriver round trips per item"""
+    per_second = items / elapsed if elapsed else float("inf")
+    round_trips = sum(commands.values())
+    print(f"{name}: {items} items in {elapsed:.2f}s ({per_second:,.0f}/s), "
+          f"{round_trips / max(items, 1):.1f} driver commands per item")
+    for command, count in commands.most_common():
+        print(f"    {command}: {count / max(items, 1):.1f}")
+
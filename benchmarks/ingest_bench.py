@@ -0,0 +1,138 @@
+"""
+Feed ingestion benchmark: scrapes the same fixture feed through the rendered DOM
+and through the captured feed API responses, checks both produce the same posts
+and compares time and WebDriver round trips.
+
+    python -m benchmarks.ingest_bench --posts 100 --batch-size 10
+
+With --seen, a second run over a feed whose top posts were handled before is
+also measured, with and without the seen-posts filter.
+
+    python -m benchmarks.ingest_bench --posts 100 --seen
+
+With --responses, responses recorded by a live run (SAVE_RESPONSES) are decoded
+offline instead and every file must yield posts with an author and text.
+
+    python -m benchmarks.ingest_bench --responses data/responses
+"""
+import io
+import sys
+import time
+import argparse
+import contextlib
+
+from core.feed_scrapper import FeedScraper
+from core.network_feed import NetworkFeedScraper, decode_feed_response
+from config import LINKEDIN_FEED_URL
+from utils.bloom import SeenPosts
+from utils.clock import VirtualClock
+from utils.fake_driver import FakeDriver
+from utils.network_capture import load_recorded_responses
+from benchmarks import fixtures
+from benchmarks.harness import report, scratch_dir
+
+
+def scrape(scraper_class, post_count, batch_size):
+    feed = fixtures.FeedFixture(batch_size=batch_size)
+    driver = FakeDriver(feed.pages(), on_scroll=feed.on_scroll)
+    feed.attach(driver)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        posts = scraper_class(clock=VirtualClock()).scrape_feed(driver, post_count)
+    elapsed = time.perf_counter() - start
+
+    report(f"{scraper_class.__name__}.scrape_feed", len(posts), elapsed, driver.commands)
+    return posts
+
+
+def compare(post_count, batch_size):
+    dom_posts = scrape(FeedScraper, post_count, batch_size)
+    network_posts = scrape(NetworkFeedScraper, post_count, batch_size)
+
+    mismatches = [
+        (dom, network) for dom, network in zip(dom_posts, network_posts)
+        if dom.to_dict() != network.to_dict()
+    ]
+    if len(dom_posts) != len(network_posts) or mismatches:
+        print(f"MISMATCH: dom={len(dom_posts)} posts, network={len(network_posts)} posts")
+        for dom, network in mismatches[:5]:
+            print(f"  dom:     {dom.to_dict()}")
+            print(f"  network: {network.to_dict()}")
+        return False
+    print(f"OK: both engines produced the same {len(dom_posts)} posts")
+    return True
+
+
+def rescrape(post_count):
+    """Collect post_count new posts from a feed whose top post_count posts were already handled"""
+    page = fixtures.feed_page_html(post_count * 2)
+    new_ids = None
+    with scratch_dir() as directory:
+        seen = SeenPosts(directory / "seen_posts.json", history_path=directory / "history.json")
+        for post_id in range(post_count):
+            seen.add(f"urn:li:activity:{7000000000000000000 + post_id}")
+
+        for label, scraper, wanted in (
+            ("without seen filter", FeedScraper(clock=VirtualClock()), post_count * 2),
+            ("with seen filter", FeedScraper(clock=VirtualClock(), seen=seen), post_count),
+        ):
+            driver = FakeDriver({LINKEDIN_FEED_URL: page})
+            with contextlib.redirect_stdout(io.StringIO()):
+                posts = scraper.scrape_feed(driver, wanted)
+            fresh = [post.post_id for post in posts if post.post_id not in seen]
+            commands = sum(driver.commands.values())
+            print(f"rescrape {label}: {len(posts)} posts extracted, {len(fresh)} new, "
+                  f"{commands / max(len(fresh), 1):.1f} driver commands per new post")
+            if new_ids is not None and fresh != new_ids:
+                print("MISMATCH: the filtered run found different new posts")
+                return False
+            new_ids = fresh
+    return True
+
+
+def replay(directory):
+    recorded = load_recorded_responses(directory)
+    if not recorded:
+        print(f"No recorded responses in {directory}")
+        return False
+
+    failures = 0
+    start = time.perf_counter()
+    for path, url, body in recorded:
+        try:
+            posts = decode_feed_response(body)
+        except ValueError as e:
+            print(f"  {path.name}: not JSON ({e})")
+            failures += 1
+            continue
+        complete = sum(1 for post in posts if post.post_text and post.author_name != "Unknown")
+        print(f"  {path.name}: {len(posts)} posts, {complete} with author and text")
+        if not complete:
+            failures += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"Decoded {len(recorded)} responses in {elapsed * 1000:.1f}ms, {failures} without usable posts")
+    return failures == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare DOM and network feed ingestion")
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=10, help="Posts loaded per scroll")
+    parser.add_argument("--seen", action="store_true", help="Also measure skipping posts seen in earlier runs")
+    parser.add_argument("--responses", help="Decode recorded feed responses from this directory instead")
+    args = parser.parse_args()
+
+    if args.responses:
+        ok = replay(args.responses)
+    else:
+        ok = compare(args.posts, args.batch_size)
+        if args.seen:
+            ok = rescrape(args.posts) and ok
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
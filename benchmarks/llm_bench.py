@@ -0,0 +1,79 @@
+"""
+LLM request cost of the post analysis with each way of sending the fixed
+instructions (inline in every prompt, as a system instruction, as cached
+context), against the offline fake LLM on a virtual clock.
+
+    python -m benchmarks.llm_bench --posts 500 --prefill-latency 0.2
+
+Latency is simulated: the fake LLM's base latency plus --prefill-latency
+seconds per 1000 input tokens, cached tokens at a quarter of the cost.
+"""
+import io
+import random
+import argparse
+import contextlib
+
+from core.ai_filter import AIFilter
+from core.bulk_analysis import BulkAnalyzer
+from core.post import Post
+from utils.clock import VirtualClock
+from utils.fake_llm import FakeLLMClient, CHARS_PER_TOKEN
+from benchmarks import fixtures
+from benchmarks.harness import scratch_dir
+
+MODES = ("off", "system", "cache")
+
+
+def fixture_posts(count, seed=0):
+    rng = random.Random(seed)
+    posts = []
+    for index in range(count):
+        author = fixtures.person(rng, index)
+        # Numbered so every post is a distinct LLM request
+        text = f"{fixtures.post_text(rng)} Post {index} of the benchmark feed."
+        posts.append(Post(post_id=f"urn:li:activity:{7000000000000000000 + index}", author_name=author["name"],
+                          post_text=text))
+    return posts
+
+
+def bench_mode(mode, posts, directory, args):
+    clock = VirtualClock()
+    llm = FakeLLMClient(latency=args.latency, clock=clock, prefill_latency=args.prefill_latency,
+                        cache_min_tokens=args.cache_min_tokens)
+    ai_filter = AIFilter(llm_client=llm)
+    ai_filter.cache_dir = directory / f"cache_{mode}"
+    ai_filter.cache_dir.mkdir()
+    ai_filter.near_duplicates = None
+    ai_filter.use_cache = False
+    ai_filter.context_mode = mode
+
+    # The analyzer prints every response, only the summary is of interest here
+    with contextlib.redirect_stdout(io.StringIO()):
+        BulkAnalyzer(ai_filter, workers=1, clock=clock).run(posts, directory / f"analysis_{mode}.jsonl")
+    ai_filter.release_context()
+
+    calls = max(llm.calls, 1)
+    print(f"{mode:>6} (used {ai_filter.context_mode}): {llm.calls} calls, "
+          f"{llm.prompt_chars / CHARS_PER_TOKEN / calls:.0f} input tokens/call, "
+          f"{llm.cached_chars / CHARS_PER_TOKEN / calls:.0f} cached tokens/call, "
+          f"{clock.elapsed / calls * 1000:.0f}ms simulated latency/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark instruction caching of the post analysis")
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.3, help="Base latency of the fake LLM in seconds")
+    parser.add_argument("--prefill-latency", type=float, default=0.2,
+                        help="Extra seconds per 1000 uncached input tokens")
+    parser.add_argument("--cache-min-tokens", type=int, default=0,
+                        help="Smallest context the fake LLM agrees to cache (the real API has a minimum)")
+    args = parser.parse_args()
+
+    posts = fixture_posts(args.posts)
+    with scratch_dir() as directory:
+        for mode in MODES:
+            bench_mode(mode, posts, directory, args)
+
+
+if __name__ == "__main__":
+    main()
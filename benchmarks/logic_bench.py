@@ -0,0 +1,159 @@
+"""
+Logic-level benchmark of the automation paths against the in-memory FakeDriver.
+
+    python -m benchmarks.logic_bench --posts 2000 --profiles 500 --connections 500
+"""
+import time
+import argparse
+
+from config import LINKEDIN_FEED_URL
+from core.action_engine import ActionEngine
+from core.connect import LinkedInConnect
+from core.feed_pruner import FeedPruner
+from core.message_writer import MessageWriter
+from core.messenger import LinkedInMessenger
+from core.post import Post
+from core.selector_registry import selectors
+from utils.clock import VirtualClock, system_clock
+from utils.fake_llm import FakeLLMClient
+from utils.metrics import metrics
+from utils.fake_driver import FakeDriver
+from benchmarks import fixtures
+from benchmarks.harness import isolate_history, scratch_dir, report
+
+SEARCH_URL = "https://www.linkedin.com/search/results/people/?keywords=engineer"
+CONNECTIONS_URL = "https://www.linkedin.com/mynetwork/invite-connect/connections/"
+
+LIKE_AND_COMMENT = {
+    "should_like": True,
+    "should_comment": True,
+    "comment_text": "Great insights, thanks for sharing!",
+    "reasoning": "benchmark"
+}
+
+
+def bench_actions(post_count, directory):
+    driver = FakeDriver({LINKEDIN_FEED_URL: fixtures.feed_page_html(post_count)})
+    driver.get(LINKEDIN_FEED_URL)
+    engine = isolate_history(ActionEngine(VirtualClock()), directory)
+    # Every post is acted on, the daily limits would stop after the first few
+    engine.daily_limits = {}
+    posts = [
+        Post(post_id=element.get_attribute("data-urn"))
+        for element in selectors.find_all(driver, "feed.post")
+    ]
+    driver.commands.clear()
+
+    start = time.perf_counter()
+    for post in posts:
+        engine.perform_actions(driver, post, LIKE_AND_COMMENT)
+    elapsed = time.perf_counter() - start
+
+    assert len(driver.likes) == post_count, f"expected {post_count} likes, got {len(driver.likes)}"
+    assert len(driver.comments) == post_count, f"expected {post_count} comments, got {len(driver.comments)}"
+    report("perform_actions", post_count, elapsed, driver.commands)
+
+
+def bench_long_session(post_count, directory, prune):
+    """Act on every post of one long feed page, comparing early and late per-post cost"""
+    driver = FakeDriver({LINKEDIN_FEED_URL: fixtures.feed_page_html(post_count)})
+    driver.get(LINKEDIN_FEED_URL)
+    clock = VirtualClock()
+    engine = isolate_history(ActionEngine(clock), directory)
+    # Rewriting history.json scales with the total history, not the session, so it is left out here
+    engine._save_history = lambda: None
+    engine.daily_limits = {}
+    pruner = FeedPruner(enabled=prune, clock=clock)
+    posts = [
+        Post(post_id=element.get_attribute("data-urn"))
+        for element in selectors.find_all(driver, "feed.post")
+    ]
+
+    durations = []
+    for post in posts:
+        start = time.perf_counter()
+        engine.perform_actions(driver, post, LIKE_AND_COMMENT)
+        pruner.mark_done(driver, post.post_id)
+        durations.append(time.perf_counter() - start)
+    pruner.flush(driver)
+
+    decile = max(1, post_count // 10)
+    first = sum(durations[:decile]) / decile
+    last = sum(durations[-decile:]) / decile
+    label = "pruned" if prune else "unpruned"
+    print(f"long session ({label}): {post_count} posts, first 10% {first * 1000:.2f}ms/post, "
+          f"last 10% {last * 1000:.2f}ms/post ({last / first:.2f}x), "
+          f"{pruner.samples[-1][1]} DOM nodes at the end")
+
+
+def wait_seconds():
+    """Total (simulated) time spent in explicit waits so far"""
+    return sum(totals[1] for name, totals in metrics.totals.items() if name.startswith("wait."))
+
+
+def bench_connect(profile_count, directory, invite_note=True):
+    driver = FakeDriver({SEARCH_URL: fixtures.search_page_html(profile_count)}, invite_note=invite_note)
+    writer = MessageWriter(llm_client=FakeLLMClient(latency=0), cache_dir=directory / "outreach")
+    connect = isolate_history(LinkedInConnect(VirtualClock(), writer), directory)
+    waited_before = wait_seconds()
+
+    start = time.perf_counter()
+    results = connect.search_and_connect(driver, SEARCH_URL, max_connections=profile_count)
+    elapsed = time.perf_counter() - start
+
+    items = results["sent"] + results["skipped"]
+    label = "search_and_connect" if invite_note else "search_and_connect (no note option)"
+    report(label, items, elapsed, driver.commands)
+    print(f"    simulated time in waits: {(wait_seconds() - waited_before) / max(items, 1):.2f}s per item")
+
+
+def bench_messages(connection_count, directory, llm_latency=0.0):
+    """
+    Messaging campaign with the UI on a virtual clock and the LLM sleeping
+    `llm_latency` real seconds per call, so the measured time is the time
+    the UI loop spent waiting for texts.
+    """
+    driver = FakeDriver({CONNECTIONS_URL: fixtures.connections_page_html(connection_count)})
+    llm = FakeLLMClient(latency=llm_latency, clock=system_clock)
+    writer = MessageWriter(llm_client=llm, cache_dir=directory / f"outreach_{llm_latency}")
+    messenger = isolate_history(LinkedInMessenger(VirtualClock(), writer), directory)
+
+    start = time.perf_counter()
+    results = messenger.send_messages_to_connections(driver, max_messages=connection_count)
+    elapsed = time.perf_counter() - start
+
+    items = results["sent"] + results["skipped"]
+    label = "send_messages_to_connections" if not llm_latency else f"send_messages_to_connections (LLM {llm_latency * 1000:.0f}ms)"
+    report(label, items, elapsed, driver.commands)
+    if llm_latency:
+        print(f"    {llm.calls} LLM calls, {elapsed / max(items, 1) * 1000:.1f}ms per message "
+              f"(written one by one in the loop: ~{llm_latency * 1000:.0f}ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark automation logic against the in-memory driver")
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="Also run the messaging campaign against an LLM taking this many real seconds per call")
+    parser.add_argument("--long-session", type=int, default=0,
+                        help="Also act on this many posts of one feed page, with and without DOM pruning")
+    args = parser.parse_args()
+
+    with scratch_dir() as directory:
+        bench_actions(args.posts, directory)
+        if args.long_session:
+            bench_long_session(args.long_session, directory, prune=False)
+            bench_long_session(args.long_session, directory, prune=True)
+        if args.profiles:
+            bench_connect(args.profiles, directory)
+            bench_connect(args.profiles, directory, invite_note=False)
+        if args.connections:
+            bench_messages(args.connections, directory)
+            if args.llm_latency:
+                bench_messages(args.connections, directory, args.llm_latency)
+
+
+if __name__ == "__main__":
+    main()
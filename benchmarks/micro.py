@@ -0,0 +1,328 @@
+"""
+Microbenchmarks of the pure-Python hot paths: response parsing, prompt
+building, cache lookups, history load/save and scans, template rendering.
+History cases run at several scales of synthetic history entries.
+
+    python -m benchmarks.micro run --output benchmarks/micro_baseline.json
+    python -m benchmarks.micro compare benchmarks/micro_baseline.json --threshold 0.2
+
+`compare` runs the suite again (or reads --current) and exits non-zero when a
+case got slower than the baseline by more than the threshold, so it can gate
+changes offline. Timings are the best of --repeat runs per operation, which
+keeps noise from other processes out of the comparison; baselines are only
+comparable on the same machine.
+"""
+import re
+import sys
+import json
+import time
+import random
+import timeit
+import argparse
+import platform
+from pathlib import Path
+
+from config import NEAR_DUPLICATE_MAX_ENTRIES
+from core.action_engine import ActionEngine
+from core.ai_filter import AIFilter
+from core.connect import LinkedInConnect
+from core.messenger import LinkedInMessenger
+from core.post import Post
+from utils.clock import VirtualClock
+from utils.near_duplicates import NearDuplicateIndex
+from utils.parser import parse_ai_response
+from utils.prompt_compiler import compile_post_text, prompt_cache_key
+from benchmarks import fixtures
+from benchmarks.harness import isolate_history, scratch_dir
+
+DEFAULT_SCALES = (1_000, 100_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.2
+# Share of each action type in the synthetic history
+HISTORY_MIX = {"likes": 0.4, "comments": 0.1, "connections": 0.3, "messages": 0.2}
+DAY = 24 * 60 * 60
+
+AI_RESPONSE = (
+    "LIKE: Yes\n"
+    "COMMENT: Yes\n"
+    "COMMENT_TEXT: Congratulations on the launch, Jane! The lessons on data engineering are spot on.\n"
+    "REASONING: Original post about a product launch with concrete lessons, worth engaging with.\n"
+)
+MESSAGE_TEMPLATES = [
+    "Hi {{name}}, thanks for connecting! I'd love to hear what you're working on these days.",
+    "Hello {{name}}, great to be connected. Let me know if there's anything I can help with.",
+    "Hey {{name}}, I enjoyed reading your recent posts. Looking forward to staying in touch.",
+]
+
+CASES = []
+
+
+def case(name, scaled=False):
+    """Register a benchmark case; its setup returns the function to time"""
+    def register(setup):
+        CASES.append((name, scaled, setup))
+        return setup
+    return register
+
+
+def synthetic_history(size, now, seed=0):
+    """Interaction history with `size` entries spread over the last 30 days"""
+    rng = random.Random(seed)
+    history = {action_type: {} for action_type in HISTORY_MIX}
+    for action_type, share in HISTORY_MIX.items():
+        entries = history[action_type]
+        for index in range(int(size * share)):
+            timestamp = now - rng.uniform(0, 30 * DAY)
+            if action_type in ("likes", "comments"):
+                entries[f"urn:li:activity:{7000000000000000000 + index}"] = {
+                    "timestamp": timestamp,
+                    "details": {"author_name": "Jane Doe"},
+                    "count": 1
+                }
+            elif action_type == "connections":
+                profile = fixtures.person(rng, index)
+                entries[profile["profile_id"]] = {"timestamp": timestamp, "details": profile}
+            else:
+                profile = fixtures.person(rng, index)
+                entries[profile["profile_id"]] = {
+                    "timestamp": timestamp,
+                    "name": profile["name"],
+                    "message": MESSAGE_TEMPLATES[0].replace("{{name}}", profile["name"]),
+                    "sent_today": False
+                }
+    return history
+
+
+class Fixtures:
+    """Scratch directory and lazily built, shared inputs for the cases"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.clock = VirtualClock(start=1_750_000_000, seed=0)
+        self.rng = random.Random(0)
+        self._histories = {}
+
+    def history(self, size):
+        if size not in self._histories:
+            # Only one large history is kept in memory at a time
+            self._histories = {size: synthetic_history(size, self.clock.time())}
+        return self._histories[size]
+
+    def history_file(self, size):
+        path = self.directory / f"history_{size}.json"
+        if not path.exists():
+            with open(path, 'w') as f:
+                json.dump(self.history(size), f)
+        return path
+
+    def post(self, index=0):
+        author = fixtures.person(self.rng, index)["name"]
+        return Post(post_id=f"urn:li:activity:{7100000000000000000 + index}", author_name=author,
+                    post_text=fixtures.post_text(self.rng) + " #ai #python #cloud #data https://example.com/post")
+
+
+def offline_filter(directory):
+    """AIFilter reading from a scratch cache, never calling the LLM"""
+    ai_filter = AIFilter(llm_client=object())
+    ai_filter.cache_dir = directory
+    ai_filter.cache_dir.mkdir(exist_ok=True)
+    ai_filter.near_duplicates = None
+    return ai_filter
+
+
+@case("parser.parse_ai_response")
+def bench_parse(data, scale):
+    return lambda: parse_ai_response(AI_RESPONSE)
+
+
+@case("ai_filter.create_prompt")
+def bench_create_prompt(data, scale):
+    ai_filter = offline_filter(data.directory / "prompt_cache")
+    post = data.post()
+    return lambda: ai_filter._create_prompt(post.author_name, compile_post_text(post.post_text))
+
+
+@case("ai_filter.cache_hit")
+def bench_cache_hit(data, scale):
+    """A full analyze_post call answered from the on-disk cache, among 1000 cached posts"""
+    ai_filter = offline_filter(data.directory / "analysis_cache")
+    posts = [data.post(index) for index in range(1000)]
+    for post in posts:
+        key = prompt_cache_key(post.author_name, compile_post_text(post.post_text))
+        with open(ai_filter.cache_dir / f"post_{key}.json", 'w') as f:
+            json.dump(parse_ai_response(AI_RESPONSE), f)
+    post = posts[len(posts) // 2]
+    return lambda: ai_filter.analyze_post(post)
+
+
+@case("near_duplicates.lookup")
+def bench_near_duplicate_lookup(data, scale):
+    """Lookup of an unseen post in a full index"""
+    index = NearDuplicateIndex(index_path=data.directory / "near_duplicates.json")
+    analysis = parse_ai_response(AI_RESPONSE)
+    for position in range(NEAR_DUPLICATE_MAX_ENTRIES):
+        index.add(f"{fixtures.post_text(data.rng)} post number {position} of the synthetic feed", "Jane Doe", analysis)
+    text = "A post nobody wrote before about compilers, coffee and the joy of shipping on a Friday"
+    return lambda: index.lookup(text)
+
+
+@case("history.load", scaled=True)
+def bench_history_load(data, scale):
+    engine = ActionEngine(data.clock)
+    engine.history_path = data.history_file(scale)
+    return engine._load_history
+
+
+@case("history.save", scaled=True)
+def bench_history_save(data, scale):
+    engine = ActionEngine(data.clock)
+    engine.action_history = data.history(scale)
+    engine.history_path = data.directory / "history_save.json"
+    return engine._save_history
+
+
+@case("connect.count_todays_connections", scaled=True)
+def bench_count_todays_connections(data, scale):
+    connect = LinkedInConnect(data.clock)
+    connect.action_history = data.history(scale)
+    return connect._count_todays_connections
+
+
+@case("connect.create_connection_note")
+def bench_connection_note(data, scale):
+    connect = LinkedInConnect(data.clock)
+    profile = fixtures.person(data.rng, 0)
+    return lambda: connect._create_connection_note(profile)
+
+
+@case("messenger.draft_message")
+def bench_draft_message(data, scale):
+    messenger = isolate_history(LinkedInMessenger(data.clock), data.directory)
+    messenger.templates_path = data.directory / "messages.txt"
+    messenger.templates_path.write_text("\n---\n".join(MESSAGE_TEMPLATES))
+    profile = fixtures.person(data.rng, 0)
+    return lambda: messenger._draft_message(profile)
+
+
+def measure(function, repeat):
+    """Best time per call over `repeat` runs of at least 0.2s each"""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_suite(scales, repeat, only=None):
+    """
+    Run every case (scaled ones once per scale)
+
+    Returns:
+        dict: Baseline document with machine metadata and seconds per call by case name
+    """
+    # Scaled cases are grouped by scale so each synthetic history is built once
+    jobs = [(name, None, setup) for name, scaled, setup in CASES if not scaled]
+    jobs += [(name, scale, setup) for scale in scales for name, scaled, setup in CASES if scaled]
+
+    results = {}
+    with scratch_dir() as directory:
+        data = Fixtures(directory)
+        for name, scale, setup in jobs:
+            label = name if scale is None else f"{name}[{scale}]"
+            if only and not re.search(only, label):
+                continue
+            seconds = measure(setup(data, scale), repeat)
+            results[label] = seconds
+            print(f"{label:<45} {format_seconds(seconds):>12}")
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "results": results
+    }
+
+
+def format_seconds(seconds):
+    for unit, factor in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def scales_of(results):
+    """Scales used for a set of results, so a comparison runs the same ones"""
+    return sorted({int(match.group(1)) for label in results if (match := re.search(r"\[(\d+)\]$", label))})
+
+
+def compare(baseline, current, threshold):
+    """
+    Print the change of every case against the baseline
+
+    Returns:
+        list: Labels of the cases slower than the baseline by more than the threshold
+    """
+    regressions = []
+    print(f"\n{'case':<45} {'baseline':>12} {'current':>12} {'change':>8}")
+    for label, before in baseline["results"].items():
+        after = current["results"].get(label)
+        if after is None:
+            print(f"{label:<45} {format_seconds(before):>12} {'missing':>12}")
+            continue
+        change = after / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(label)
+            flag = "  REGRESSION"
+        print(f"{label:<45} {format_seconds(before):>12} {format_seconds(after):>12} {change:>+7.0%}{flag}")
+    for label in sorted(set(current["results"]) - set(baseline["results"])):
+        print(f"{label:<45} {'new':>12} {format_seconds(current['results'][label]):>12}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks of the pure-Python hot paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite and optionally store the results as a baseline")
+    run_parser.add_argument("--output", help="Write the results to this JSON file")
+
+    compare_parser = commands.add_parser("compare", help="Compare against a stored baseline")
+    compare_parser.add_argument("baseline", help="Baseline JSON written by `run --output`")
+    compare_parser.add_argument("--current", help="Results to compare instead of running the suite now")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Relative slowdown counted as a regression (0.2 = 20%%)")
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--scales", help="Comma-separated history sizes (default 1000,100000,1000000; "
+                                          "compare defaults to the baseline's)")
+        sub.add_argument("--repeat", type=int, default=5, help="Timed runs per case, the best one counts")
+        sub.add_argument("--only", help="Regex selecting the cases to run")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",")] if args.scales else None
+
+    if args.command == "run":
+        results = run_suite(scales or list(DEFAULT_SCALES), args.repeat, args.only)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"\nBaseline written to {args.output}")
+        return
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current, 'r') as f:
+            current = json.load(f)
+    else:
+        current = run_suite(scales or scales_of(baseline["results"]) or list(DEFAULT_SCALES), args.repeat, args.only)
+        if args.only:
+            baseline["results"] = {label: value for label, value in baseline["results"].items()
+                                   if re.search(args.only, label)}
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nNo regressions above {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Soak benchmark: drives the feed, connect and message paths for hours of
+simulated time against fixture pages, the in-memory driver and the fake LLM,
+then fails if memory or disk grow faster than the per-item budget.
+
+    python -m benchmarks.soak --hours 8 --posts-per-cycle 10
+"""
+import io
+import os
+import sys
+import resource
+import argparse
+import tracemalloc
+import contextlib
+
+from config import LINKEDIN_FEED_URL
+from core.ai_filter import AIFilter
+from core.action_engine import ActionEngine
+from core.checkpoint import RunCheckpoint
+from core.connect import LinkedInConnect
+from core.feed_pruner import FeedPruner
+from core.feed_scrapper import FeedScraper
+from core.message_writer import MessageWriter
+from core.messenger import LinkedInMessenger
+from core.prefilter import PostPreFilter
+from main import process_feed
+from utils.bloom import SeenPosts
+from utils.clock import VirtualClock
+from utils.fake_driver import FakeDriver
+from utils.corpus import PostCorpus
+from utils.fake_llm import FakeLLMClient
+from utils.near_duplicates import NearDuplicateIndex
+from benchmarks import fixtures
+from benchmarks.harness import isolate_history, scratch_dir
+
+SEARCH_URL = "https://www.linkedin.com/search/results/people/?keywords=engineer"
+CONNECTIONS_URL = "https://www.linkedin.com/mynetwork/invite-connect/connections/"
+
+
+class PageSequence:
+    """Serve a fresh fixture page (new people) on every visit"""
+
+    def __init__(self, builder, size):
+        self.builder = builder
+        self.size = size
+        self.visits = 0
+
+    def __call__(self, url):
+        html = self.builder(self.size, seed=self.visits, start=self.visits * self.size)
+        self.visits += 1
+        return html
+
+
+def rss_bytes():
+    """Current resident set size, falls back to the peak where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def disk_bytes(directory):
+    total = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+class SoakRun:
+    def __init__(self, directory, args, clock):
+        self.args = args
+        self.clock = clock
+        self.feed = fixtures.FeedFixture(batch_size=args.posts_per_cycle)
+        self.driver = FakeDriver(
+            {
+                **self.feed.pages(),
+                SEARCH_URL: PageSequence(fixtures.search_page_html, args.profiles_per_cycle),
+                CONNECTIONS_URL: PageSequence(fixtures.connections_page_html, args.connections_per_cycle),
+            },
+            on_scroll=self.feed.on_scroll
+        )
+
+        self.pruner = FeedPruner(enabled=not args.no_prune, clock=clock)
+        self.seen = SeenPosts(directory / "seen_posts.json", clock=clock, history_path=directory / "history.json")
+        self.scraper = FeedScraper(self.pruner, clock=clock, seen=self.seen)
+        self.prefilter = PostPreFilter()
+        self.llm = FakeLLMClient(latency=args.llm_latency, clock=clock)
+        self.ai_filter = AIFilter(llm_client=self.llm)
+        self.ai_filter.cache_dir = directory / "cache"
+        self.ai_filter.cache_dir.mkdir(exist_ok=True)
+        self.ai_filter.near_duplicates = NearDuplicateIndex(index_path=directory / "near_duplicates.json")
+        self.engine = isolate_history(ActionEngine(clock), directory)
+        # Keep acting on every post, so each simulated day does the same work
+        self.engine.daily_limits = {}
+        self.writer = MessageWriter(llm_client=self.llm, cache_dir=directory / "cache")
+        self.connect = isolate_history(LinkedInConnect(clock, self.writer), directory)
+        self.messenger = isolate_history(LinkedInMessenger(clock, self.writer), directory)
+        self.checkpoint = RunCheckpoint("feed", checkpoint_dir=directory / "checkpoints", clock=clock)
+        self.corpus = PostCorpus(directory / "corpus.jsonl", clock=clock)
+        self.items = 0
+        self.dom_nodes = []
+
+    def cycle(self):
+        """One scheduled run of every mode, output suppressed"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_feed(self.driver, self.scraper, self.ai_filter, self.engine,
+                         self.args.posts_per_cycle, prefilter=self.prefilter, checkpoint=self.checkpoint,
+                         corpus=self.corpus, pruner=self.pruner, clock=self.clock,
+                         seen=self.seen)
+            self.dom_nodes.append(sum(1 for _ in self.driver.root.iter()))
+            connected = self.connect.search_and_connect(self.driver, SEARCH_URL, self.args.profiles_per_cycle)
+            messaged = self.messenger.send_messages_to_connections(self.driver, self.args.connections_per_cycle)
+        self.items += self.args.posts_per_cycle
+        self.items += connected["sent"] + connected["skipped"]
+        self.items += messaged["sent"] + messaged["skipped"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak benchmark with memory and disk growth budgets")
+    parser.add_argument("--hours", type=float, default=8.0, help="Simulated hours to run")
+    parser.add_argument("--cycle-minutes", type=float, default=30.0, help="Simulated time between scheduled runs")
+    parser.add_argument("--posts-per-cycle", type=int, default=10)
+    parser.add_argument("--profiles-per-cycle", type=int, default=5)
+    parser.add_argument("--connections-per-cycle", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Simulated LLM latency in seconds")
+    parser.add_argument("--warmup-cycles", type=int, default=3)
+    parser.add_argument("--no-prune", action="store_true", help="Keep finished posts in the feed DOM")
+    parser.add_argument("--memory-budget", type=int, default=2560,
+                        help="Max traced Python heap growth per item, bytes (about 2 KiB/item is history and indexes)")
+    parser.add_argument("--rss-budget", type=int, default=65536, help="Max RSS growth per item, bytes")
+    parser.add_argument("--disk-budget", type=int, default=8192, help="Max on-disk growth per item, bytes")
+    args = parser.parse_args()
+
+    clock = VirtualClock()
+    with scratch_dir() as directory:
+        run = SoakRun(directory, args, clock)
+        # Traced from the start, so entries the warmup put in bounded caches count as freed when evicted
+        tracemalloc.start(25)
+        for _ in range(args.warmup_cycles):
+            run.cycle()
+            clock.advance(args.cycle_minutes * 60)
+
+        baseline = tracemalloc.take_snapshot()
+        baseline_rss = rss_bytes()
+        baseline_disk = disk_bytes(directory)
+        baseline_items = run.items
+
+        cycles = int(args.hours * 60 / args.cycle_minutes)
+        for index in range(cycles):
+            run.cycle()
+            clock.advance(args.cycle_minutes * 60)
+            if (index + 1) % max(1, cycles // 10) == 0:
+                traced, _ = tracemalloc.get_traced_memory()
+                print(f"cycle {index + 1}/{cycles}: {run.items} items, traced heap {traced / 1024:.0f} KiB, "
+                      f"RSS {rss_bytes() / 1024 / 1024:.1f} MiB, disk {disk_bytes(directory) / 1024:.0f} KiB")
+
+        final = tracemalloc.take_snapshot()
+        items = max(1, run.items - baseline_items)
+        stats = final.compare_to(baseline, "lineno")
+        heap_growth = sum(stat.size_diff for stat in stats)
+        rss_growth = rss_bytes() - baseline_rss
+        disk_growth = disk_bytes(directory) - baseline_disk
+        tracemalloc.stop()
+
+    print(f"\nSoak: {cycles} cycles ({args.hours:g} simulated hours), {items} items after warmup, "
+          f"{run.llm.calls} LLM calls")
+    print(f"DOM nodes per feed visit: first {run.dom_nodes[0]}, last {run.dom_nodes[-1]}")
+
+    failures = []
+    for name, growth, budget in (
+        ("traced heap", heap_growth, args.memory_budget),
+        ("RSS", rss_growth, args.rss_budget),
+        ("disk", disk_growth, args.disk_budget),
+    ):
+        per_item = growth / items
+        status = "OK" if per_item <= budget else "FAIL"
+        print(f"  {name}: {growth / 1024:.1f} KiB total, {per_item:.0f} B/item (budget {budget} B/item) {status}")
+        if per_item > budget:
+            failures.append(name)
+
+    if failures:
+        print("\nLargest heap growth by allocation site:")
+        for stat in stats[:10]:
+            print(f"  {stat}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
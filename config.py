@@ -10,6 +10,7 @@ TEMPLATES_DIR = ROOT_DIR / "templates"
 # LinkedIn URLs
 LINKEDIN_LOGIN_URL = "https://www.linkedin.com/login"
 LINKEDIN_FEED_URL = "https://www.linkedin.com/feed/"
+LINKEDIN_CONNECTIONS_URL = "https://www.linkedin.com/mynetwork/invite-connect/connections/"
 
 # Google Gemini Configuration
 
@@ -20,8 +21,11 @@ HEADLESS_MODE = False  # Set to True to run browser in background
 # Action limits (for safety and to avoid being detected as a bot)
 MAX_LIKES_PER_DAY = 20
 MAX_COMMENTS_PER_DAY = 10
+MAX_LIKES_PER_AUTHOR_PER_DAY = 2  # Likes on one author's posts per day
+MAX_COMMENTS_PER_AUTHOR_PER_DAY = 1  # Comments on one author's posts per day
 MAX_CONNECTION_REQUESTS_PER_DAY = 15
 MAX_MESSAGES_PER_DAY = 10
+MESSAGE_COOLDOWN_DAYS = None  # Days before a connection can be messaged again, None for never
 
 # Delay settings (in seconds)
 MIN_ACTION_DELAY = 1.5
@@ -31,4 +35,149 @@ MAX_SCROLL_DELAY = 3.0
 
 # Feed scraping settings
 MAX_POSTS_TO_SCRAPE = 2
-MAX_SCROLL_ITERATIONS = 10
\ No newline at end of file
+MAX_SCROLL_ITERATIONS = 10
+FEED_PRUNE_ENABLED = True  # Collapse the DOM of finished posts so long sessions don't slow down
+FEED_PRUNE_BATCH = 5  # Finished posts pruned per execute_script call
+JS_ACTIONS_ENABLED = True  # Like and comment through injected page helpers, one execute_script per step
+JS_ACTIONS_VERSION = "1"  # Bump when the helper library changes so open pages reinstall it
+COMMENT_EDITOR_TIMEOUT = 10  # Seconds to wait for the comment editor to appear
+# Explicit waits: the fixed timeouts at each call site are ceilings, once enough latencies
+# are observed a wait gives up at p99 * WAIT_P99_FACTOR + WAIT_MARGIN instead
+WAIT_LATENCIES_PATH = DATA_DIR / "wait_latencies.json"
+WAIT_MAX_SAMPLES = 200  # Latency samples kept per waited-for element
+WAIT_MIN_SAMPLES = 20  # Samples needed before the timeout adapts
+WAIT_P99_FACTOR = 1.5
+WAIT_MARGIN = 1.0  # Seconds added on top of the scaled p99
+WAIT_MIN_TIMEOUT = 2.0  # Adaptive timeouts never go below this
+WAIT_POLL_INTERVAL = 0.1  # Seconds between condition checks
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"  # Progress of interrupted feed runs (main.py --resume)
+POST_ELEMENT_CACHE_TTL = 30  # Seconds a re-resolved post element is reused before looking it up again
+
+# Posts handled in earlier runs, skipped by the scraper before extraction
+SEEN_POSTS_ENABLED = True
+SEEN_POSTS_PATH = DATA_DIR / "seen_posts.json"
+SEEN_POSTS_CAPACITY = 20000  # Posts per filter generation (about 36 KB each at the error rate below)
+SEEN_POSTS_ERROR_RATE = 0.001  # Chance of wrongly skipping an unseen post
+SEEN_POSTS_GENERATION_DAYS = 14  # The older of the two generations is dropped after this
+
+# LLM call deadlines: a call that hasn't answered in time falls back to a cached
+# near-match or to no action, so a slow response can't stall a run
+LLM_CALL_DEADLINE = 20.0  # Seconds
+LLM_CALL_WORKERS = 16  # Calls in flight, including abandoned ones finishing in the background
+LLM_HEDGE_ENABLED = False  # Send a second identical request when a call runs unusually long
+LLM_HEDGE_PERCENTILE = 0.95  # ...after this percentile of the recent latencies
+LLM_HEDGE_MIN_SAMPLES = 20  # Successful calls needed before hedging starts
+
+# Outreach texts, personalized with the LLM in the background before the UI loop starts
+REFINE_MESSAGES = True
+REFINE_CONNECTION_NOTES = False  # Notes are sent from the templates as they are unless enabled
+OUTREACH_MODEL = "gemini-2.0-flash"
+OUTREACH_WORKERS = 4  # Concurrent LLM calls while writing texts
+OUTREACH_SURPLUS = 3  # Texts written ahead beyond the remaining sends, for targets that end up skipped
+MESSAGE_MAX_CHARS = 1000
+CONNECTION_NOTE_MAX_CHARS = 300  # LinkedIn's limit for invitation notes
+
+# Connections index (messaging targets)
+CONNECTIONS_INDEX_PATH = DATA_DIR / "connections_index.json"
+CONNECTIONS_REFRESH_MAX_SCROLLS = 50  # Upper bound on scrolls per refresh of the connections list
+CONNECTIONS_KNOWN_STREAK = 3  # Incremental refreshes stop after this many already-indexed cards in a row
+CONNECTIONS_FULL_REFRESH_DAYS = 7  # Re-read the whole connections list this often, dropping removed connections
+
+# Run metrics
+METRICS_MAX_SAMPLES = 10000  # Timing samples kept per metric for percentiles
+
+# Local pre-filter settings (scored before any LLM call)
+PREFILTER_ENABLED = True
+PREFILTER_MODEL_PATH = DATA_DIR / "prefilter_model.json"  # Optional trained weights, overrides the term weights below
+PREFILTER_HASH_DIM = 2 ** 18
+PREFILTER_SKIP_THRESHOLD = -0.5  # Posts scoring below this never reach the LLM
+PREFILTER_BIAS = 0.0
+PREFILTER_BLOCKED_AUTHORS = []  # Author names that are always skipped
+PREFILTER_ALLOWED_AUTHORS = []  # Author names that always go to the LLM
+# Plain substring matches on the post text. Ads are skipped by their "Promoted" label, not by keyword
+PREFILTER_SKIP_KEYWORDS = [
+    "we're hiring",
+    "we are hiring",
+    "#hiring",
+    "apply now",
+    "job opening",
+    "dm me for",
+    "link in bio",
+    "giveaway",
+]
+PREFILTER_TERM_WEIGHTS = {
+    "hiring": -1.5,
+    "apply": -1.0,
+    "salary": -1.0,
+    "vacancy": -1.5,
+    "discount": -1.5,
+    "sale": -1.0,
+    "webinar": -0.5,
+    "register": -0.5,
+    "crypto": -1.5,
+    "learned": 0.5,
+    "built": 0.5,
+    "launched": 0.5,
+    "engineering": 0.5,
+    "research": 0.5,
+    "python": 0.5,
+    "ai": 0.5,
+}
+
+# Near-duplicate detection (reuses analyses of reshared/templated posts)
+NEAR_DUPLICATE_ENABLED = True
+NEAR_DUPLICATE_INDEX_PATH = DATA_DIR / "near_duplicates.json"
+NEAR_DUPLICATE_MAX_DISTANCE = 3  # Max differing SimHash bits (out of 64) to count as a duplicate
+NEAR_DUPLICATE_FALLBACK_DISTANCE = 8  # Looser match reused when the LLM call fails or times out
+NEAR_DUPLICATE_MAX_ENTRIES = 5000  # Oldest entries are evicted beyond this
+NEAR_DUPLICATE_MIN_TOKENS = 8  # Shorter posts are too ambiguous to fingerprint
+
+# Post analysis model. The fixed analysis instructions are registered once per run:
+# "cache" creates cached context with the provider (falls back to "system" when the
+# model or the prompt size doesn't allow it), "system" sends them as a system
+# instruction, "off" inlines them in every prompt
+ANALYSIS_MODEL = "gemini-2.0-flash"
+ANALYSIS_CONTEXT_CACHING = "cache"
+ANALYSIS_CONTEXT_TTL = 3600  # Seconds the cached context lives, renewed before it expires
+
+# Template tier: routine posts (new role, work anniversary, certification, launch) get a
+# comment filled from templates/comments.txt instead of an LLM generation
+COMMENT_TEMPLATES_ENABLED = True
+COMMENT_TEMPLATE_MIN_CONFIDENCE = 0.8  # Category confidence needed to skip the LLM
+COMMENT_TEMPLATE_MAX_WORDS = 80  # Longer posts have enough substance for a bespoke comment
+COMMENT_TEMPLATE_EXCLUDE_KEYWORDS = ["hiring", "apply now", "register", "webinar", "discount", "link in bio"]
+COMMENT_TEMPLATE_LIKE = True  # Like routine posts, within the daily and per-author limits
+COMMENT_TEMPLATE_COMMENT = True  # Post the template comment, within the daily and per-author limits
+
+# Prompt compilation settings
+PROMPT_MAX_POST_TOKENS = 600  # Longer posts are truncated, keeping the head and the tail
+PROMPT_HEAD_RATIO = 0.75  # Share of the token budget kept from the start of the post
+PROMPT_MAX_HASHTAGS = 3  # Hashtag walls are cut down to this many tags
+PROMPT_MAX_LINKS = 2  # Extra links beyond this are dropped
+
+# Extraction engine for search results and connection cards:
+# "snapshot" parses page_source once, "webdriver" queries every field live
+EXTRACTION_ENGINE = "snapshot"
+SNAPSHOT_DIR = DATA_DIR / "snapshots"
+SAVE_SNAPSHOTS = False  # Keep page snapshots on disk for offline replay and benchmarks
+
+# Feed ingestion: "dom" extracts posts from the rendered page, "network" decodes the
+# feed API responses the page loads while scrolling (needs Chrome performance logging)
+FEED_INGESTION = "dom"
+FEED_RESPONSE_PATTERNS = ("/voyager/api/feed/", "queryId=voyagerFeedDash")
+RESPONSES_DIR = DATA_DIR / "responses"
+SAVE_RESPONSES = False  # Keep captured feed responses on disk for offline replay
+
+# Post corpus for browser-free analysis (main.py analyze); a .zst suffix compresses it
+CORPUS_PATH = DATA_DIR / "corpus.jsonl"
+SAVE_CORPUS = True  # Append every scraped feed batch to the corpus
+ANALYSIS_DIR = DATA_DIR / "analysis"  # Results of `main.py analyze` runs
+ANALYZE_WORKERS = 8  # Concurrent LLM calls in `main.py analyze`
+
+# Profiling (main.py --profile)
+PROFILE_DIR = DATA_DIR / "profiles"
+PROFILE_SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+
+# Browser-side cost of navigations, scrolls and actions from the DevTools Performance domain
+# (main.py --browser-perf); recorded in the run metrics as browser.*
+BROWSER_PERF_ENABLED = False
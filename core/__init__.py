@@ -6,16 +6,36 @@ This package contains the main components for LinkedIn automation.
 
 from .auth import LinkedInAuth
 from .feed_scrapper import FeedScraper
+from .feed_pruner import FeedPruner
+from .network_feed import NetworkFeedScraper
 from .ai_filter import AIFilter
+from .comment_templates import CommentTemplates
 from .action_engine import ActionEngine
+from .js_actions import JsActions
 from .connect import LinkedInConnect
 from .messenger import LinkedInMessenger
+from .message_writer import MessageWriter
+from .connections_index import ConnectionsIndex
+from .prefilter import PostPreFilter
+from .post import Post
+from .checkpoint import RunCheckpoint
+from .bulk_analysis import BulkAnalyzer
 
 __all__ = [
     'LinkedInAuth',
     'FeedScraper',
+    'FeedPruner',
+    'NetworkFeedScraper',
     'AIFilter',
+    'CommentTemplates',
     'ActionEngine',
+    'JsActions',
     'LinkedInConnect',
-    'LinkedInMessenger'
+    'LinkedInMessenger',
+    'MessageWriter',
+    'ConnectionsIndex',
+    'PostPreFilter',
+    'Post',
+    'RunCheckpoint',
+    'BulkAnalyzer'
 ]
\ No newline at end of file
@@ -1,28 +1,47 @@
 # core/action_engine.py
-import time
-import random
 import json
+import time
 from pathlib import Path
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
 
 from config import (
     DATA_DIR,
     MIN_ACTION_DELAY,
-    MAX_ACTION_DELAY
+    MAX_ACTION_DELAY,
+    MAX_LIKES_PER_DAY,
+    MAX_COMMENTS_PER_DAY,
+    MAX_LIKES_PER_AUTHOR_PER_DAY,
+    MAX_COMMENTS_PER_AUTHOR_PER_DAY,
+    POST_ELEMENT_CACHE_TTL,
+    JS_ACTIONS_ENABLED,
+    COMMENT_EDITOR_TIMEOUT
 )
+from core.js_actions import JsActions
+from core.selector_registry import selectors
+from utils.browser_perf import browser_perf
+from utils.clock import system_clock
+from utils.profiling import stage
+from utils.waits import WaitManager
 
 class ActionEngine:
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock or system_clock
+        self.waits = WaitManager(self.clock)
         self.history_path = Path(DATA_DIR) / "history.json"
         self.action_history = self._load_history()
+        self._element_cache = {}
+        self.js_actions = JsActions() if JS_ACTIONS_ENABLED else None
+        # (total, per author) likes and comments allowed per day, None for no limit
+        self.daily_limits = {
+            "likes": (MAX_LIKES_PER_DAY, MAX_LIKES_PER_AUTHOR_PER_DAY),
+            "comments": (MAX_COMMENTS_PER_DAY, MAX_COMMENTS_PER_AUTHOR_PER_DAY)
+        }
 
     def _load_history(self):
         if self.history_path.exists():
             try:
-                with open(self.history_path, 'r') as f:
+                with stage("history_io"), open(self.history_path, 'r') as f:
                     return json.load(f)
             except:
                 return {"likes": {}, "comments": {}, "connections": {}, "messages": {}}
@@ -30,7 +49,7 @@ class ActionEngine:
             return {"likes": {}, "comments": {}, "connections": {}, "messages": {}}
 
     def _save_history(self):
-        with open(self.history_path, 'w') as f:
+        with stage("history_io"), open(self.history_path, 'w') as f:
             json.dump(self.action_history, f)
 
     def has_interacted_with_post(self, post_id, action_type):
@@ -40,16 +59,103 @@ class ActionEngine:
         if action_type not in self.action_history:
             self.action_history[action_type] = {}
 
+        # Keep a count so repeated interactions with the same post show up in stats
+        previous = self.action_history[action_type].get(post_id)
         self.action_history[action_type][post_id] = {
-            "timestamp": time.time(),
-            "details": details or {}
+            "timestamp": self.clock.time(),
+            "details": details or {},
+            "count": previous.get("count", 1) + 1 if previous else 1
         }
 
         self._save_history()
 
-    def perform_actions(self, driver, post_data, analysis_result):
-        post_id = post_data.get("post_id", "").split(":")[-1]
-        post_element = post_data.get("post_element")
+    def limit_reached(self, action_type, author_name=None):
+        """
+        Check today's likes or comments against the daily limits
+
+        Args:
+            action_type: "likes" or "comments"
+            author_name: Author of the post to act on, also checked against the per-author limit
+
+        Returns:
+            str: The limit that was reached, None if the action is allowed
+        """
+        total_limit, author_limit = self.daily_limits.get(action_type, (None, None))
+        if total_limit is None and author_limit is None:
+            return None
+
+        day_start = time.mktime(time.strptime(self.clock.today(), "%Y-%m-%d"))
+        total = by_author = 0
+        for action in self.action_history.get(action_type, {}).values():
+            if action.get("timestamp", 0) < day_start:
+                continue
+            total += 1
+            if author_name and action.get("details", {}).get("author_name") == author_name:
+                by_author += 1
+
+        if total_limit is not None and total >= total_limit:
+            return f"daily limit of {total_limit}"
+        if author_limit is not None and author_name and by_author >= author_limit:
+            return f"daily limit of {author_limit} for {author_name}"
+        return None
+
+    def resolve_post_element(self, driver, post_urn, refresh=False):
+        """
+        Find the live element for a post by its data-urn attribute
+
+        Resolved elements are cached for a short time so the like and comment
+        steps of one post share a single lookup.
+        """
+        now = self.clock.time()
+        self._element_cache = {
+            urn: entry for urn, entry in self._element_cache.items()
+            if now - entry[1] < POST_ELEMENT_CACHE_TTL
+        }
+
+        if not refresh and post_urn in self._element_cache:
+            return self._element_cache[post_urn][0]
+
+        try:
+            post_element = driver.find_element(
+                By.CSS_SELECTOR, f".feed-shared-update-v2[data-urn='{post_urn}']"
+            )
+        except NoSuchElementException:
+            self._element_cache.pop(post_urn, None)
+            return None
+
+        self._element_cache[post_urn] = (post_element, now)
+        return post_element
+
+    def _open_post_page(self, driver, post_data):
+        """Navigate to the post's own page and resolve it there"""
+        try:
+            with browser_perf.measure(driver, "action.open_post", navigation=True):
+                driver.get(post_data.post_url)
+                self.waits.until(driver, "feed.post", 10, page_load=True)
+        except Exception as e:
+            print(f"Could not open post page {post_data.post_url}: {e}")
+            return None
+        return self.resolve_post_element(driver, post_data.post_id, refresh=True)
+
+    def perform_actions(self, driver, post_data, analysis_result, resumed=False):
+        """
+        Like and/or comment on a post as the analysis recommends
+
+        Args:
+            driver: Selenium WebDriver instance
+            post_data: The Post to act on
+            analysis_result: Analysis dict from AIFilter
+            resumed: The post comes from a resumed checkpoint, open its own page
+                when it is not on the current one
+
+        Returns:
+            dict: liked, commented, comment_text and errors of the attempt
+        """
+        post_id = post_data.short_id
+        post_element = self.resolve_post_element(driver, post_data.post_id)
+        if not post_element and resumed and post_data.post_url:
+            # Resumed runs act on posts that may no longer be on the current page
+            post_element = self._open_post_page(driver, post_data)
 
         results = {
             "liked": False,
@@ -63,15 +169,27 @@ class ActionEngine:
             return results
 
         try:
-            self._reposition_post(driver, post_element)
+            try:
+                self._reposition_post(driver, post_element)
+            except StaleElementReferenceException:
+                post_element = self.resolve_post_element(driver, post_data.post_id, refresh=True)
+                if not post_element:
+                    results["errors"].append("Post element went stale and could not be re-resolved")
+                    return results
+                self._reposition_post(driver, post_element)
 
             # LIKE
             should_like = bool(analysis_result.get("should_like", False))
-            if should_like and not self.has_interacted_with_post(post_id, "likes"):
+            like_limit = should_like and self.limit_reached("likes", post_data.author_name)
+            if like_limit:
+                print(f"Skipping like for post: {post_id}, {like_limit} reached")
+            elif should_like and not self.has_interacted_with_post(post_id, "likes"):
                 print(f"Analysis recommends liking post: {post_id}")
-                if self.like_post(driver, post_element):
+                with browser_perf.measure(driver, "action.like"):
+                    liked = self.like_post(driver, post_element)
+                if liked:
                     results["liked"] = True
-                    self.record_interaction(post_id, "likes")
+                    self.record_interaction(post_id, "likes", {"author_name": post_data.author_name})
                     self._random_delay(1, 2)
             else:
                 print(f"Skipping like for post: {post_id}, should_like={should_like}")
@@ -82,12 +200,16 @@ class ActionEngine:
 
             if not should_comment or comment_text == "[N/A]" or not comment_text:
                 print(f"Skipping comment for post: {post_id}, should_comment={should_comment}, text={comment_text}")
+            elif comment_limit := self.limit_reached("comments", post_data.author_name):
+                print(f"Skipping comment for post: {post_id}, {comment_limit} reached")
             elif not self.has_interacted_with_post(post_id, "comments"):
                 print(f"Analysis recommends commenting on post: {post_id}")
-                if self.comment_on_post(driver, post_element, comment_text):
+                with browser_perf.measure(driver, "action.comment"):
+                    commented = self.comment_on_post(driver, post_element, comment_text)
+                if commented:
                     results["commented"] = True
                     results["comment_text"] = comment_text
-                    self.record_interaction(post_id, "comments", {"text": comment_text})
+                    self.record_interaction(post_id, "comments", {"text": comment_text, "author_name": post_data.author_name})
 
             # Scroll
             driver.execute_script("window.scrollBy(0, 400);")
@@ -102,19 +224,28 @@ class ActionEngine:
 
 
     def like_post(self, driver, post_element):
+        if self.js_actions:
+            status = self.js_actions.like(driver, post_element)
+            if status == "liked":
+                print("✅ Liked post successfully")
+                self._random_delay()
+                return True
+            if status in ("already_liked", "not_found"):
+                print(f"Not liking post: {status.replace('_', ' ')}")
+                return False
+            print("Falling back to WebDriver like")
+        return self._like_post_webdriver(driver, post_element)
+
+    def _like_post_webdriver(self, driver, post_element):
         try:
-            try:
-                social_bar = post_element.find_element(
-                    By.XPATH, ".//div[contains(@class, 'social-actions') or contains(@class, 'feed-shared-social-actions')]"
-                )
+            social_bar = selectors.find(post_element, "action.social_bar")
+            if social_bar:
                 print("Found social actions bar")
-            except NoSuchElementException:
+            else:
                 social_bar = post_element
                 print("Could not find social actions bar, using whole post element")
 
-            like_buttons = social_bar.find_elements(
-                By.XPATH, ".//button[contains(@aria-label, 'Like') or contains(@aria-label, 'like') or contains(@type, 'like-button')]"
-            )
+            like_buttons = selectors.find_all(social_bar, "action.like_button")
 
             if not like_buttons:
                 print("No like buttons found")
@@ -146,10 +277,61 @@ class ActionEngine:
             return False
 
     def comment_on_post(self, driver, post_element, comment_text):
+        if not self.js_actions:
+            return self._comment_on_post_webdriver(driver, post_element, comment_text)
+
+        try:
+            timeout = self.waits.timeout("action.comment_editor", COMMENT_EDITOR_TIMEOUT)
+            status, comment_field = self.js_actions.open_comment_box(driver, post_element, timeout)
+            if status is None:
+                print("Falling back to WebDriver comment")
+                return self._comment_on_post_webdriver(driver, post_element, comment_text)
+            if status != "ok":
+                print(f"❌ Could not open comment box: {status}")
+                return False
+
+            self._random_delay(1, 1.5)
+            self._type_comment(comment_field, comment_text)
+            self._random_delay(1, 2)
+
+            status = self.js_actions.submit_comment(driver, post_element)
+            if status is None:
+                status = "submitted" if self._submit_comment_webdriver(driver, post_element) else "not_found"
+            if status != "submitted":
+                print(f"❌ Could not submit comment: {status}")
+                return False
+
+            self._random_delay(2, 3)
+            print(f"✅ Posted comment: {comment_text[:30]}...")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error commenting on post: {e}")
+            return False
+
+    def _type_comment(self, comment_field, comment_text):
+        for char in comment_text:
+            comment_field.send_keys(char)
+            self.clock.pause(0.01, 0.04)
+
+    def _submit_comment_webdriver(self, driver, post_element):
+        post_button = selectors.find(post_element, "action.comment_submit")
+        if not post_button:
+            print("❌ Submit button not found inside post_element")
+            return False
+
+        driver.execute_script("arguments[0].scrollIntoView(true);", post_button)
+        self._random_delay(0.3, 0.6)
+        driver.execute_script("arguments[0].click();", post_button)
+        return True
+
+    def _comment_on_post_webdriver(self, driver, post_element, comment_text):
         try:
             # Step 1: Click on the post's comment button
-            comment_button = post_element.find_element(
-                By.CSS_SELECTOR, "button.comment-button, button[data-control-name='comment']")
+            comment_button = selectors.find(post_element, "action.comment_button")
+            if not comment_button:
+                print("❌ Comment button not found inside post_element")
+                return False
             driver.execute_script("arguments[0].scrollIntoView(true);", comment_button)
             self._random_delay(0.3, 0.6)
             driver.execute_script("arguments[0].click();", comment_button)
@@ -157,30 +339,17 @@ class ActionEngine:
             self._random_delay(1, 1.5)
 
             # Step 2: Now find the ql-editor INSIDE this post_element (not the whole page!)
-            comment_field = WebDriverWait(post_element, 10).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "div.ql-editor"))
-            )
+            comment_field = self.waits.until(post_element, "action.comment_editor", COMMENT_EDITOR_TIMEOUT, visible=True)
 
             driver.execute_script("arguments[0].focus();", comment_field)
-            for char in comment_text:
-                comment_field.send_keys(char)
-                time.sleep(random.uniform(0.01, 0.04))
+            self._type_comment(comment_field, comment_text)
 
             self._random_delay(1, 2)
 
             # Step 3: Find the submit button only within this post element
-            try:
-                post_button = post_element.find_element(
-                    By.CSS_SELECTOR, "button.comments-comment-box__submit-button--cr"
-                )
-            except NoSuchElementException:
-                print("❌ Submit button not found inside post_element")
+            if not self._submit_comment_webdriver(driver, post_element):
                 return False
 
-            driver.execute_script("arguments[0].scrollIntoView(true);", post_button)
-            self._random_delay(0.3, 0.6)
-            driver.execute_script("arguments[0].click();", post_button)
-
             self._random_delay(2, 3)
             print(f"✅ Posted comment: {comment_text[:30]}...")
             return True
@@ -198,10 +367,12 @@ class ActionEngine:
                 window.scrollBy(0, -150);
             """, post_element)
             self._random_delay(0.5, 1.5)
+        except StaleElementReferenceException:
+            raise
         except Exception as e:
             print(f"Error repositioning post: {e}")
 
     def _random_delay(self, min_delay=None, max_delay=None):
         min_delay = min_delay or MIN_ACTION_DELAY
         max_delay = max_delay or MAX_ACTION_DELAY
-        time.sleep(random.uniform(min_delay, max_delay))
+        self.clock.pause(min_delay, max_delay)
@@ -1,40 +1,94 @@
 import json
+import time
+import threading
 from pathlib import Path
 
-from config import  DATA_DIR,GEMINI_API_KEY
-from utils.parser import parse_ai_response
+from config import (
+    DATA_DIR,
+    GEMINI_API_KEY,
+    NEAR_DUPLICATE_ENABLED,
+    NEAR_DUPLICATE_FALLBACK_DISTANCE,
+    ANALYSIS_MODEL,
+    ANALYSIS_CONTEXT_CACHING,
+    ANALYSIS_CONTEXT_TTL,
+    COMMENT_TEMPLATE_LIKE,
+    COMMENT_TEMPLATE_COMMENT
+)
+from core.comment_templates import CommentTemplates
+from utils.parser import parse_ai_response, normalize_analysis
+from utils.deadlines import deadline_caller, DeadlineExceeded
+from utils.metrics import metrics
+from utils.near_duplicates import NearDuplicateIndex, adapt_analysis
+from utils.prompt_compiler import PROMPT_VERSION, compile_post_text, estimate_tokens, prompt_cache_key
 from google import genai
 client = genai.Client(api_key=GEMINI_API_KEY)
 
+# Where an analysis came from, cheapest first; counted as ai_filter.tier.<name>
+TIERS = ("cache", "near_duplicate", "template", "llm", "fallback")
+
+
+# Fixed part of every analysis prompt, registered once per run as cached context or a
+# system instruction when the provider supports it (see AIFilter._context_config)
+INSTRUCTIONS = """
+You are analyzing a LinkedIn post to decide if and how to interact with it.
+The post author and content follow these instructions.
+
+Based on the post, please answer the following questions:
+
+1. Should I like this post? (Yes/No)
+2. Should I comment on this post? (Yes/No)
+3. If I should comment, what would be a thoughtful, professional comment?
+4. What's your reasoning for these decisions?
+
+Format your response exactly like this:
+LIKE: Yes/No
+COMMENT: Yes/No
+COMMENT_TEXT: [Your suggested comment if applicable keep the comment short and brief]
+REASONING: [Your reasoning for these decisions , single line reasoning]
+
+The comment should be professional, relevant to the post content, and add value to the conversation. It should sound natural and human-written, not generic or bot-like.
+"""
+
+
+def tier_rates():
+    """Share of the analyzed posts answered by each tier in this run"""
+    return {tier: metrics.rate(f"ai_filter.tier.{tier}", "ai_filter.analyzed") for tier in TIERS}
+
+
 class AIFilter:
-    def __init__(self):
+    def __init__(self, llm_client=None, caller=None):
+        # Any object with the genai `models.generate_content` interface, e.g. utils.fake_llm for offline runs
+        self.client = llm_client or client
+        self.caller = caller or deadline_caller
         self.cache_dir = Path(DATA_DIR) / "cache"
         self.cache_dir.mkdir(exist_ok=True)
+        self.near_duplicates = NearDuplicateIndex() if NEAR_DUPLICATE_ENABLED else None
+        self.comment_templates = CommentTemplates()
+        # How the fixed instructions reach the provider: "cache", "system" or "off" (inline)
+        self.context_mode = ANALYSIS_CONTEXT_CACHING
+        self._context_lock = threading.Lock()
+        self._context_name = None
+        self._context_created = None
+        # Bulk runs turn these off: use_cache to force fresh LLM calls, save_index to save once at the end
+        self.use_cache = True
+        self.save_index = True
     
     def analyze_post(self, post_data):
         """
         Analyze a LinkedIn post using OpenAI to decide on actions
         
         Args:
-            post_data: Dictionary containing post information
+            post_data: Post record to analyze
             
         Returns:
             dict: Analysis results with action flags and generated content
         """
-        post_id = post_data.get("post_id", "").split(":")[-1]
-        cache_file = self.cache_dir / f"post_{post_id}.json"
-        
-        # Check if we have cached results
-        if cache_file.exists():
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        
         # Extract relevant data for analysis
-        author_name = post_data.get("author_name", "Unknown")
-        post_text = post_data.get("post_text", "")
+        author_name = post_data.author_name
+        post_text = compile_post_text(post_data.post_text)
         
         # Skip empty posts
-        if not post_text.strip():
+        if not post_text:
             return {
                 "should_like": False,
                 "should_comment": False,
@@ -42,55 +96,206 @@ class AIFilter:
                 "reasoning": "Post text is empty"
             }
         
-        # Prepare prompt for OpenAI
-        prompt = self._create_prompt(author_name, post_text)
+        metrics.incr("ai_filter.analyzed")
+        
+        # Cache on the compiled prompt inputs so identical normalized content hits the cache
+        cache_file = self.cache_dir / f"post_{prompt_cache_key(author_name, post_text)}.json"
+        
+        # Check if we have cached results
+        if self.use_cache and cache_file.exists():
+            metrics.incr("ai_filter.cache_hits")
+            metrics.incr("ai_filter.tier.cache")
+            with open(cache_file, 'r') as f:
+                return normalize_analysis(json.load(f))
+        
+        # Reuse the analysis of a near-identical post (reshares, templated announcements)
+        if self.near_duplicates and self.use_cache:
+            match = self.near_duplicates.lookup(post_text)
+            if match:
+                original_author, previous_analysis, distance = match
+                metrics.incr("ai_filter.near_duplicate_hits")
+                metrics.incr("ai_filter.tier.near_duplicate")
+                analysis_result = normalize_analysis(adapt_analysis(previous_analysis, original_author, author_name, distance))
+                with open(cache_file, 'w') as f:
+                    json.dump(analysis_result, f)
+                return analysis_result
+        
+        # Routine posts (new role, anniversary, ...) get a filled-in template instead of a generation
+        if self.comment_templates:
+            template_match = self.comment_templates.match(author_name, post_text)
+            if template_match:
+                category, comment_text = template_match
+                metrics.incr("ai_filter.tier.template")
+                metrics.incr(f"comment_templates.{category}")
+                analysis_result = {
+                    "should_like": COMMENT_TEMPLATE_LIKE,
+                    "should_comment": COMMENT_TEMPLATE_COMMENT,
+                    "comment_text": comment_text,
+                    "reasoning": f"Routine {category.replace('_', ' ')} post, template comment",
+                    "tier": "template"
+                }
+                with open(cache_file, 'w') as f:
+                    json.dump(analysis_result, f)
+                return analysis_result
         
         try:
-            response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt
-            )
-            print(response.text)
+            metrics.incr("ai_filter.llm_calls")
+            with metrics.timer("ai_filter.llm_latency"):
+                response = self.caller.call("ai_filter", self._generate, author_name, post_text)
             # Extract and parse response
             ai_response = response.text
             analysis_result = parse_ai_response(ai_response)
+            analysis_result["prompt_version"] = PROMPT_VERSION
+            metrics.incr("ai_filter.tier.llm")
             
             # Cache the result
             with open(cache_file, 'w') as f:
                 json.dump(analysis_result, f)
             
+            if self.near_duplicates and self.near_duplicates.add(post_text, author_name, analysis_result) and self.save_index:
+                self.near_duplicates.save()
+            
             return analysis_result
             
+        except DeadlineExceeded as e:
+            print(f"\n Google Gemini did not answer in time: {e}")
+            return self._fallback(author_name, post_text, "timeout", e)
         except Exception as e:
             print(f"\n Error analyzing post with Google Gemini: {e}")
-            return {
-                "should_like": "No",
-                "should_comment": "No",
-                "comment_text": "",
-                "reasoning": f"Error: {str(e)}"
-            }
+            return self._fallback(author_name, post_text, "error", e)
     
-    def _create_prompt(self, author_name, post_text):
-        """Create a prompt for the OpenAI API"""
+    def _fallback(self, author_name, post_text, reason, error):
+        """
+        Analysis to use when the LLM call failed or ran past its deadline: the
+        closest cached near-match within NEAR_DUPLICATE_FALLBACK_DISTANCE, else
+        no action. Fallbacks are not cached, so the post is analyzed again next run.
+        
+        Args:
+            author_name: Author of the post
+            post_text: Compiled post text
+            reason: "timeout" or "error", recorded as ai_filter.fallback.<reason>
+            error: The exception that caused the fallback
+            
+        Returns:
+            dict: Analysis results, with the fallback reason and tier under "fallback"
+        """
+        metrics.incr(f"ai_filter.fallback.{reason}")
+        metrics.incr("ai_filter.tier.fallback")
+        
+        if self.near_duplicates:
+            match = self.near_duplicates.lookup(post_text, max_distance=NEAR_DUPLICATE_FALLBACK_DISTANCE)
+            if match:
+                original_author, previous_analysis, distance = match
+                metrics.incr("ai_filter.fallback.near_duplicate")
+                analysis_result = normalize_analysis(adapt_analysis(previous_analysis, original_author, author_name, distance))
+                analysis_result["fallback"] = f"{reason}:near_duplicate"
+                return analysis_result
+        
+        metrics.incr("ai_filter.fallback.no_action")
+        return {
+            "should_like": False,
+            "should_comment": False,
+            "comment_text": "",
+            "reasoning": f"Error: {str(error)}",
+            "fallback": f"{reason}:no_action"
+        }
+    
+    def _post_prompt(self, author_name, post_text):
+        """The per-post part of the prompt, sent on its own when the instructions are cached"""
         return f"""
-You are analyzing a LinkedIn post to decide if and how to interact with it.
-
 POST AUTHOR: {author_name}
 POST CONTENT: 
 {post_text}
-
-Based on this post, please answer the following questions:
-
-1. Should I like this post? (Yes/No)
-2. Should I comment on this post? (Yes/No)
-3. If I should comment, what would be a thoughtful, professional comment?
-4. What's your reasoning for these decisions?
-
-Format your response exactly like this:
-LIKE: Yes/No
-COMMENT: Yes/No
-COMMENT_TEXT: [Your suggested comment if applicable keep the comment short and brief]
-REASONING: [Your reasoning for these decisions , single line reasoning]
-
-The comment should be professional, relevant to the post content, and add value to the conversation. It should sound natural and human-written, not generic or bot-like.
-"""
\ No newline at end of file
+"""
+    
+    def _create_prompt(self, author_name, post_text):
+        """Create the full prompt, instructions included, for providers without cached context"""
+        return INSTRUCTIONS + self._post_prompt(author_name, post_text)
+    
+    def _context_config(self):
+        """
+        generate_content config that carries the instructions, creating the
+        cached context on first use and again before its TTL runs out
+        
+        Returns:
+            dict: Config with cached_content or system_instruction, None to send the instructions inline
+        """
+        with self._context_lock:
+            expired = self._context_created is not None and \
+                time.monotonic() - self._context_created > ANALYSIS_CONTEXT_TTL * 0.9
+            if self.context_mode == "cache" and (self._context_name is None or expired):
+                try:
+                    cached = self.client.caches.create(
+                        model=ANALYSIS_MODEL,
+                        config={
+                            "system_instruction": INSTRUCTIONS,
+                            "display_name": f"linkedintel-analysis-v{PROMPT_VERSION}",
+                            "ttl": f"{ANALYSIS_CONTEXT_TTL}s"
+                        }
+                    )
+                    self._context_name = cached.name
+                    self._context_created = time.monotonic()
+                    metrics.incr("ai_filter.context.created")
+                except Exception as e:
+                    print(f"Context caching unavailable, sending the instructions as a system instruction: {e}")
+                    self.context_mode = "system"
+            mode, name = self.context_mode, self._context_name
+        if mode == "cache":
+            return {"cached_content": name}
+        if mode == "system":
+            return {"system_instruction": INSTRUCTIONS}
+        return None
+    
+    def _downgrade_context(self, config, error):
+        """
+        Step down from cached context to system instruction to inline prompt
+        when the provider rejects the cheaper option
+        
+        Returns:
+            bool: True if the request should be retried with the next option
+        """
+        with self._context_lock:
+            if "cached_content" in config and "cache" in str(error).lower():
+                # Expired or deleted on the provider side, created again by the next call
+                self._context_name = None
+                metrics.incr("ai_filter.context.invalidated")
+                return True
+            if "system_instruction" in config and isinstance(error, TypeError):
+                print(f"Client does not take a config, sending the instructions inline: {error}")
+                self.context_mode = "off"
+                return True
+        return False
+    
+    def _generate(self, author_name, post_text):
+        """One analysis request, instructions sent the cheapest way the provider accepts; runs on a deadline worker"""
+        config = self._context_config()
+        if config is None:
+            prompt = self._create_prompt(author_name, post_text)
+            metrics.histogram("ai_filter.prompt_tokens", estimate_tokens(prompt), "tokens")
+            return self.client.models.generate_content(model=ANALYSIS_MODEL, contents=prompt)
+        
+        prompt = self._post_prompt(author_name, post_text)
+        metrics.histogram("ai_filter.prompt_tokens", estimate_tokens(prompt), "tokens")
+        try:
+            return self.client.models.generate_content(model=ANALYSIS_MODEL, contents=prompt, config=config)
+        except Exception as e:
+            if not self._downgrade_context(config, e):
+                raise
+        
+        # Retried once with the next option, later calls pick up the downgrade themselves
+        if "cached_content" in config:
+            return self.client.models.generate_content(
+                model=ANALYSIS_MODEL, contents=prompt, config={"system_instruction": INSTRUCTIONS}
+            )
+        return self.client.models.generate_content(model=ANALYSIS_MODEL, contents=self._create_prompt(author_name, post_text))
+    
+    def release_context(self):
+        """Delete the cached instructions at the end of a run instead of waiting for their TTL"""
+        with self._context_lock:
+            name, self._context_name = self._context_name, None
+        if name is None:
+            return
+        try:
+            self.client.caches.delete(name=name)
+        except Exception as e:
+            print(f"Error deleting cached analysis context: {e}")
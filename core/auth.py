@@ -1,17 +1,18 @@
 # core/auth.py
 import json
-import time
-import random
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from config import LINKEDIN_LOGIN_URL, DATA_DIR
+from utils.clock import system_clock
+from utils.waits import WaitManager
 
 class LinkedInAuth:
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock or system_clock
+        self.waits = WaitManager(self.clock)
         self.cookies_path = Path(DATA_DIR) / "cookies.json"
         
     def login(self, driver):
@@ -82,8 +83,7 @@ class LinkedInAuth:
             
             # Wait for manual login
             print("Waiting for you to log in manually...")
-            wait = WebDriverWait(driver, 300)  # 5 minutes timeout
-            wait.until(EC.url_contains("/feed/"))
+            self.waits.until_condition(driver, EC.url_contains("/feed/"), 300)  # 5 minutes timeout
             
             print("Successfully logged in manually!")
             
@@ -111,7 +111,7 @@ class LinkedInAuth:
         try:
             # Navigate to the logout URL
             driver.get("https://www.linkedin.com/m/logout/")
-            time.sleep(2)
+            self.clock.sleep(2)
             
             # Delete saved cookies
             if self.cookies_path.exists():
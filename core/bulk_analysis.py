@@ -0,0 +1,120 @@
+import json
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import ANALYSIS_DIR, ANALYZE_WORKERS
+from core.ai_filter import TIERS
+from core.prefilter import PostPreFilter
+from utils.clock import system_clock
+from utils.metrics import metrics
+from utils.prompt_compiler import PROMPT_VERSION
+
+COUNTERS = ("ai_filter.cache_hits", "ai_filter.near_duplicate_hits", "ai_filter.llm_calls")
+TIER_COUNTERS = tuple(f"ai_filter.tier.{tier}" for tier in TIERS)
+
+
+class BulkAnalyzer:
+    """
+    Runs the pre-filter and AIFilter over stored posts with a pool of worker
+    threads, without a browser. Used by `main.py analyze` to re-score a corpus
+    after prompt changes and to load-test the LLM path.
+    """
+
+    def __init__(self, ai_filter, prefilter=None, workers=None, clock=None):
+        self.clock = clock or system_clock
+        self.ai_filter = ai_filter
+        self.prefilter = prefilter or PostPreFilter()
+        self.workers = workers or ANALYZE_WORKERS
+
+    def _analyze(self, post):
+        start = time.perf_counter()
+        analysis = self.ai_filter.analyze_post(post)
+        return post, analysis, time.perf_counter() - start
+
+    def run(self, posts, output_path=None):
+        """
+        Analyze posts concurrently and write one result per line
+
+        Args:
+            posts: Post records
+            output_path: Results file (defaults to a new file in ANALYSIS_DIR)
+
+        Returns:
+            dict: Throughput summary of the run
+        """
+        output_path = Path(output_path or Path(ANALYSIS_DIR) / f"analysis_v{PROMPT_VERSION}_{int(self.clock.time())}.jsonl")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        before = {name: metrics.counters.get(name, 0) for name in COUNTERS + TIER_COUNTERS}
+
+        start = time.perf_counter()
+        decisions = self.prefilter.filter_posts(posts)
+        queued = [post for post, (passed, _) in zip(posts, decisions) if passed]
+        analysis_start = time.perf_counter()
+
+        # The near-duplicate index is saved once at the end instead of after every LLM call
+        self.ai_filter.save_index = False
+        latencies = []
+        liked = commented = errors = fallbacks = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool, open(output_path, 'w') as out:
+                futures = [pool.submit(self._analyze, post) for post in queued]
+                for future in as_completed(futures):
+                    post, analysis, elapsed = future.result()
+                    latencies.append(elapsed)
+                    if analysis.get("fallback"):
+                        fallbacks += 1
+                    if str(analysis.get("reasoning", "")).startswith("Error:"):
+                        errors += 1
+                    elif analysis.get("should_like"):
+                        liked += 1
+                    if analysis.get("should_comment"):
+                        commented += 1
+                    out.write(json.dumps({"post_id": post.post_id, "author_name": post.author_name,
+                                          "analysis": analysis}) + "\n")
+        finally:
+            self.ai_filter.save_index = True
+            if self.ai_filter.near_duplicates:
+                self.ai_filter.near_duplicates.save()
+        end = time.perf_counter()
+        elapsed = end - start
+        analysis_elapsed = end - analysis_start
+
+        latencies.sort()
+        summary = {
+            "posts": len(posts),
+            "prefiltered": len(posts) - len(queued),
+            "analyzed": len(queued),
+            "errors": errors,
+            "fallbacks": fallbacks,
+            "liked": liked,
+            "commented": commented,
+            "workers": self.workers,
+            "elapsed": elapsed,
+            "posts_per_second": len(posts) / elapsed if elapsed else 0.0,
+            # Pre-filtered posts cost next to nothing, so the analysis rate is reported on its own
+            "analysis_elapsed": analysis_elapsed,
+            "analyzed_per_second": len(queued) / analysis_elapsed if analysis_elapsed else 0.0,
+            "latency_p50": latencies[len(latencies) // 2] if latencies else 0.0,
+            "latency_p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0,
+            "output_path": str(output_path),
+        }
+        summary.update({name.split(".")[-1]: metrics.counters.get(name, 0) - before[name] for name in COUNTERS})
+        summary["tiers"] = {name.split(".")[-1]: metrics.counters.get(name, 0) - before[name] for name in TIER_COUNTERS}
+        return summary
+
+
+def print_summary(summary):
+    """Print the throughput report of a bulk analysis run"""
+    print(f"\nProcessed {summary['posts']} posts in {summary['elapsed']:.1f}s "
+          f"({summary['posts_per_second']:.1f} posts/s, {summary['workers']} workers)")
+    print(f"  Pre-filtered: {summary['prefiltered']}, analyzed: {summary['analyzed']} "
+          f"in {summary['analysis_elapsed']:.1f}s ({summary['analyzed_per_second']:.1f} posts/s)")
+    print(f"  Cache hits: {summary['cache_hits']}, near-duplicate hits: {summary['near_duplicate_hits']}, "
+          f"LLM calls: {summary['llm_calls']}, errors: {summary['errors']}, fallbacks: {summary['fallbacks']}")
+    answered = sum(summary["tiers"].values())
+    if answered:
+        print("  Tiers: " + ", ".join(f"{tier} {count / answered:.0%} ({count})" for tier, count in summary["tiers"].items()))
+    print(f"  Per-post latency: p50={summary['latency_p50']:.3f}s p99={summary['latency_p99']:.3f}s")
+    print(f"  Would like: {summary['liked']}, would comment: {summary['commented']}")
+    print(f"  Results: {summary['output_path']}")
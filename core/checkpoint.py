@@ -0,0 +1,103 @@
+import os
+import json
+from pathlib import Path
+
+from config import CHECKPOINT_DIR
+from core.post import Post
+from utils.clock import system_clock
+
+
+class RunCheckpoint:
+    """
+    Persisted progress of a feed run: the scraped post queue, the pre-filter
+    decisions, and per-post analysis and action outcomes.
+    Every step is written atomically, so an interrupted run can be resumed
+    with `main.py --resume` without scrolling the feed or re-querying the LLM.
+    """
+
+    def __init__(self, name="feed", checkpoint_dir=None, clock=None):
+        self.clock = clock or system_clock
+        self.path = Path(checkpoint_dir or CHECKPOINT_DIR) / f"{name}.json"
+        self.state = None
+
+    def exists(self):
+        return self.path.exists()
+
+    def load(self):
+        """Load a previous checkpoint, returns False if there is nothing to resume"""
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, 'r') as f:
+                self.state = json.load(f)
+            return True
+        except Exception as e:
+            print(f"Error loading checkpoint {self.path}: {e}")
+            self.state = None
+            return False
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(temp_path, self.path)
+
+    def start(self, posts, decisions, dry_run=False):
+        """Begin a new run with the scraped queue"""
+        self.state = {
+            "started_at": self.clock.time(),
+            "dry_run": dry_run,
+            "posts": [post.to_dict() for post in posts],
+            "decisions": [list(decision) for decision in decisions],
+            "steps": {}
+        }
+        self._save()
+
+    @property
+    def posts(self):
+        return [Post.from_dict(post) for post in self.state["posts"]]
+
+    @property
+    def decisions(self):
+        return [tuple(decision) for decision in self.state["decisions"]]
+
+    @property
+    def dry_run(self):
+        return self.state.get("dry_run", False)
+
+    def restart_steps(self, dry_run):
+        """
+        Forget which posts were handled, keeping their analyses
+
+        Used when a run is resumed in the other mode: a dry run performed
+        none of the actions its done steps stand for.
+        """
+        for step in self.state["steps"].values():
+            step.pop("done", None)
+            step.pop("results", None)
+        self.state["dry_run"] = dry_run
+        self._save()
+
+    def step(self, post_id):
+        return self.state["steps"].get(post_id, {})
+
+    def record_analysis(self, post_id, analysis):
+        self.state["steps"].setdefault(post_id, {})["analysis"] = analysis
+        self._save()
+
+    def record_done(self, post_id, results=None):
+        """Mark a post as fully handled, with its action results if any"""
+        step = self.state["steps"].setdefault(post_id, {})
+        step["results"] = results
+        step["done"] = True
+        self._save()
+
+    def completed_count(self):
+        return sum(1 for step in self.state["steps"].values() if step.get("done"))
+
+    def finish(self):
+        """The run completed, nothing left to resume"""
+        if self.path.exists():
+            self.path.unlink()
+        self.state = None
@@ -0,0 +1,171 @@
+import re
+import zlib
+from pathlib import Path
+from string import Formatter
+
+from config import (
+    TEMPLATES_DIR,
+    COMMENT_TEMPLATES_ENABLED,
+    COMMENT_TEMPLATE_MIN_CONFIDENCE,
+    COMMENT_TEMPLATE_MAX_WORDS,
+    COMMENT_TEMPLATE_EXCLUDE_KEYWORDS
+)
+from utils.metrics import metrics
+
+SECTION_PATTERN = re.compile(r"^\[(\w+)\]$")
+WORD_PATTERN = re.compile(r"\w+")
+
+# Routine post categories: (pattern, weight) pairs, combined as a noisy-OR into a confidence
+CATEGORY_RULES = {
+    "new_role": [
+        (re.compile(r"\b(?:starting|started|start) a new (?:position|role|job)\b", re.I), 0.9),
+        (re.compile(r"\b(?:joined|joining)\b.*\b(?:team|as|at)\b", re.I), 0.6),
+        (re.compile(r"\bnew (?:position|role|job|chapter)\b", re.I), 0.5),
+        (re.compile(r"\b(?:happy|excited|thrilled|pleased) to (?:share|announce)\b", re.I), 0.3),
+    ],
+    "work_anniversary": [
+        (re.compile(r"\bwork anniversary\b", re.I), 0.9),
+        (re.compile(r"\b(?:celebrating|celebrate)\b.*\byears? (?:at|with)\b", re.I), 0.8),
+        (re.compile(r"\byears? (?:at|with)\b", re.I), 0.4),
+    ],
+    "certification": [
+        (re.compile(r"\b(?:earned|passed|obtained|received|completed)\b.*\b(?:certification|certificate|certified)\b", re.I), 0.9),
+        (re.compile(r"\b(?:certification|certificate|certified)\b", re.I), 0.5),
+    ],
+    "launch": [
+        (re.compile(r"\b(?:we|I) (?:just |finally |officially )?(?:launched|shipped|released)\b", re.I), 0.8),
+        (re.compile(r"\b(?:is|are) (?:now )?live\b", re.I), 0.5),
+        (re.compile(r"\blaunch(?:ed|ing)?\b", re.I), 0.3),
+    ],
+}
+
+# Slots filled from the post text, every one optional
+SLOT_PATTERNS = {
+    "company": re.compile(r"\bat ([A-Z][\w&.-]*(?: [A-Z][\w&.-]*){0,3})"),
+    "role": re.compile(r"\bas (?:an? |the )?([A-Z][\w-]*(?: [A-Z][\w-]*){0,3})"),
+    # Plural counts only, "1 year at" would render as "1 years is quite a milestone"
+    "years": re.compile(r"\b([2-9]|[1-9]\d|two|three|four|five|six|seven|eight|nine|ten) years\b", re.I),
+    "topic": re.compile(r"#(\w+)"),
+}
+
+
+class CommentTemplates:
+    """
+    Template tier of the comment decision, run by AIFilter before the LLM.
+
+    A post is classified with cheap keyword rules into a routine category
+    (new role, work anniversary, certification, launch). When the category
+    is certain enough and the post is short and not promotional, a template
+    from templates/comments.txt is filled with the author and the slots
+    found in the text, and no LLM call is needed. Everything else gets a
+    bespoke comment from the LLM.
+    """
+
+    def __init__(self, templates_path=None, min_confidence=None, max_words=None):
+        self.enabled = COMMENT_TEMPLATES_ENABLED
+        self.templates_path = Path(templates_path or Path(TEMPLATES_DIR) / "comments.txt")
+        self.min_confidence = COMMENT_TEMPLATE_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        self.max_words = max_words or COMMENT_TEMPLATE_MAX_WORDS
+        self.exclude_keywords = [k.lower() for k in COMMENT_TEMPLATE_EXCLUDE_KEYWORDS]
+        self.templates = self._load_templates()
+
+    def _load_templates(self):
+        """
+        Parse the templates file once
+
+        Returns:
+            dict: category -> list of (template, set of placeholder names)
+        """
+        if not self.templates_path.exists():
+            return {}
+        with open(self.templates_path, 'r') as f:
+            lines = f.read().splitlines()
+
+        templates = {}
+        category = "general"
+        current = []
+
+        def flush():
+            text = " ".join(line.strip() for line in current if line.strip())
+            if text:
+                fields = {name for _, name, _, _ in Formatter().parse(text) if name}
+                templates.setdefault(category, []).append((text, fields))
+            current.clear()
+
+        for line in lines:
+            if line.startswith("#"):
+                continue
+            section = SECTION_PATTERN.match(line.strip())
+            if section:
+                flush()
+                category = section.group(1)
+            elif line.strip() == "---":
+                flush()
+            else:
+                current.append(line)
+        flush()
+        return templates
+
+    def classify(self, post_text):
+        """
+        Pick the most likely routine category of a post
+
+        Returns:
+            tuple: (category, confidence), category is None when no rule matched
+        """
+        best, best_confidence = None, 0.0
+        for category, rules in CATEGORY_RULES.items():
+            miss = 1.0
+            for pattern, weight in rules:
+                if pattern.search(post_text):
+                    miss *= 1.0 - weight
+            confidence = 1.0 - miss
+            if confidence > best_confidence:
+                best, best_confidence = category, confidence
+        return best, best_confidence
+
+    def _slots(self, author_name, post_text):
+        # Without a known author every template would greet "Unknown"
+        slots = {"author": author_name.split(" ")[0] if author_name and author_name != "Unknown" else ""}
+        for name, pattern in SLOT_PATTERNS.items():
+            match = pattern.search(post_text)
+            if match:
+                slots[name] = match.group(1)
+        return {name: value for name, value in slots.items() if value}
+
+    def match(self, author_name, post_text):
+        """
+        Fill a template comment for a routine post
+
+        Args:
+            author_name: Author of the post
+            post_text: Compiled post text
+
+        Returns:
+            tuple: (category, comment_text), or None when the post needs a bespoke comment
+        """
+        if not self.enabled or not self.templates:
+            return None
+
+        lowered = post_text.lower()
+        if any(keyword in lowered for keyword in self.exclude_keywords):
+            metrics.incr("comment_templates.excluded")
+            return None
+        if len(WORD_PATTERN.findall(post_text)) > self.max_words:
+            metrics.incr("comment_templates.too_long")
+            return None
+
+        category, confidence = self.classify(post_text)
+        if category is None or confidence < self.min_confidence:
+            metrics.incr("comment_templates.low_confidence")
+            return None
+
+        slots = self._slots(author_name, post_text)
+        candidates = [text for text, fields in self.templates.get(category, []) if fields <= slots.keys()]
+        if not candidates:
+            metrics.incr("comment_templates.unfillable")
+            return None
+
+        # Stable choice per post so a re-run writes the same comment
+        index = zlib.crc32(f"{author_name}\n{post_text}".encode("utf-8")) % len(candidates)
+        return category, candidates[index].format(**slots)
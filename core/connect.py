@@ -1,22 +1,28 @@
 # core/connect.py
-import time
-import random
 import json
 from pathlib import Path
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 
 from config import (
     DATA_DIR,
     MIN_ACTION_DELAY,
     MAX_ACTION_DELAY,
-    MAX_CONNECTION_REQUESTS_PER_DAY
+    MAX_CONNECTION_REQUESTS_PER_DAY,
+    REFINE_CONNECTION_NOTES
 )
+from core.message_writer import MessageWriter, TextBatch
+from core.selector_registry import selectors
+from utils.browser_perf import browser_perf
+from utils.clock import system_clock
+from utils.profiling import stage
+from utils.html_snapshot import take_snapshot
+from utils.waits import WaitManager
 
 class LinkedInConnect:
-    def __init__(self):
+    def __init__(self, clock=None, writer=None):
+        self.clock = clock or system_clock
+        self.writer = writer or MessageWriter()
+        self.waits = WaitManager(self.clock)
         self.history_path = Path(DATA_DIR) / "history.json"
         self.action_history = self._load_history()
     
@@ -24,7 +30,7 @@ class LinkedInConnect:
         """Load interaction history from file"""
         if self.history_path.exists():
             try:
-                with open(self.history_path, 'r') as f:
+                with stage("history_io"), open(self.history_path, 'r') as f:
                     return json.load(f)
             except:
                 return {"likes": {}, "comments": {}, "connections": {}, "messages": {}}
@@ -33,7 +39,7 @@ class LinkedInConnect:
     
     def _save_history(self):
         """Save interaction history to file"""
-        with open(self.history_path, 'w') as f:
+        with stage("history_io"), open(self.history_path, 'w') as f:
             json.dump(self.action_history, f)
     
     def search_and_connect(self, driver, search_url, max_connections=None):
@@ -61,14 +67,11 @@ class LinkedInConnect:
         
         print(f"Starting connection campaign. Will send up to {max_connections} requests.")
         
-        # Navigate to search URL
-        driver.get(search_url)
-        
-        # Wait for search results to load
+        # Navigate to search URL and wait for search results to load
         try:
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".reusable-search__result-container"))
-            )
+            with browser_perf.measure(driver, "connect.search", navigation=True):
+                driver.get(search_url)
+                self.waits.until(driver, "connect.result", 20, page_load=True)
         except TimeoutException:
             print("Timeout waiting for search results to load")
             return {"sent": 0, "skipped": 0, "errors": ["Timeout waiting for search results"]}
@@ -79,29 +82,50 @@ class LinkedInConnect:
             "errors": []
         }
         
-        # Get search result elements
-        search_results = driver.find_elements(By.CSS_SELECTOR, ".reusable-search__result-container")
+        # Get search result elements, parsed from one page snapshot when enabled
+        snapshot = take_snapshot(driver, "search")
+        search_results = selectors.find_all(snapshot or driver, "connect.result")
         print(f"Found {len(search_results)} search results")
         
+        # Profiles we haven't sent a request to yet
+        candidates = []
         for result in search_results:
+            profile_data = self._extract_profile_data(result)
+            profile_id = profile_data.get("profile_id")
+            
+            if not profile_id:
+                results["skipped"] += 1
+                continue
+            
+            # Check if we've already connected with this profile
+            if self._has_connection_request(profile_id):
+                print(f"Already sent connection request to {profile_data.get('name', 'unknown')}")
+                results["skipped"] += 1
+                continue
+            
+            candidates.append((result, profile_data))
+        
+        # Write the notes in the background, the UI loop only picks up finished texts
+        notes = TextBatch(self._write_connection_note, key=lambda candidate: candidate[1]["profile_id"],
+                          args=lambda candidate: (candidate[1], self._create_connection_note(candidate[1])))
+        notes.prefetch(candidates, max_connections)
+        
+        for index, (result, profile_data) in enumerate(candidates):
             if results["sent"] >= max_connections:
                 print(f"Reached maximum connections limit ({max_connections})")
                 break
             
+            # Skipped candidates hand their place in the background batch to the next ones
+            notes.prefetch(candidates[index:], max_connections - results["sent"])
+            
             try:
-                # Extract profile data
-                profile_data = self._extract_profile_data(result)
-                profile_id = profile_data.get("profile_id")
-                
-                if not profile_id:
-                    results["skipped"] += 1
-                    continue
-                
-                # Check if we've already connected with this profile
-                if self._has_connection_request(profile_id):
-                    print(f"Already sent connection request to {profile_data.get('name', 'unknown')}")
-                    results["skipped"] += 1
-                    continue
+                # Only results we act on get a live WebDriver handle
+                if snapshot:
+                    result = snapshot.resolve(driver, result)
+                    if result is None:
+                        results["errors"].append(f"Search result for {profile_data.get('name', 'unknown')} changed since snapshot")
+                        results["skipped"] += 1
+                        continue
                 
                 # Find connect button
                 connect_button = self._find_connect_button(result)
@@ -109,47 +133,52 @@ class LinkedInConnect:
                     results["skipped"] += 1
                     continue
                 
-                # Click connect button
-                driver.execute_script("arguments[0].click();", connect_button)
-                self._random_delay(1, 2)
-                
-                # Check if there's a "Add a note" option
-                try:
-                    add_note_button = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "button[aria-label='Add a note']"))
-                    )
-                    
-                    # Click "Add a note" button
-                    driver.execute_script("arguments[0].click();", add_note_button)
-                    self._random_delay(1, 2)
-                    
-                    # Write a personalized note
-                    note_input = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ".send-invite__custom-message"))
-                    )
-                    
-                    personalized_note = self._create_connection_note(profile_data)
-                    
-                    # Type connection note with human-like delays
-                    for char in personalized_note:
-                        note_input.send_keys(char)
-                        time.sleep(random.uniform(0.01, 0.08))
-                    
+                with browser_perf.measure(driver, "connect.request"):
+                    # Click connect button
+                    driver.execute_script("arguments[0].click();", connect_button)
                     self._random_delay(1, 2)
                     
-                    # Find and click the send button
-                    send_button = driver.find_element(By.CSS_SELECTOR, "button[aria-label='Send invitation']")
-                    driver.execute_script("arguments[0].click();", send_button)
-                    
-                except TimeoutException:
-                    # No "Add a note" option, just send the connection request
+                    # The invite dialog either offers "Add a note" or only "Send now",
+                    # whichever shows up first decides the branch
                     try:
-                        send_button = driver.find_element(By.CSS_SELECTOR, "button[aria-label='Send now']")
-                        driver.execute_script("arguments[0].click();", send_button)
-                    except NoSuchElementException:
-                        results["errors"].append(f"Could not find send button for {profile_data.get('name', 'unknown')}")
+                        option, option_button = self.waits.first_of(driver, ["connect.add_note", "connect.send_now"], 5)
+                    except TimeoutException:
+                        results["errors"].append(f"Invite dialog did not open for {profile_data.get('name', 'unknown')}")
                         results["skipped"] += 1
                         continue
+                    
+                    if option == "connect.add_note":
+                        # Click "Add a note" button
+                        driver.execute_script("arguments[0].click();", option_button)
+                        self._random_delay(1, 2)
+                        
+                        # Write a personalized note
+                        try:
+                            note_input = self.waits.until(driver, "connect.note_input", 5)
+                        except TimeoutException:
+                            results["errors"].append(f"Note field did not open for {profile_data.get('name', 'unknown')}")
+                            results["skipped"] += 1
+                            continue
+                        
+                        personalized_note = notes.get(candidates[index])
+                        
+                        # Type connection note with human-like delays
+                        for char in personalized_note:
+                            note_input.send_keys(char)
+                            self.clock.pause(0.01, 0.08)
+                        
+                        self._random_delay(1, 2)
+                        
+                        # Find and click the send button
+                        send_button = selectors.find(driver, "connect.send_invitation")
+                        if not send_button:
+                            results["errors"].append(f"Could not find send invitation button for {profile_data.get('name', 'unknown')}")
+                            results["skipped"] += 1
+                            continue
+                        driver.execute_script("arguments[0].click();", send_button)
+                    else:
+                        # No "Add a note" option, just send the connection request
+                        driver.execute_script("arguments[0].click();", option_button)
                 
                 # Record the connection request
                 self._record_connection_request(profile_data)
@@ -166,6 +195,7 @@ class LinkedInConnect:
                 results["errors"].append(error_msg)
                 results["skipped"] += 1
         
+        notes.close()
         print(f"Connection campaign completed. Sent: {results['sent']}, Skipped: {results['skipped']}")
         return results
     
@@ -173,30 +203,24 @@ class LinkedInConnect:
         """Extract profile data from search result element"""
         try:
             # Extract name
-            try:
-                name_element = result_element.find_element(By.CSS_SELECTOR, ".entity-result__title-text a")
+            name_element = selectors.find(result_element, "connect.name_link")
+            if name_element:
                 name = name_element.text.strip()
-                profile_url = name_element.get_attribute("href")
+                profile_url = name_element.get_attribute("href") or ""
                 # Extract profile ID from URL
                 profile_id = profile_url.split("/in/")[1].split("/")[0] if "/in/" in profile_url else None
-            except NoSuchElementException:
+            else:
                 name = "Unknown"
                 profile_url = ""
                 profile_id = None
             
             # Extract headline
-            try:
-                headline_element = result_element.find_element(By.CSS_SELECTOR, ".entity-result__primary-subtitle")
-                headline = headline_element.text.strip()
-            except NoSuchElementException:
-                headline = ""
+            headline_element = selectors.find(result_element, "connect.headline")
+            headline = headline_element.text.strip() if headline_element else ""
             
             # Extract company/location
-            try:
-                company_element = result_element.find_element(By.CSS_SELECTOR, ".entity-result__secondary-subtitle")
-                company = company_element.text.strip()
-            except NoSuchElementException:
-                company = ""
+            company_element = selectors.find(result_element, "connect.company")
+            company = company_element.text.strip() if company_element else ""
             
             return {
                 "name": name,
@@ -214,27 +238,20 @@ class LinkedInConnect:
         """Find the connect button in a search result"""
         try:
             # Try the primary connect button
-            connect_buttons = result_element.find_elements(By.CSS_SELECTOR, 
-                "button.artdeco-button[aria-label^='Connect with']")
+            connect_buttons = selectors.find_all(result_element, "connect.connect_button")
             
             if connect_buttons:
                 return connect_buttons[0]
             
             # Try the secondary connect button (might be in a dropdown)
-            more_buttons = result_element.find_elements(By.CSS_SELECTOR, 
-                "button.artdeco-dropdown__trigger[aria-label^='More actions']")
+            more_buttons = selectors.find_all(result_element, "connect.more_actions")
             
             if more_buttons:
                 more_button = more_buttons[0]
                 more_button.click()
-                time.sleep(1)
                 
-                # Find connect option in dropdown
-                connect_options = result_element.find_elements(By.CSS_SELECTOR, 
-                    "div.artdeco-dropdown__content li button[aria-label^='Connect with']")
-                
-                if connect_options:
-                    return connect_options[0]
+                # Find connect option in dropdown, not every profile has one
+                return self.waits.until(result_element, "connect.dropdown_connect", 1, optional=True)
             
             return None
             
@@ -252,7 +269,14 @@ class LinkedInConnect:
             f"Hi {name}, I came across your profile and was impressed by your experience at {profile_data.get('company', 'your company')}. I'd be glad to connect with you."
         ]
         
-        return random.choice(templates)
+        return self.clock.choice(templates)
+    
+    def _write_connection_note(self, profile_data, note=None):
+        """Connection note for a profile, personalized with the LLM when enabled; runs on a TextBatch worker"""
+        note = note or self._create_connection_note(profile_data)
+        if not REFINE_CONNECTION_NOTES:
+            return note
+        return self.writer.refine(note, profile_data, "note")
     
     def _has_connection_request(self, profile_id):
         """Check if we've already sent a connection request to this profile"""
@@ -269,7 +293,7 @@ class LinkedInConnect:
             self.action_history["connections"] = {}
             
         self.action_history["connections"][profile_id] = {
-            "timestamp": time.time(),
+            "timestamp": self.clock.time(),
             "details": profile_data
         }
         
@@ -277,7 +301,7 @@ class LinkedInConnect:
     
     def _count_todays_connections(self):
         """Count how many connection requests we've sent today"""
-        today_start = time.time() - (24 * 60 * 60)  # 24 hours ago
+        today_start = self.clock.time() - (24 * 60 * 60)  # 24 hours ago
         
         count = 0
         for profile_id, data in self.action_history.get("connections", {}).items():
@@ -290,5 +314,4 @@ class LinkedInConnect:
         """Add a random delay to simulate human behavior"""
         min_delay = min_delay or MIN_ACTION_DELAY
         max_delay = max_delay or MAX_ACTION_DELAY
-        delay = random.uniform(min_delay, max_delay)
-        time.sleep(delay)
\ No newline at end of file
+        self.clock.pause(min_delay, max_delay)
\ No newline at end of file
@@ -0,0 +1,311 @@
+import os
+import re
+import json
+import time
+from pathlib import Path
+from selenium.common.exceptions import TimeoutException
+
+from config import (
+    LINKEDIN_CONNECTIONS_URL,
+    CONNECTIONS_INDEX_PATH,
+    CONNECTIONS_REFRESH_MAX_SCROLLS,
+    CONNECTIONS_KNOWN_STREAK,
+    CONNECTIONS_FULL_REFRESH_DAYS,
+    MIN_SCROLL_DELAY,
+    MAX_SCROLL_DELAY
+)
+from core.selector_registry import selectors
+from utils.browser_perf import browser_perf
+from utils.clock import system_clock
+from utils.html_snapshot import take_snapshot
+from utils.waits import WaitManager
+from utils.query import compile_query, quote
+
+RELATIVE_TIME_PATTERN = re.compile(r"(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago", re.IGNORECASE)
+TIME_UNITS = {
+    "minute": 60,
+    "hour": 60 * 60,
+    "day": 24 * 60 * 60,
+    "week": 7 * 24 * 60 * 60,
+    "month": 30 * 24 * 60 * 60,
+    "year": 365 * 24 * 60 * 60,
+}
+DAY = 24 * 60 * 60
+
+
+def parse_connected_time(text, now=None):
+    """Approximate timestamp for a card badge like "Connected 2 weeks ago", None if unknown"""
+    now = now or time.time()
+    match = RELATIVE_TIME_PATTERN.search(text or "")
+    if match:
+        return now - int(match.group(1)) * TIME_UNITS[match.group(2).lower()]
+    if "today" in (text or "").lower() or "just now" in (text or "").lower():
+        return now
+    return None
+
+
+def extract_connection_data(connection_card):
+    """Extract connection data from a connection card element"""
+    try:
+        # Extract name
+        name_element = selectors.find(connection_card, "messenger.name")
+        name = name_element.text.strip() if name_element else "Unknown"
+
+        # Extract profile URL and ID
+        link_element = selectors.find(connection_card, "messenger.link")
+        if link_element:
+            profile_url = link_element.get_attribute("href") or ""
+            # Extract profile ID from URL
+            profile_id = profile_url.split("/in/")[1].split("/")[0] if "/in/" in profile_url else None
+        else:
+            profile_url = ""
+            profile_id = None
+
+        # Extract occupation
+        occupation_element = selectors.find(connection_card, "messenger.occupation")
+        occupation = occupation_element.text.strip() if occupation_element else ""
+
+        # Extract connection time (if available)
+        time_element = selectors.find(connection_card, "messenger.time_badge")
+        connected_time = time_element.text.strip() if time_element else ""
+
+        return {
+            "name": name,
+            "profile_id": profile_id,
+            "profile_url": profile_url,
+            "occupation": occupation,
+            "connected_time": connected_time
+        }
+    except Exception as e:
+        print(f"Error extracting connection data: {e}")
+        return {}
+
+
+class ConnectionsIndex:
+    """
+    Persisted local index of 1st-degree connections.
+
+    LinkedIn lists connections newest first, so a refresh only scrolls until
+    it runs into entries that are already indexed. Every
+    CONNECTIONS_FULL_REFRESH_DAYS the whole list is read instead, up to the
+    scroll cap, which drops removed connections when it reaches the end.
+    Targets are then picked from the index with a query expression (see
+    utils.query) instead of crawling the connections page on every run.
+    """
+
+    def __init__(self, index_path=None, clock=None):
+        self.clock = clock or system_clock
+        self.waits = WaitManager(self.clock)
+        self.index_path = Path(index_path or CONNECTIONS_INDEX_PATH)
+        self.connections = {}
+        self.order = []
+        self.last_full_refresh = None
+        self._load()
+
+    def __len__(self):
+        return len(self.connections)
+
+    def __contains__(self, profile_id):
+        return profile_id in self.connections
+
+    def get(self, profile_id):
+        return self.connections.get(profile_id)
+
+    def _load(self):
+        """Load the index from file"""
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                saved = json.load(f)
+            self.connections = saved.get("connections", {})
+            self.order = [profile_id for profile_id in saved.get("order", []) if profile_id in self.connections]
+            self.last_full_refresh = saved.get("last_full_refresh")
+        except Exception as e:
+            print(f"Error loading connections index, starting empty: {e}")
+            self.connections = {}
+            self.order = []
+            self.last_full_refresh = None
+
+    def save(self):
+        """Persist the index to file"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_suffix(".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump({"order": self.order, "connections": self.connections,
+                       "last_full_refresh": self.last_full_refresh}, f)
+        os.replace(temp_path, self.index_path)
+
+    def upsert(self, connection_data, now=None):
+        """
+        Add or update a connection from extracted card data
+
+        Returns:
+            bool: True if the connection was not indexed before
+        """
+        now = now or self.clock.time()
+        profile_id = connection_data.get("profile_id")
+        if not profile_id:
+            return False
+
+        entry = self.connections.get(profile_id)
+        is_new = entry is None
+        if is_new:
+            entry = {"profile_id": profile_id, "first_seen": now, "last_message_at": None}
+            self.connections[profile_id] = entry
+        entry.update({
+            "name": connection_data.get("name", entry.get("name", "")),
+            "profile_url": connection_data.get("profile_url", entry.get("profile_url", "")),
+            "occupation": connection_data.get("occupation", entry.get("occupation", "")),
+            "connected_time": connection_data.get("connected_time", entry.get("connected_time", "")),
+            "last_seen": now,
+        })
+        if is_new or entry.get("connected_at") is None:
+            entry["connected_at"] = parse_connected_time(entry["connected_time"], now)
+        return is_new
+
+    def record_message(self, profile_id, timestamp=None):
+        entry = self.connections.get(profile_id)
+        if entry is not None:
+            entry["last_message_at"] = timestamp or self.clock.time()
+
+    def sync_messages(self, message_history):
+        """Take last message times from the interaction history's "messages" section"""
+        for profile_id, message in message_history.items():
+            entry = self.connections.get(profile_id)
+            timestamp = message.get("timestamp")
+            if entry is not None and timestamp and (entry.get("last_message_at") or 0) < timestamp:
+                entry["last_message_at"] = timestamp
+
+    def full_refresh_due(self):
+        """Whether the last full read of the list is older than CONNECTIONS_FULL_REFRESH_DAYS"""
+        if self.last_full_refresh is None:
+            return True
+        return self.clock.time() - self.last_full_refresh >= CONNECTIONS_FULL_REFRESH_DAYS * DAY
+
+    def refresh(self, driver, full=None, max_scrolls=None):
+        """
+        Index connections from the connections page, newest first
+
+        Args:
+            driver: Selenium WebDriver instance
+            full: Keep scrolling past known entries (re-reads the whole list),
+                  defaults to whether a periodic full refresh is due
+            max_scrolls: Scroll limit (defaults to CONNECTIONS_REFRESH_MAX_SCROLLS)
+
+        Returns:
+            list: Entries that were not indexed before, newest first
+        """
+        max_scrolls = CONNECTIONS_REFRESH_MAX_SCROLLS if max_scrolls is None else max_scrolls
+        if full is None:
+            full = self.full_refresh_due()
+        try:
+            with browser_perf.measure(driver, "connections.load", navigation=True):
+                driver.get(LINKEDIN_CONNECTIONS_URL)
+                self.waits.until(driver, "messenger.card", 20, page_load=True)
+        except TimeoutException:
+            print("Timeout waiting for connections to load")
+            return []
+
+        incremental = bool(self.connections) and not full
+        new_ids = []
+        page_order = []
+        seen = set()
+        reached_end = False
+        capped = False
+        known_streak = 0
+        scrolls = 0
+        now = self.clock.time()
+
+        while True:
+            # Parsed from one page snapshot when enabled
+            snapshot = take_snapshot(driver, "connections")
+            added = 0
+            for card in selectors.find_all(snapshot or driver, "messenger.card"):
+                connection_data = extract_connection_data(card)
+                profile_id = connection_data.get("profile_id")
+                if not profile_id or profile_id in seen:
+                    continue
+                seen.add(profile_id)
+                page_order.append(profile_id)
+                added += 1
+
+                if self.upsert(connection_data, now):
+                    new_ids.append(profile_id)
+                    known_streak = 0
+                else:
+                    known_streak += 1
+                if incremental and known_streak >= CONNECTIONS_KNOWN_STREAK:
+                    break
+
+            if incremental and known_streak >= CONNECTIONS_KNOWN_STREAK:
+                break
+            if not added:
+                reached_end = True
+                break
+            if scrolls >= max_scrolls:
+                capped = True
+                break
+
+            driver.execute_script("window.scrollBy(0, 1000);")
+            self.clock.pause(MIN_SCROLL_DELAY, MAX_SCROLL_DELAY)
+            scrolls += 1
+
+        if full and reached_end:
+            # The whole list was read, so anything not on it is no longer a connection
+            self.connections = {profile_id: self.connections[profile_id] for profile_id in page_order}
+            self.order = page_order
+        else:
+            new = set(new_ids)
+            self.order = new_ids + [profile_id for profile_id in self.order if profile_id not in new]
+        if full and (reached_end or capped):
+            # A list longer than the scroll cap is never read to the end, the capped pass counts
+            # as the periodic one (without pruning) so the following runs stay incremental
+            self.last_full_refresh = now
+        self.save()
+
+        print(f"Connections index: {len(new_ids)} new, {len(self.connections)} total ({scrolls} scrolls)")
+        return [self.connections[profile_id] for profile_id in new_ids]
+
+    def _view(self, entry, now):
+        """Entry with derived fields for queries"""
+        connected_at = entry.get("connected_at")
+        last_message_at = entry.get("last_message_at")
+        return {
+            **entry,
+            "connected_days": (now - connected_at) / DAY if connected_at else None,
+            "messaged": bool(last_message_at),
+            "messaged_days": (now - last_message_at) / DAY if last_message_at else None,
+        }
+
+    def select(self, query=None, limit=None, exclude=None, include_messaged=False):
+        """
+        Connections matching a query, newest first
+
+        Args:
+            query: Filter expression, e.g. 'occupation ~ engineer and connected_days < 30'
+                   (a dict is treated as field = value conditions)
+            limit: Maximum number of results
+            exclude: Optional predicate(entry) for entries to skip
+            include_messaged: Also return connections that were messaged before
+
+        Returns:
+            list: Matching index entries
+        """
+        if isinstance(query, dict):
+            query = " and ".join(f"{field} = {quote(value)}" for field, value in query.items() if value)
+        predicate = compile_query(query or "")
+        now = self.clock.time()
+
+        results = []
+        for profile_id in self.order:
+            entry = self.connections[profile_id]
+            if not include_messaged and entry.get("last_message_at"):
+                continue
+            if exclude and exclude(entry):
+                continue
+            if predicate(self._view(entry, now)):
+                results.append(entry)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
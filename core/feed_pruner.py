@@ -0,0 +1,81 @@
+from collections import deque
+
+from config import FEED_PRUNE_ENABLED, FEED_PRUNE_BATCH
+from utils.clock import system_clock
+from utils.metrics import metrics
+
+# Empties finished posts in place and pins their height, so the layout and
+# the scroll position don't move. Returns the DOM size and JS heap after pruning.
+PRUNE_SCRIPT = """
+var urns = arguments[0], pruned = 0, scrollY = window.scrollY;
+for (var i = 0; i < urns.length; i++) {
+  var post = document.querySelector('[data-urn="' + CSS.escape(urns[i]) + '"]');
+  if (!post || post.classList.contains('linkedintel-pruned')) continue;
+  var height = post.getBoundingClientRect().height;
+  while (post.firstChild) post.removeChild(post.firstChild);
+  post.className = 'linkedintel-pruned';
+  post.style.height = height + 'px';
+  pruned++;
+}
+if (window.scrollY !== scrollY) window.scrollTo(0, scrollY);
+return {
+  pruned: pruned,
+  nodes: document.getElementsByTagName('*').length,
+  heap: window.performance && performance.memory ? performance.memory.usedJSHeapSize : null
+};
+"""
+
+
+class FeedPruner:
+    """
+    Collapses the DOM of feed posts that are finished with (extracted and
+    acted on, or skipped), tracked by data-urn.
+
+    Posts are pruned in batches with one execute_script call, which also
+    samples the tab's DOM node count and JS heap so the effect of pruning
+    on long sessions can be followed over time. With pruning disabled the
+    same call only takes the samples.
+    """
+
+    def __init__(self, enabled=None, batch_size=None, max_samples=1000, clock=None):
+        self.clock = clock or system_clock
+        self.enabled = FEED_PRUNE_ENABLED if enabled is None else enabled
+        self.batch_size = batch_size or FEED_PRUNE_BATCH
+        self.pending = []
+        self.pruned = 0
+        self.samples = deque(maxlen=max_samples)
+
+    def mark_done(self, driver, post_urn):
+        """Queue a post for pruning, flushing once a batch is full"""
+        if post_urn:
+            self.pending.append(post_urn)
+        if len(self.pending) >= self.batch_size:
+            self.flush(driver)
+
+    def flush(self, driver):
+        """Prune every queued post and take a DOM/heap sample"""
+        urns = self.pending if self.enabled else []
+        self.pending = []
+        try:
+            result = driver.execute_script(PRUNE_SCRIPT, urns) or {}
+        except Exception as e:
+            print(f"Error pruning feed posts: {e}")
+            return
+
+        self.pruned += result.get("pruned") or 0
+        nodes, heap = result.get("nodes"), result.get("heap")
+        self.samples.append((self.clock.time(), nodes, heap))
+        if nodes is not None:
+            metrics.histogram("feed.dom_nodes", nodes, "nodes")
+        if heap is not None:
+            metrics.histogram("feed.js_heap_mb", heap / 1024 / 1024, "MB")
+
+    def report(self):
+        """Print how the DOM size and heap developed over the session"""
+        if not self.samples:
+            return
+        first, last = self.samples[0], self.samples[-1]
+        peak_nodes = max(sample[1] or 0 for sample in self.samples)
+        print(f"\nFeed DOM: {first[1]} -> {last[1]} nodes (peak {peak_nodes}), {self.pruned} posts pruned")
+        if first[2] is not None and last[2] is not None:
+            print(f"Tab JS heap: {first[2] / 1024 / 1024:.1f} -> {last[2] / 1024 / 1024:.1f} MB")
@@ -1,9 +1,4 @@
-import time
-import random
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 
 from config import (
     LINKEDIN_FEED_URL, 
@@ -12,70 +7,97 @@ from config import (
     MIN_SCROLL_DELAY,
     MAX_SCROLL_DELAY
 )
+from core.post import Post
+from core.selector_registry import selectors
+from utils.browser_perf import browser_perf
+from utils.clock import system_clock
+from utils.metrics import metrics
+from utils.waits import WaitManager
 
 class FeedScraper:
-    def __init__(self):
+    def __init__(self, pruner=None, clock=None, seen=None):
+        self.clock = clock or system_clock
+        self.waits = WaitManager(self.clock)
         self.posts_scraped = 0
+        # Optional core.feed_pruner.FeedPruner, posts that are never acted on are pruned right away
+        self.pruner = pruner
+        # Optional utils.bloom.SeenPosts, posts handled in earlier runs are skipped unread
+        self.seen = seen
     
-    def scrape_feed(self, driver):
+    def _already_seen(self, driver, post_id):
+        """Whether a post was handled in an earlier run, pruning it if so"""
+        if self.seen is None or post_id not in self.seen:
+            return False
+        metrics.incr("feed.seen_skipped")
+        if self.pruner:
+            self.pruner.mark_done(driver, post_id)
+        return True
+    
+    def scrape_feed(self, driver, max_posts=None):
         """
         Scrapes the LinkedIn feed for posts
         
         Args:
             driver: Selenium WebDriver instance
+            max_posts: Number of posts to collect (defaults to MAX_POSTS_TO_SCRAPE)
             
         Returns:
-            list: List of dictionaries containing post data
+            list: List of Post records
         """
         print("Scraping LinkedIn feed...")
+        max_posts = max_posts or MAX_POSTS_TO_SCRAPE
         
-        # Navigate to feed
-        driver.get(LINKEDIN_FEED_URL)
-        
-        # Wait for feed to load
+        # Navigate to feed and wait for it to load
         try:
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".feed-shared-update-v2"))
-            )
+            with browser_perf.measure(driver, "feed.load", navigation=True):
+                driver.get(LINKEDIN_FEED_URL)
+                self.waits.until(driver, "feed.post", 20, page_load=True)
         except TimeoutException:
             print("Timeout waiting for feed to load")
             return []
         
         posts = []
+        seen_ids = set()
         scroll_count = 0
         
         # Scroll and collect posts
-        while (len(posts) < MAX_POSTS_TO_SCRAPE and 
+        while (len(posts) < max_posts and 
                scroll_count < MAX_SCROLL_ITERATIONS):
             
             # Get all posts currently visible
-            post_elements = driver.find_elements(By.CSS_SELECTOR, ".feed-shared-update-v2")
+            post_elements = selectors.find_all(driver, "feed.post")
             
             for post_element in post_elements:
                 # Skip posts we've already processed
                 post_id = post_element.get_attribute("data-urn")
-                if any(p.get("post_id") == post_id for p in posts):
+                if post_id in seen_ids:
+                    continue
+                seen_ids.add(post_id)
+                if self._already_seen(driver, post_id):
                     continue
                 
                 try:
                     post_data = self._extract_post_data(driver, post_element)
-                    if post_data and post_data["post_text"].strip():
+                    if post_data and post_data.post_text.strip():
                         posts.append(post_data)
                         print(f"Scraped post #{len(posts)}")
-                        print(f"👤 Author: {post_data['author_name']}")
-                        print(f"🔗 Profile: {post_data['author_link']}")
-                        print(f"📝 Text: {post_data['post_text'][:200]}{'...' if len(post_data['post_text']) > 200 else ''}")
-                        print(f"🔗 Post URL: {post_data['post_url']}")
+                        print(f"👤 Author: {post_data.author_name}")
+                        print(f"🔗 Profile: {post_data.author_link}")
+                        print(f"📝 Text: {post_data.post_text[:200]}{'...' if len(post_data.post_text) > 200 else ''}")
+                        print(f"🔗 Post URL: {post_data.post_url}")
 
                         # Stop scraping if we reach the max number of posts
-                        if len(posts) >= MAX_POSTS_TO_SCRAPE:
+                        if len(posts) >= max_posts:
                             break
+                    elif self.pruner:
+                        self.pruner.mark_done(driver, post_id)
                 except Exception as e:
                     print(f"Error extracting post data: {e}")
             
             # Scroll down to load more posts
-            driver.execute_script("window.scrollBy(0, 800);")
-            time.sleep(random.uniform(MIN_SCROLL_DELAY, MAX_SCROLL_DELAY))
+            with browser_perf.measure(driver, "feed.scroll"):
+                driver.execute_script("window.scrollBy(0, 800);")
+                self.clock.pause(MIN_SCROLL_DELAY, MAX_SCROLL_DELAY)
             scroll_count += 1
         
         print(f"Scraped {len(posts)} posts from feed")
@@ -90,7 +112,7 @@ class FeedScraper:
             post_element: The post web element
             
         Returns:
-            dict: Post data including author, text, and URLs
+            Post: Post record including author, text, and URLs
         """
         try:
             # Extract post ID
@@ -99,64 +121,47 @@ class FeedScraper:
             author_link = ""
 
             # Extract author info
-            try:
-                author_container = post_element.find_element(
-                    By.CSS_SELECTOR,
-                    "a.update-components-actor__meta-link"
-                )
-                author_link = author_container.get_attribute("href").strip()
+            author_container = selectors.find(post_element, "feed.author_link")
+            if author_container:
+                author_link = (author_container.get_attribute("href") or "").strip()
 
                 # Try to get the author name
-                try:
-                    author_name_span = author_container.find_element(
-                        By.CSS_SELECTOR,
-                        ".update-components-actor__title span span[aria-hidden='true']"
-                    )
-                    extracted_name = author_name_span.text.strip()
-                    if extracted_name:
-                        author_name = extracted_name
-                except NoSuchElementException:
+                author_name_span = selectors.find(author_container, "feed.author_name")
+                extracted_name = author_name_span.text.strip() if author_name_span else ""
+                if extracted_name:
+                    author_name = extracted_name
+                elif "linkedin.com/in/" in author_link:
                     # Fallback: extract name from the profile URL if name is not found
-                    if "linkedin.com/in/" in author_link:
-                        name_part = author_link.split("linkedin.com/in/")[1].split("?")[0]
-                        author_name = name_part.replace("-", " ").title()
+                    name_part = author_link.split("linkedin.com/in/")[1].split("?")[0]
+                    author_name = name_part.replace("-", " ").title()
 
-            except NoSuchElementException:
-                author_name = "Unknown"
-                author_link = ""
-
-            # Extract post text
-            try:
-                text_element = post_element.find_element(By.CSS_SELECTOR, ".feed-shared-update-v2__description")
-                post_text = text_element.text.strip()
-            except NoSuchElementException:
-                # Try alternative selectors for different post types
-                try:
-                    text_element = post_element.find_element(By.CSS_SELECTOR, ".feed-shared-text")
-                    post_text = text_element.text.strip()
-                except NoSuchElementException:
-                    post_text = ""
+            # Extract post text (alternative selectors cover different post types)
+            text_element = selectors.find(post_element, "feed.post_text")
+            post_text = text_element.text.strip() if text_element else ""
 
             # Extract post URL
-            try:
-                post_url_element = post_element.find_element(By.CSS_SELECTOR, ".feed-shared-update-v2__update-link-container a")
+            post_url_element = selectors.find(post_element, "feed.post_url")
+            if post_url_element:
                 post_url = post_url_element.get_attribute("href")
-            except NoSuchElementException:
+            elif "activity" in post_id:
                 # Generate fallback URL based on post ID
-                if "activity" in post_id:
-                    activity_id = post_id.split(":")[-1]
-                    post_url = f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}"
-                else:
-                    post_url = ""
+                activity_id = post_id.split(":")[-1]
+                post_url = f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}"
+            else:
+                post_url = ""
 
-            return {
-                "post_id": post_id,
-                "author_name": author_name,
-                "author_link": author_link,
-                "post_text": post_text,
-                "post_url": post_url,
-                "post_element": post_element  # Keep reference to the actual element for interactions
-            }
+            # Ads carry a "Promoted" label under the author, most posts don't, so misses aren't recorded
+            sponsored = selectors.find(post_element, "feed.sponsored_label", record_misses=False) is not None
+
+            # The element itself is not kept, ActionEngine re-resolves it by URN when needed
+            return Post(
+                post_id=post_id,
+                author_name=author_name,
+                author_link=author_link,
+                post_text=post_text,
+                post_url=post_url,
+                sponsored=sponsored
+            )
 
         except Exception as e:
             print(f"Error extracting data from post: {e}")
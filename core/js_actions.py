@@ -0,0 +1,187 @@
+from config import JS_ACTIONS_VERSION, COMMENT_EDITOR_TIMEOUT
+from core.selector_registry import selectors
+from utils.metrics import metrics
+
+# Helpers installed into the page once and reused by every later call.
+# Each takes the post element and the registry's selector alternatives and
+# returns a {status, matched} object, `matched` holding the index of the
+# alternative that worked for every logical element it looked up.
+LIBRARY = """
+(function () {
+  if (window.__linkedintel && window.__linkedintel.version === %(version)r) return;
+
+  function findAll(root, name, locators, matched) {
+    var candidates = locators[name] || [];
+    for (var i = 0; i < candidates.length; i++) {
+      var by = candidates[i][0], value = candidates[i][1], found = [];
+      if (by === 'xpath') {
+        var result = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var j = 0; j < result.snapshotLength; j++) found.push(result.snapshotItem(j));
+      } else {
+        found = Array.prototype.slice.call(root.querySelectorAll(value));
+      }
+      if (found.length) {
+        matched[name] = i;
+        return found;
+      }
+    }
+    matched[name] = -1;
+    return [];
+  }
+
+  function visible(element) {
+    return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+  }
+
+  function press(element) {
+    element.scrollIntoView({block: 'center'});
+    element.click();
+  }
+
+  function firstVisible(elements) {
+    for (var i = 0; i < elements.length; i++) {
+      if (visible(elements[i])) return elements[i];
+    }
+    return null;
+  }
+
+  window.__linkedintel = {
+    version: %(version)r,
+
+    likePost: function (post, locators) {
+      var matched = {};
+      var bar = findAll(post, 'action.social_bar', locators, matched)[0] || post;
+      var buttons = findAll(bar, 'action.like_button', locators, matched);
+      for (var i = 0; i < buttons.length; i++) {
+        var label = buttons[i].getAttribute('aria-label') || '';
+        if (label.toLowerCase().indexOf('like') === -1) continue;
+        if (buttons[i].getAttribute('aria-pressed') === 'true') {
+          return {status: 'already_liked', label: label, matched: matched};
+        }
+        press(buttons[i]);
+        return {status: 'liked', label: label, matched: matched};
+      }
+      return {status: 'not_found', matched: matched};
+    },
+
+    openCommentBox: function (post, locators, timeoutMs, done) {
+      var matched = {};
+      var editor = firstVisible(findAll(post, 'action.comment_editor', locators, matched));
+      if (!editor) {
+        var button = findAll(post, 'action.comment_button', locators, matched)[0];
+        if (!button) return done({status: 'not_found', matched: matched});
+        press(button);
+      }
+      var started = Date.now();
+      (function poll() {
+        editor = editor || firstVisible(findAll(post, 'action.comment_editor', locators, matched));
+        if (editor) {
+          editor.focus();
+          return done({status: 'ok', editor: editor, matched: matched});
+        }
+        if (Date.now() - started > timeoutMs) return done({status: 'timeout', matched: matched});
+        setTimeout(poll, 100);
+      })();
+    },
+
+    submitComment: function (post, locators) {
+      var matched = {};
+      var button = findAll(post, 'action.comment_submit', locators, matched)[0];
+      if (!button) return {status: 'not_found', matched: matched};
+      if (button.disabled) return {status: 'disabled', matched: matched};
+      press(button);
+      return {status: 'submitted', matched: matched};
+    }
+  };
+})();
+""" % {"version": JS_ACTIONS_VERSION}
+
+CALL = """
+if (!window.__linkedintel || window.__linkedintel.version !== %(version)r) return {status: 'not_installed'};
+return window.__linkedintel.%(function)s.apply(null, arguments);
+"""
+
+ASYNC_CALL = """
+if (!window.__linkedintel || window.__linkedintel.version !== %(version)r) {
+  return arguments[arguments.length - 1]({status: 'not_installed'});
+}
+window.__linkedintel.%(function)s.apply(null, arguments);
+"""
+
+
+class JsActions:
+    """
+    Like and comment primitives that run inside the page.
+
+    Each primitive finds, checks and presses its controls in a single
+    execute_script call instead of one WebDriver round trip per lookup,
+    attribute read and click. The helper library is installed on the first
+    call on every page. A primitive returns None when the script itself
+    failed, so callers can fall back to the WebDriver path.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry or selectors
+
+    def _locators(self, names):
+        return {name: [list(locator) for locator in self.registry.candidates(name)] for name in names}
+
+    def _call(self, driver, function, args, names, asynchronous=False):
+        locators = self._locators(names)
+        template = ASYNC_CALL if asynchronous else CALL
+        script = template % {"version": JS_ACTIONS_VERSION, "function": function}
+        execute = driver.execute_async_script if asynchronous else driver.execute_script
+
+        try:
+            metrics.incr("js_actions.calls")
+            result = execute(script, *args[:1], locators, *args[1:])
+            if isinstance(result, dict) and result.get("status") == "not_installed":
+                # First call on this page, send the helpers along with the call
+                metrics.incr("js_actions.installs")
+                result = execute(LIBRARY + script, *args[:1], locators, *args[1:])
+        except Exception as e:
+            print(f"In-page {function} failed: {e}")
+            metrics.incr("js_actions.errors")
+            return None
+
+        if not isinstance(result, dict):
+            return None
+        for name, index in (result.get("matched") or {}).items():
+            if name in locators and index is not None:
+                self.registry.record_match(name, locators[name], int(index))
+        return result
+
+    def like(self, driver, post_element):
+        """
+        Press the post's Like button unless it is already pressed
+
+        Returns:
+            str: "liked", "already_liked" or "not_found", None if the script failed
+        """
+        result = self._call(driver, "likePost", [post_element], ["action.social_bar", "action.like_button"])
+        return result and result.get("status")
+
+    def open_comment_box(self, driver, post_element, timeout=None):
+        """
+        Open the post's comment box and focus its editor
+
+        Returns:
+            tuple: (status, editor element) where status is "ok", "not_found" or
+                   "timeout"; (None, None) if the script failed
+        """
+        timeout_ms = int((timeout or COMMENT_EDITOR_TIMEOUT) * 1000)
+        result = self._call(driver, "openCommentBox", [post_element, timeout_ms],
+                            ["action.comment_editor", "action.comment_button"], asynchronous=True)
+        if not result:
+            return None, None
+        return result.get("status"), result.get("editor")
+
+    def submit_comment(self, driver, post_element):
+        """
+        Press the comment box's submit button
+
+        Returns:
+            str: "submitted", "disabled" or "not_found", None if the script failed
+        """
+        result = self._call(driver, "submitComment", [post_element], ["action.comment_submit"])
+        return result and result.get("status")
@@ -0,0 +1,139 @@
+import json
+import time
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from config import DATA_DIR, OUTREACH_WORKERS, OUTREACH_SURPLUS, OUTREACH_MODEL, MESSAGE_MAX_CHARS, CONNECTION_NOTE_MAX_CHARS
+from utils.deadlines import deadline_caller
+from utils.metrics import metrics
+
+LIMITS = {"message": MESSAGE_MAX_CHARS, "note": CONNECTION_NOTE_MAX_CHARS}
+
+
+class MessageWriter:
+    """
+    Personalizes outreach drafts (direct messages and connection notes) with
+    the LLM. Results are cached per recipient and draft, and any failure
+    falls back to the draft itself, so a text is always available.
+    """
+
+    def __init__(self, llm_client=None, cache_dir=None):
+        if llm_client is None:
+            from core.ai_filter import client as llm_client
+        # Any object with the genai `models.generate_content` interface, e.g. utils.fake_llm
+        self.client = llm_client
+        self.cache_dir = Path(cache_dir or Path(DATA_DIR) / "cache")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _cache_file(self, kind, draft, profile):
+        key = hashlib.sha256(f"{kind}\n{profile.get('profile_id', '')}\n{draft}".encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{kind}_{key}.json"
+
+    def _create_prompt(self, kind, draft, profile):
+        what = "connection request note" if kind == "note" else "direct message"
+        about = profile.get("occupation") or profile.get("headline") or "unknown"
+        return f"""
+Rewrite this LinkedIn {what} so it reads natural and personal.
+
+RECIPIENT: {profile.get('name', 'there')}
+RECIPIENT HEADLINE: {about}
+DRAFT:
+{draft}
+
+Keep the meaning and the tone of the draft, stay under {LIMITS[kind]} characters and
+don't add placeholders. Reply with the rewritten text only.
+"""
+
+    def refine(self, draft, profile, kind="message"):
+        """
+        Personalize a draft for one recipient
+
+        Args:
+            draft: Template text with the recipient's name already filled in
+            profile: Recipient data (name, occupation or headline, profile_id)
+            kind: "message" or "note"
+
+        Returns:
+            str: The personalized text, the draft if the LLM call fails
+        """
+        cache_file = self._cache_file(kind, draft, profile)
+        if cache_file.exists():
+            metrics.incr("outreach.cache_hits")
+            with open(cache_file, 'r') as f:
+                return json.load(f)["text"]
+
+        try:
+            metrics.incr("outreach.llm_calls")
+            with metrics.timer("outreach.llm_latency"):
+                response = deadline_caller.call(
+                    "outreach",
+                    self.client.models.generate_content,
+                    model=OUTREACH_MODEL,
+                    contents=self._create_prompt(kind, draft, profile)
+                )
+            text = (response.text or "").strip()
+        except Exception as e:
+            print(f"Error personalizing {kind} for {profile.get('name', 'unknown')}: {e}")
+            metrics.incr("outreach.errors")
+            return draft
+
+        if not text:
+            return draft
+        text = text[:LIMITS[kind]]
+        with open(cache_file, 'w') as f:
+            json.dump({"text": text}, f)
+        return text
+
+
+class TextBatch:
+    """
+    Outreach texts written in the background while the UI loop runs.
+
+    The loop calls `prefetch` with the targets from its current position on,
+    which keeps texts being written for the sends still to come plus
+    OUTREACH_SURPLUS more, so skipped targets don't leave the loop waiting
+    on the LLM. Each text is picked up with `get`, which only blocks if that
+    particular text isn't finished yet.
+    """
+
+    def __init__(self, compose, key, args, workers=None, surplus=None):
+        """
+        Args:
+            compose: Writes one text, runs on a worker
+            key: target -> identifier of the target
+            args: target -> arguments for compose, called on the loop's thread
+            workers: Concurrent writers (defaults to OUTREACH_WORKERS)
+            surplus: Extra texts written ahead (defaults to OUTREACH_SURPLUS)
+        """
+        self.compose = compose
+        self.key = key
+        self.args = args
+        self.surplus = OUTREACH_SURPLUS if surplus is None else surplus
+        self.pool = ThreadPoolExecutor(max_workers=workers or OUTREACH_WORKERS)
+        self.futures = {}
+        self.submitted = set()
+
+    def close(self):
+        # Texts for targets the loop never reached are not needed anymore
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def prefetch(self, upcoming, needed):
+        """Start writing the texts of the next `needed` targets plus the surplus, in loop order"""
+        for target in upcoming[:max(0, needed) + self.surplus]:
+            key = self.key(target)
+            if key not in self.submitted:
+                self.submitted.add(key)
+                self.futures[key] = self.pool.submit(self.compose, *self.args(target))
+
+    def get(self, target):
+        """Text for a target, waiting for its background job or composing it now if it was never prefetched"""
+        key = self.key(target)
+        future = self.futures.pop(key, None)
+        if future is None:
+            metrics.incr("outreach.inline")
+            return self.compose(*self.args(target))
+        start = time.perf_counter()
+        text = future.result()
+        metrics.observe("outreach.ui_wait", time.perf_counter() - start)
+        return text
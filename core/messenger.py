@@ -1,32 +1,41 @@
 # core/messenger.py
 import time
-import random
 import json
 from pathlib import Path
-import openai
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 
 from config import (
     DATA_DIR, 
     MIN_ACTION_DELAY,
     MAX_ACTION_DELAY,
-    MAX_MESSAGES_PER_DAY
+    MAX_MESSAGES_PER_DAY,
+    MESSAGE_COOLDOWN_DAYS,
+    REFINE_MESSAGES
 )
+from core.connections_index import ConnectionsIndex, extract_connection_data
+from core.message_writer import MessageWriter, TextBatch
+from core.selector_registry import selectors
+from utils.browser_perf import browser_perf
+from utils.clock import system_clock
+from utils.profiling import stage
+from utils.html_snapshot import take_snapshot
+from utils.waits import WaitManager
 
 class LinkedInMessenger:
-    def __init__(self):
+    def __init__(self, clock=None, writer=None):
+        self.clock = clock or system_clock
+        self.writer = writer or MessageWriter()
+        self.waits = WaitManager(self.clock)
         self.history_path = Path(DATA_DIR) / "history.json"
         self.templates_path = Path(DATA_DIR) / "templates" / "messages.txt"
         self.action_history = self._load_history()
+        self.connections = ConnectionsIndex(clock=self.clock)
     
     def _load_history(self):
         """Load interaction history from file"""
         if self.history_path.exists():
             try:
-                with open(self.history_path, 'r') as f:
+                with stage("history_io"), open(self.history_path, 'r') as f:
                     return json.load(f)
             except:
                 return {"likes": {}, "comments": {}, "connections": {}, "messages": {}}
@@ -35,7 +44,7 @@ class LinkedInMessenger:
     
     def _save_history(self):
         """Save interaction history to file"""
-        with open(self.history_path, 'w') as f:
+        with stage("history_io"), open(self.history_path, 'w') as f:
             json.dump(self.action_history, f)
     
     def send_messages_to_connections(self, driver, max_messages=None, connection_filter=None):
@@ -45,7 +54,9 @@ class LinkedInMessenger:
         Args:
             driver: Selenium WebDriver instance
             max_messages: Maximum number of messages to send
-            connection_filter: Optional filter criteria for connections
+            connection_filter: Optional query over the connections index, e.g.
+                'occupation ~ engineer and connected_days < 30' (see utils.query),
+                or a dict of exact field values
             
         Returns:
             dict: Results including number of messages sent
@@ -63,17 +74,13 @@ class LinkedInMessenger:
         
         print(f"Starting messaging campaign. Will send up to {max_messages} messages.")
         
-        # Navigate to connections page
-        driver.get("https://www.linkedin.com/mynetwork/invite-connect/connections/")
-        
-        # Wait for connections to load
-        try:
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".mn-connection-card"))
-            )
-        except TimeoutException:
-            print("Timeout waiting for connections to load")
-            return {"sent": 0, "skipped": 0, "errors": ["Timeout waiting for connections"]}
+        # Bring the local index up to date, scrolling only past connections added since the last run
+        # (on the first build every connection is new, which says nothing about when requests were accepted)
+        first_build = not len(self.connections)
+        for entry in self.connections.refresh(driver):
+            if not first_build:
+                self._record_acceptance(entry["profile_id"])
+        self.connections.sync_messages(self.action_history["messages"])
         
         results = {
             "sent": 0,
@@ -81,75 +88,91 @@ class LinkedInMessenger:
             "errors": []
         }
         
-        # Get connection elements
-        connection_cards = driver.find_elements(By.CSS_SELECTOR, ".mn-connection-card")
-        print(f"Found {len(connection_cards)} connections")
+        # Pick targets from the index instead of crawling the page
+        targets = self.connections.select(
+            connection_filter,
+            exclude=lambda entry: self._has_recent_message(entry["profile_id"]),
+            include_messaged=MESSAGE_COOLDOWN_DAYS is not None
+        )
+        print(f"Found {len(targets)} matching connections in an index of {len(self.connections)}")
+        
+        # Write the messages in the background, the UI loop only picks up finished texts
+        texts = TextBatch(self._write_message, key=lambda target: target["profile_id"],
+                          args=lambda target: (target, self._draft_message(target)))
+        texts.prefetch(targets, max_messages)
         
-        for card in connection_cards:
+        # Cards still rendered from the refresh, parsed from one page snapshot when enabled
+        snapshot = take_snapshot(driver, "connections")
+        rendered = self._rendered_cards(snapshot or driver)
+        
+        for index, connection_data in enumerate(targets):
             if results["sent"] >= max_messages:
                 print(f"Reached maximum messages limit ({max_messages})")
                 break
             
+            # Skipped targets hand their place in the background batch to the next ones
+            texts.prefetch(targets[index:], max_messages - results["sent"])
+            
             try:
-                # Extract connection data
-                connection_data = self._extract_connection_data(card)
-                connection_id = connection_data.get("profile_id")
-                
-                if not connection_id:
-                    results["skipped"] += 1
-                    continue
-                
-                # Apply filter if provided
-                if connection_filter and not self._apply_filter(connection_data, connection_filter):
-                    print(f"Connection {connection_data.get('name', 'unknown')} filtered out")
-                    results["skipped"] += 1
-                    continue
-                
-                # Check if we've already messaged this connection recently
-                if self._has_recent_message(connection_id):
-                    print(f"Already messaged {connection_data.get('name', 'unknown')} recently")
-                    results["skipped"] += 1
-                    continue
-                
-                # Click on the "Message" button
-                message_button = card.find_element(By.CSS_SELECTOR, "button[aria-label^='Message']")
-                driver.execute_script("arguments[0].click();", message_button)
+                connection_id = connection_data["profile_id"]
                 
-                # Wait for message box to appear
-                try:
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ".msg-form__contenteditable"))
-                    )
-                except TimeoutException:
-                    results["errors"].append(f"Timeout waiting for message box for {connection_data.get('name', 'unknown')}")
+                # Click on the "Message" button, on the card if it is rendered, else on the profile
+                card = rendered.get(connection_id)
+                if card is not None and snapshot:
+                    # Only cards we act on get a live WebDriver handle
+                    card = snapshot.resolve(driver, card)
+                message_button = selectors.find(card, "messenger.message_button") if card is not None else None
+                if not message_button and connection_data.get("profile_url"):
+                    rendered = {}
+                    try:
+                        with browser_perf.measure(driver, "messenger.profile", navigation=True):
+                            driver.get(connection_data["profile_url"])
+                            message_button = self.waits.until(driver, "messenger.profile_message_button", 10, page_load=True)
+                    except TimeoutException:
+                        message_button = None
+                if not message_button:
+                    results["errors"].append(f"Could not find message button for {connection_data.get('name', 'unknown')}")
                     results["skipped"] += 1
                     continue
-                
-                # Generate message
-                message_text = self._generate_message(connection_data)
-                
-                # Type message with human-like delays
-                message_input = driver.find_element(By.CSS_SELECTOR, ".msg-form__contenteditable")
-                for char in message_text:
-                    message_input.send_keys(char)
-                    time.sleep(random.uniform(0.01, 0.08))  # Slight delay between keystrokes
-                
-                self._random_delay(1, 2)
-                
-                # Send message
-                send_button = driver.find_element(By.CSS_SELECTOR, "button.msg-form__send-button")
-                driver.execute_script("arguments[0].click();", send_button)
-                
-                # Wait for message to be sent
-                self._random_delay(2, 4)
-                
-                # Close the message dialog
-                try:
-                    close_button = driver.find_element(By.CSS_SELECTOR, "button[data-control-name='overlay.close_conversation_window']")
-                    driver.execute_script("arguments[0].click();", close_button)
-                except NoSuchElementException:
-                    # If close button not found, try clicking outside the dialog
-                    driver.execute_script("document.querySelector('.msg-overlay-bubble-header').click();")
+                with browser_perf.measure(driver, "messenger.send"):
+                    driver.execute_script("arguments[0].click();", message_button)
+                    
+                    # Wait for message box to appear
+                    try:
+                        message_input = self.waits.until(driver, "messenger.message_box", 10)
+                    except TimeoutException:
+                        results["errors"].append(f"Timeout waiting for message box for {connection_data.get('name', 'unknown')}")
+                        results["skipped"] += 1
+                        continue
+                    
+                    # Message written in the background
+                    message_text = texts.get(connection_data)
+                    
+                    # Type message with human-like delays
+                    for char in message_text:
+                        message_input.send_keys(char)
+                        self.clock.pause(0.01, 0.08)  # Slight delay between keystrokes
+                    
+                    self._random_delay(1, 2)
+                    
+                    # Send message
+                    send_button = selectors.find(driver, "messenger.send_button")
+                    if not send_button:
+                        results["errors"].append(f"Could not find send button for {connection_data.get('name', 'unknown')}")
+                        results["skipped"] += 1
+                        continue
+                    driver.execute_script("arguments[0].click();", send_button)
+                    
+                    # Wait for message to be sent
+                    self._random_delay(2, 4)
+                    
+                    # Close the message dialog
+                    close_button = selectors.find(driver, "messenger.close_button")
+                    if close_button:
+                        driver.execute_script("arguments[0].click();", close_button)
+                    else:
+                        # If close button not found, try clicking outside the dialog
+                        driver.execute_script("document.querySelector('.msg-overlay-bubble-header').click();")
                 
                 # Record the message
                 self._record_message(connection_data, message_text)
@@ -166,67 +189,38 @@ class LinkedInMessenger:
                 results["errors"].append(error_msg)
                 results["skipped"] += 1
         
+        texts.close()
+        self.connections.save()
         print(f"Messaging campaign completed. Sent: {results['sent']}, Skipped: {results['skipped']}")
         return results
     
+    def _rendered_cards(self, root):
+        """Connection cards currently on the page, by profile id"""
+        cards = {}
+        for card in selectors.find_all(root, "messenger.card"):
+            link_element = selectors.find(card, "messenger.link")
+            profile_url = (link_element.get_attribute("href") or "") if link_element else ""
+            if "/in/" in profile_url:
+                cards[profile_url.split("/in/")[1].split("/")[0]] = card
+        return cards
+    
     def _extract_connection_data(self, connection_card):
         """Extract connection data from a connection card element"""
-        try:
-            # Extract name
-            try:
-                name_element = connection_card.find_element(By.CSS_SELECTOR, ".mn-connection-card__name")
-                name = name_element.text.strip()
-            except NoSuchElementException:
-                name = "Unknown"
-            
-            # Extract profile URL and ID
-            try:
-                link_element = connection_card.find_element(By.CSS_SELECTOR, ".mn-connection-card__link")
-                profile_url = link_element.get_attribute("href")
-                # Extract profile ID from URL
-                profile_id = profile_url.split("/in/")[1].split("/")[0] if "/in/" in profile_url else None
-            except NoSuchElementException:
-                profile_url = ""
-                profile_id = None
-            
-            # Extract occupation
-            try:
-                occupation_element = connection_card.find_element(By.CSS_SELECTOR, ".mn-connection-card__occupation")
-                occupation = occupation_element.text.strip()
-            except NoSuchElementException:
-                occupation = ""
-            
-            # Extract connection time (if available)
-            try:
-                time_element = connection_card.find_element(By.CSS_SELECTOR, ".time-badge")
-                connected_time = time_element.text.strip()
-            except NoSuchElementException:
-                connected_time = ""
-            
-            return {
-                "name": name,
-                "profile_id": profile_id,
-                "profile_url": profile_url,
-                "occupation": occupation,
-                "connected_time": connected_time
-            }
-        except Exception as e:
-            print(f"Error extracting connection data: {e}")
-            return {}
-
-    def _apply_filter(self, connection_data, connection_filter):
-        """Apply the given filter to the connection data"""
-        # Example filter: Only message connections who are in a certain industry or occupation
-        if connection_filter.get("occupation") and connection_data.get("occupation") != connection_filter["occupation"]:
-            return False
-        return True
+        return extract_connection_data(connection_card)
     
     def _has_recent_message(self, connection_id):
-        """Check if a message has been sent to this connection recently"""
-        return connection_id in self.action_history["messages"] and self.action_history["messages"][connection_id].get("sent_today", False)
+        """Check if this connection was messaged before, or within MESSAGE_COOLDOWN_DAYS when set"""
+        message = self.action_history["messages"].get(connection_id)
+        if not message:
+            return False
+        timestamp = message.get("timestamp")
+        # Records without a timestamp can't be dated, treat them as sent
+        if MESSAGE_COOLDOWN_DAYS is None or not timestamp:
+            return True
+        return self.clock.time() - timestamp < MESSAGE_COOLDOWN_DAYS * 24 * 60 * 60
 
-    def _generate_message(self, connection_data):
-        """Generate a message to send to the connection"""
+    def _draft_message(self, connection_data):
+        """Fill a random message template in for the connection"""
         # Load templates if available
         try:
             with open(self.templates_path, 'r') as f:
@@ -235,13 +229,15 @@ class LinkedInMessenger:
             templates = ["Hi {{name}}, I hope you're doing well! Let's connect and chat about opportunities."]
 
         # Pick a random template and personalize it
-        template = random.choice(templates).strip()
-        message = template.replace("{{name}}", connection_data.get("name", "there"))
+        template = self.clock.choice(templates).strip()
+        return template.replace("{{name}}", connection_data.get("name", "there"))
 
-        # Use OpenAI to refine or generate a message based on the template
-        refined_message = self._refine_message_with_openai(message, connection_data)
-        
-        return refined_message
+    def _write_message(self, connection_data, message=None):
+        """Message for a connection, personalized with the LLM when enabled; runs on a TextBatch worker"""
+        message = message or self._draft_message(connection_data)
+        if not REFINE_MESSAGES:
+            return message
+        return self.writer.refine(message, connection_data, "message")
 
     
     def _record_message(self, connection_data, message_text):
@@ -249,20 +245,36 @@ class LinkedInMessenger:
         connection_id = connection_data.get("profile_id")
         if connection_id:
             self.action_history["messages"][connection_id] = {
+                "timestamp": self.clock.time(),
+                "name": connection_data.get("name", ""),
                 "message": message_text,
                 "sent_today": True
             }
+            self.connections.record_message(connection_id, self.action_history["messages"][connection_id]["timestamp"])
+            self._save_history()
+    
+    def _record_acceptance(self, connection_id):
+        """Mark a pending connection request as accepted the first time the profile shows up as a connection"""
+        request = self.action_history.get("connections", {}).get(connection_id)
+        if request and not request.get("accepted_at"):
+            request["accepted_at"] = self.clock.time()
             self._save_history()
     
+    def _sent_today(self, message):
+        """Whether a recorded message was sent on the clock's current day"""
+        timestamp = message.get("timestamp")
+        if not timestamp:
+            return False
+        return time.strftime("%Y-%m-%d", time.localtime(timestamp)) == self.clock.today()
+
     def _count_todays_messages(self):
         """Count how many messages have been sent today"""
-        today = time.strftime("%Y-%m-%d")
         count = 0
         for connection_id, action in self.action_history["messages"].items():
-            if action.get("sent_today"):
+            if self._sent_today(action):
                 count += 1
         return count
 
     def _random_delay(self, min_seconds, max_seconds):
         """Wait for a random period to simulate human-like interaction"""
-        time.sleep(random.uniform(min_seconds, max_seconds))
+        self.clock.pause(min_seconds, max_seconds)
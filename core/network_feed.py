@@ -0,0 +1,176 @@
+import json
+from selenium.common.exceptions import TimeoutException
+
+from config import (
+    LINKEDIN_FEED_URL,
+    MAX_POSTS_TO_SCRAPE,
+    MAX_SCROLL_ITERATIONS,
+    MIN_SCROLL_DELAY,
+    MAX_SCROLL_DELAY,
+    FEED_RESPONSE_PATTERNS,
+    RESPONSES_DIR,
+    SAVE_RESPONSES
+)
+from core.feed_scrapper import FeedScraper
+from core.post import Post
+from core.selector_registry import selectors
+from utils.browser_perf import browser_perf
+from utils.metrics import metrics
+from utils.network_capture import NetworkCapture
+
+
+def _text(value):
+    """Voyager wraps most strings as {"text": ...}, sometimes nested twice"""
+    while isinstance(value, dict):
+        value = value.get("text")
+    return value if isinstance(value, str) else ""
+
+
+def _update_urn(update):
+    metadata = update.get("metadata") or update.get("updateMetadata") or {}
+    return metadata.get("backendUrn") or metadata.get("urn") or ""
+
+
+def _is_sponsored(update):
+    """Ads come with sponsored metadata and a "Promoted" actor sub-description"""
+    if update.get("sponsoredMetadata") or update.get("*sponsoredMetadata"):
+        return True
+    actor = update.get("actor") or {}
+    return _text(actor.get("subDescription")).strip().startswith("Promoted")
+
+
+def _find_updates(node, found):
+    """Collect feed update entities anywhere in a response, without descending into reshares"""
+    if isinstance(node, dict):
+        if "actor" in node and ("metadata" in node or "updateMetadata" in node):
+            found.append(node)
+            return
+        for value in node.values():
+            _find_updates(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _find_updates(value, found)
+
+
+def decode_feed_response(body):
+    """
+    Decode a feed API response (normalized REST or GraphQL JSON) into Post records
+
+    Args:
+        body: Response body as text or already parsed JSON
+
+    Returns:
+        list: Post records in feed order, posts without an activity URN are dropped
+    """
+    payload = json.loads(body) if isinstance(body, str) else body
+
+    updates = []
+    _find_updates(payload, updates)
+
+    # Normalized responses list the entities in "included" and the feed order in "*elements"
+    data = payload.get("data", {}) if isinstance(payload, dict) else {}
+    order = data.get("*elements") if isinstance(data, dict) else None
+    if order:
+        position = {urn: index for index, urn in enumerate(order)}
+        updates.sort(key=lambda update: position.get(update.get("entityUrn"), len(position)))
+
+    posts = []
+    for update in updates:
+        post_id = _update_urn(update)
+        if "activity" not in post_id:
+            continue
+
+        actor = update.get("actor") or {}
+        author_name = _text(actor.get("name")).strip() or "Unknown"
+        author_link = ((actor.get("navigationContext") or {}).get("actionTarget") or "").strip()
+
+        share_url = (update.get("socialContent") or {}).get("shareUrl")
+        activity_id = post_id.split(":")[-1]
+        post_url = share_url or f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}"
+
+        posts.append(Post(
+            post_id=post_id,
+            author_name=author_name,
+            author_link=author_link,
+            post_text=_text(update.get("commentary")).strip(),
+            post_url=post_url,
+            sponsored=_is_sponsored(update)
+        ))
+    return posts
+
+
+class NetworkFeedScraper(FeedScraper):
+    """
+    Feed scraper that reads posts from the feed API responses the page loads
+    while scrolling instead of extracting them from the rendered DOM.
+    Only the elements that are acted on are looked up later, by URN.
+    Falls back to DOM scraping when the driver has no performance log.
+    """
+
+    def scrape_feed(self, driver, max_posts=None):
+        """
+        Scrapes the LinkedIn feed for posts from captured network responses
+
+        Args:
+            driver: Selenium WebDriver instance started with performance logging
+            max_posts: Number of posts to collect (defaults to MAX_POSTS_TO_SCRAPE)
+
+        Returns:
+            list: List of Post records
+        """
+        max_posts = max_posts or MAX_POSTS_TO_SCRAPE
+        capture = NetworkCapture(driver, FEED_RESPONSE_PATTERNS, RESPONSES_DIR if SAVE_RESPONSES else None,
+                                 clock=self.clock)
+        if not capture.start():
+            print("Falling back to DOM scraping")
+            return super().scrape_feed(driver, max_posts)
+
+        print("Scraping LinkedIn feed from network responses...")
+
+        # Posts have to be rendered before they can be acted on
+        try:
+            with browser_perf.measure(driver, "feed.load", navigation=True):
+                driver.get(LINKEDIN_FEED_URL)
+                self.waits.until(driver, "feed.post", 20, page_load=True)
+        except TimeoutException:
+            print("Timeout waiting for feed to load")
+            return []
+
+        posts = []
+        seen_ids = set()
+        scroll_count = 0
+
+        while len(posts) < max_posts and scroll_count < MAX_SCROLL_ITERATIONS:
+            for url, body in capture.drain():
+                try:
+                    decoded = decode_feed_response(body)
+                except ValueError as e:
+                    print(f"Could not decode feed response {url[:80]}: {e}")
+                    metrics.incr("network.decode_errors")
+                    continue
+
+                for post_data in decoded:
+                    if post_data.post_id in seen_ids or not post_data.post_text:
+                        continue
+                    seen_ids.add(post_data.post_id)
+                    if self._already_seen(driver, post_data.post_id):
+                        continue
+                    posts.append(post_data)
+                    metrics.incr("network.posts")
+                    print(f"Captured post #{len(posts)} by {post_data.author_name}")
+                    if len(posts) >= max_posts:
+                        break
+                if len(posts) >= max_posts:
+                    break
+
+            if len(posts) >= max_posts:
+                break
+
+            # Scrolling makes the page request the next batch
+            with browser_perf.measure(driver, "feed.scroll"):
+                driver.execute_script("window.scrollBy(0, 800);")
+                self.clock.pause(MIN_SCROLL_DELAY, MAX_SCROLL_DELAY)
+            scroll_count += 1
+
+        print(f"Captured {len(posts)} posts from feed responses")
+        return posts
@@ -0,0 +1,29 @@
+from dataclasses import dataclass, asdict, fields
+
+
+@dataclass(slots=True)
+class Post:
+    """
+    Compact record of a scraped feed post.
+    Only the URN and extracted fields are kept; the WebElement is re-resolved
+    from the `data-urn` attribute when an action actually needs it.
+    """
+    post_id: str
+    author_name: str = "Unknown"
+    author_link: str = ""
+    post_text: str = ""
+    post_url: str = ""
+    sponsored: bool = False
+
+    @property
+    def short_id(self):
+        """Activity id without the URN prefix"""
+        return (self.post_id or "unknown").split(":")[-1]
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        known = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
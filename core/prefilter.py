@@ -0,0 +1,154 @@
+import re
+import json
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from config import (
+    PREFILTER_ENABLED,
+    PREFILTER_MODEL_PATH,
+    PREFILTER_HASH_DIM,
+    PREFILTER_SKIP_THRESHOLD,
+    PREFILTER_BIAS,
+    PREFILTER_BLOCKED_AUTHORS,
+    PREFILTER_ALLOWED_AUTHORS,
+    PREFILTER_SKIP_KEYWORDS,
+    PREFILTER_TERM_WEIGHTS
+)
+from utils.metrics import metrics
+
+TOKEN_PATTERN = re.compile(r"[#\w']+")
+
+
+class PostPreFilter:
+    """
+    Cheap local scoring stage that runs before AIFilter.
+
+    Posts are first checked against keyword/author rules, then scored with a
+    linear model over hashed TF-IDF features. Posts that are obviously not
+    worth an action never reach the LLM.
+    """
+
+    def __init__(self):
+        self.enabled = PREFILTER_ENABLED
+        self.dim = PREFILTER_HASH_DIM
+        self.threshold = PREFILTER_SKIP_THRESHOLD
+        self.bias = PREFILTER_BIAS
+        self.blocked_authors = {a.lower() for a in PREFILTER_BLOCKED_AUTHORS}
+        self.allowed_authors = {a.lower() for a in PREFILTER_ALLOWED_AUTHORS}
+        self.skip_keywords = [k.lower() for k in PREFILTER_SKIP_KEYWORDS]
+        self.weights = self._load_weights()
+
+    def _load_weights(self):
+        """Load trained weights if available, otherwise hash the configured term weights"""
+        model_path = Path(PREFILTER_MODEL_PATH)
+        if model_path.exists():
+            try:
+                with open(model_path, 'r') as f:
+                    model = json.load(f)
+                self.dim = model.get("dim", self.dim)
+                self.bias = model.get("bias", self.bias)
+                self.threshold = model.get("threshold", self.threshold)
+                weights = np.zeros(self.dim, dtype=np.float32)
+                for index, weight in model.get("weights", {}).items():
+                    weights[int(index) % self.dim] = weight
+                return weights
+            except Exception as e:
+                print(f"Error loading pre-filter model, using configured weights: {e}")
+
+        weights = np.zeros(self.dim, dtype=np.float32)
+        for term, weight in PREFILTER_TERM_WEIGHTS.items():
+            weights[self._hash(term.lower())] += weight
+        return weights
+
+    def _hash(self, token):
+        """Stable feature index for a token (Python's hash() is salted per process)"""
+        return zlib.crc32(token.encode("utf-8")) % self.dim
+
+    def _tokenize(self, text):
+        return TOKEN_PATTERN.findall(text.lower())
+
+    def score_posts(self, posts):
+        """
+        Score a batch of posts with the linear model
+
+        Args:
+            posts: List of Post records
+
+        Returns:
+            numpy.ndarray: One score per post, higher means more worth analyzing
+        """
+        rows, cols = [], []
+        for row, post in enumerate(posts):
+            for token in self._tokenize(post.post_text):
+                rows.append(row)
+                cols.append(self._hash(token))
+
+        scores = np.full(len(posts), self.bias, dtype=np.float32)
+        if not rows:
+            return scores
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+
+        # Term frequencies per (post, feature) pair
+        pairs, counts = np.unique(rows * self.dim + cols, return_counts=True)
+        pair_rows = pairs // self.dim
+        pair_cols = pairs % self.dim
+        doc_lengths = np.bincount(rows, minlength=len(posts))
+        tf = counts / doc_lengths[pair_rows]
+
+        # Smoothed IDF computed over the batch itself
+        df = np.bincount(pair_cols, minlength=self.dim)
+        idf = np.log((1 + len(posts)) / (1 + df[pair_cols])) + 1.0
+
+        contributions = tf * idf * self.weights[pair_cols]
+        scores += np.bincount(pair_rows, weights=contributions, minlength=len(posts)).astype(np.float32)
+        return scores
+
+    def _rule_decision(self, post):
+        """Return (passed, reason) for rule matches, or None when no rule applies"""
+        author = post.author_name.lower()
+        if author in self.allowed_authors:
+            return True, "allowed author"
+        if author in self.blocked_authors:
+            return False, "blocked author"
+        if post.sponsored:
+            return False, "sponsored post"
+
+        text = post.post_text.lower()
+        for keyword in self.skip_keywords:
+            if keyword in text:
+                return False, f"keyword '{keyword}'"
+        return None
+
+    def filter_posts(self, posts):
+        """
+        Decide which posts are worth sending to the LLM
+
+        Args:
+            posts: List of Post records
+
+        Returns:
+            list: One (passed, reason) tuple per post, in the same order
+        """
+        if not self.enabled or not posts:
+            return [(True, "pre-filter disabled") for _ in posts]
+
+        with metrics.timer("prefilter.batch"):
+            scores = self.score_posts(posts)
+            decisions = []
+            for post, score in zip(posts, scores):
+                decision = self._rule_decision(post)
+                if decision is None:
+                    if score < self.threshold:
+                        decision = (False, f"score {score:.2f} below {self.threshold:.2f}")
+                    else:
+                        decision = (True, f"score {score:.2f}")
+                decisions.append(decision)
+
+        skipped = sum(1 for passed, _ in decisions if not passed)
+        metrics.incr("prefilter.scored", len(decisions))
+        metrics.incr("prefilter.skipped", skipped)
+        return decisions
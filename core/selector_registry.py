@@ -0,0 +1,272 @@
+import json
+import threading
+from pathlib import Path
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException
+
+from config import DATA_DIR
+
+# Ordered alternatives per logical element. The order here is only the
+# initial one, the registry moves whichever selector last worked to the front.
+SELECTORS = {
+    # Feed
+    "feed.post": [
+        (By.CSS_SELECTOR, ".feed-shared-update-v2"),
+    ],
+    "feed.author_link": [
+        (By.CSS_SELECTOR, "a.update-components-actor__meta-link"),
+    ],
+    "feed.author_name": [
+        (By.CSS_SELECTOR, ".update-components-actor__title span span[aria-hidden='true']"),
+    ],
+    "feed.post_text": [
+        (By.CSS_SELECTOR, ".feed-shared-update-v2__description"),
+        (By.CSS_SELECTOR, ".feed-shared-text"),
+    ],
+    "feed.post_url": [
+        (By.CSS_SELECTOR, ".feed-shared-update-v2__update-link-container a"),
+    ],
+    "feed.sponsored_label": [
+        (By.XPATH, ".//*[contains(@class, 'update-components-actor__sub-description')][contains(normalize-space(.), 'Promoted')]"),
+    ],
+
+    # Post actions
+    "action.social_bar": [
+        (By.XPATH, ".//div[contains(@class, 'social-actions') or contains(@class, 'feed-shared-social-actions')]"),
+    ],
+    "action.like_button": [
+        (By.XPATH, ".//button[contains(@aria-label, 'Like') or contains(@aria-label, 'like') or contains(@type, 'like-button')]"),
+    ],
+    "action.comment_button": [
+        (By.CSS_SELECTOR, "button.comment-button"),
+        (By.CSS_SELECTOR, "button[data-control-name='comment']"),
+    ],
+    "action.comment_editor": [
+        (By.CSS_SELECTOR, "div.ql-editor"),
+    ],
+    "action.comment_submit": [
+        (By.CSS_SELECTOR, "button.comments-comment-box__submit-button--cr"),
+    ],
+
+    # Search and connect
+    "connect.result": [
+        (By.CSS_SELECTOR, ".reusable-search__result-container"),
+    ],
+    "connect.name_link": [
+        (By.CSS_SELECTOR, ".entity-result__title-text a"),
+    ],
+    "connect.headline": [
+        (By.CSS_SELECTOR, ".entity-result__primary-subtitle"),
+    ],
+    "connect.company": [
+        (By.CSS_SELECTOR, ".entity-result__secondary-subtitle"),
+    ],
+    "connect.connect_button": [
+        (By.CSS_SELECTOR, "button.artdeco-button[aria-label^='Connect with']"),
+    ],
+    "connect.more_actions": [
+        (By.CSS_SELECTOR, "button.artdeco-dropdown__trigger[aria-label^='More actions']"),
+    ],
+    "connect.dropdown_connect": [
+        (By.CSS_SELECTOR, "div.artdeco-dropdown__content li button[aria-label^='Connect with']"),
+    ],
+    "connect.add_note": [
+        (By.CSS_SELECTOR, "button[aria-label='Add a note']"),
+    ],
+    "connect.note_input": [
+        (By.CSS_SELECTOR, ".send-invite__custom-message"),
+    ],
+    "connect.send_invitation": [
+        (By.CSS_SELECTOR, "button[aria-label='Send invitation']"),
+    ],
+    "connect.send_now": [
+        (By.CSS_SELECTOR, "button[aria-label='Send now']"),
+    ],
+
+    # Messaging
+    "messenger.card": [
+        (By.CSS_SELECTOR, ".mn-connection-card"),
+    ],
+    "messenger.name": [
+        (By.CSS_SELECTOR, ".mn-connection-card__name"),
+    ],
+    "messenger.link": [
+        (By.CSS_SELECTOR, ".mn-connection-card__link"),
+    ],
+    "messenger.occupation": [
+        (By.CSS_SELECTOR, ".mn-connection-card__occupation"),
+    ],
+    "messenger.time_badge": [
+        (By.CSS_SELECTOR, ".time-badge"),
+    ],
+    "messenger.message_button": [
+        (By.CSS_SELECTOR, "button[aria-label^='Message']"),
+    ],
+    "messenger.profile_message_button": [
+        (By.CSS_SELECTOR, "main .pv-top-card button[aria-label^='Message']"),
+        (By.CSS_SELECTOR, "main button[aria-label^='Message']"),
+    ],
+    "messenger.message_box": [
+        (By.CSS_SELECTOR, ".msg-form__contenteditable"),
+    ],
+    "messenger.send_button": [
+        (By.CSS_SELECTOR, "button.msg-form__send-button"),
+    ],
+    "messenger.close_button": [
+        (By.CSS_SELECTOR, "button[data-control-name='overlay.close_conversation_window']"),
+    ],
+}
+
+
+class SelectorRegistry:
+    """
+    Central registry of selectors with per-selector hit/miss counters.
+
+    Lookups use find_elements, so a miss costs one round trip and no
+    exception. Whichever alternative last matched is tried first next
+    time, and the order and counters are persisted between runs.
+    """
+
+    def __init__(self, stats_path=None, selectors=None):
+        self.stats_path = Path(stats_path or Path(DATA_DIR) / "selector_stats.json")
+        self._lock = threading.Lock()
+        self.order = {name: list(alternatives) for name, alternatives in (selectors or SELECTORS).items()}
+        self.stats = {}
+        self._load_stats()
+
+    def _key(self, locator):
+        return f"{locator[0]}={locator[1]}"
+
+    def _load_stats(self):
+        """Restore counters and the last known good order from file"""
+        if not self.stats_path.exists():
+            return
+        try:
+            with open(self.stats_path, 'r') as f:
+                saved = json.load(f)
+        except Exception as e:
+            print(f"Error loading selector stats: {e}")
+            return
+
+        for name, entries in saved.items():
+            if name not in self.order:
+                continue
+            known = {self._key(locator): locator for locator in self.order[name]}
+            ranked = [known[entry["selector"]] for entry in entries if entry["selector"] in known]
+            # Selectors added since the last run keep their configured position at the end
+            ranked += [locator for locator in self.order[name] if locator not in ranked]
+            self.order[name] = ranked
+            for entry in entries:
+                if entry["selector"] in known:
+                    self.stats[(name, entry["selector"])] = {"hits": entry.get("hits", 0), "misses": entry.get("misses", 0)}
+
+    def save(self):
+        """Persist counters and current order to file"""
+        with self._lock:
+            saved = {
+                name: [
+                    {"selector": self._key(locator), **self.stats.get((name, self._key(locator)), {"hits": 0, "misses": 0})}
+                    for locator in alternatives
+                ]
+                for name, alternatives in self.order.items()
+            }
+        with open(self.stats_path, 'w') as f:
+            json.dump(saved, f, indent=2)
+
+    def _record(self, name, locator, hit):
+        with self._lock:
+            counters = self.stats.setdefault((name, self._key(locator)), {"hits": 0, "misses": 0})
+            if hit:
+                counters["hits"] += 1
+                alternatives = self.order[name]
+                if alternatives[0] != locator:
+                    alternatives.remove(locator)
+                    alternatives.insert(0, locator)
+            else:
+                counters["misses"] += 1
+
+    def locator(self, name):
+        """Best known (By, value) pair for a logical element"""
+        return self.order[name][0]
+
+    def candidates(self, name):
+        """All (By, value) alternatives for a logical element, best known first"""
+        return list(self.order[name])
+
+    def record_match(self, name, candidates, index):
+        """
+        Record the outcome of a lookup done outside the registry (e.g. in injected JS)
+
+        Args:
+            name: Logical element name
+            candidates: The alternatives that were tried, in order
+            index: Position of the alternative that matched, -1 if none did
+        """
+        tried = candidates if index < 0 else candidates[:index + 1]
+        for position, locator in enumerate(tried):
+            self._record(name, tuple(locator), position == index)
+
+    def find_all(self, root, name, record_misses=True):
+        """
+        Find all elements matching the first working alternative
+
+        Args:
+            root: WebDriver or WebElement to search within
+            name: Logical element name, e.g. "feed.post_text"
+            record_misses: False while polling, so waits don't inflate miss counts
+
+        Returns:
+            list: Matching elements, empty if no alternative matched
+        """
+        for locator in list(self.order[name]):
+            elements = root.find_elements(*locator)
+            if elements:
+                self._record(name, locator, True)
+                return elements
+            if record_misses:
+                self._record(name, locator, False)
+        return []
+
+    def find(self, root, name, record_misses=True):
+        """Find the first element for a logical name, or None"""
+        elements = self.find_all(root, name, record_misses)
+        return elements[0] if elements else None
+
+    def presence_of(self, name, visible=False):
+        """WebDriverWait condition that is satisfied by any alternative"""
+        def _condition(root):
+            try:
+                element = self.find(root, name, record_misses=False)
+                if element is None or (visible and not element.is_displayed()):
+                    return False
+                return element
+            except StaleElementReferenceException:
+                return False
+        return _condition
+
+    def dead_selectors(self, min_attempts=5):
+        """Selectors that have been tried at least `min_attempts` times and never matched"""
+        dead = []
+        with self._lock:
+            for (name, selector), counters in self.stats.items():
+                if counters["hits"] == 0 and counters["misses"] >= min_attempts:
+                    dead.append((name, selector, counters["misses"]))
+        return sorted(dead)
+
+    def report(self):
+        """Print hit rates and dead selectors"""
+        print("\nSelector hit rates:")
+        with self._lock:
+            items = sorted(self.stats.items())
+        for (name, selector), counters in items:
+            attempts = counters["hits"] + counters["misses"]
+            if attempts:
+                print(f"  {name} [{selector}]: {counters['hits']}/{attempts} hits")
+        dead = self.dead_selectors()
+        if dead:
+            print("Dead selectors (never matched):")
+            for name, selector, misses in dead:
+                print(f"  {name} [{selector}] - {misses} misses")
+
+
+selectors = SelectorRegistry()
@@ -1,7 +1,5 @@
 # main.py
 import sys
-import time
-import random
 import argparse
 from pathlib import Path
 from selenium import webdriver
@@ -10,13 +8,28 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
 # Import project modules
-from config import HEADLESS_MODE, MAX_POSTS_TO_SCRAPE
+from config import (HEADLESS_MODE, MAX_POSTS_TO_SCRAPE, FEED_INGESTION, CORPUS_PATH, SAVE_CORPUS, ANALYZE_WORKERS,
+                    SEEN_POSTS_ENABLED)
 from core.auth import LinkedInAuth
 from core.feed_scrapper import FeedScraper
-from core.ai_filter import AIFilter
+from core.network_feed import NetworkFeedScraper
+from core.ai_filter import AIFilter, tier_rates
 from core.action_engine import ActionEngine
+from core.prefilter import PostPreFilter
+from core.selector_registry import selectors
+from core.checkpoint import RunCheckpoint
+from core.feed_pruner import FeedPruner
+from core.bulk_analysis import BulkAnalyzer, print_summary
+from utils.bloom import SeenPosts
+from utils.browser_perf import browser_perf
+from utils.clock import system_clock
+from utils.metrics import metrics
+from utils.corpus import PostCorpus
+from utils.history_query import print_stats
+from utils.profiling import profiled, stage
+from utils.waits import wait_latencies
 
-def setup_driver():
+def setup_driver(capture_network=False):
     """Set up and configure the Selenium WebDriver"""
     options = Options()
     if HEADLESS_MODE:
@@ -29,6 +42,9 @@ def setup_driver():
     options.add_argument("--ignore-certificate-errors")  # Add this line to ignore SSL errors
     options.add_argument("--allow-insecure-localhost")  # Allow insecure localhost connections (optional)
     options.add_argument("--incognito")  # Use incognito mode
+    if capture_network:
+        # Network events are read from the performance log by NetworkFeedScraper
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
     # Use webdriver_manager to automatically handle ChromeDriver
     service = Service(ChromeDriverManager().install())
     
@@ -37,12 +53,39 @@ def setup_driver():
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="LinkedIntel - LinkedIn Automation with AI")
+    parser.add_argument("command", nargs="?", choices=["run", "stats", "analyze"], default="run",
+                        help="run (default) automates LinkedIn, stats summarizes the interaction history, "
+                             "analyze scores the stored post corpus without a browser")
     parser.add_argument("--mode", choices=["feed", "connect", "message"], default="feed",
                         help="Operation mode: feed (default), connect, or message")
     parser.add_argument("--posts", type=int, default=MAX_POSTS_TO_SCRAPE,
                         help=f"Maximum number of posts to process (default: {MAX_POSTS_TO_SCRAPE})")
     parser.add_argument("--dry-run", action="store_true",
                         help="Analyze but don't perform any actions")
+    parser.add_argument("--ingest", choices=["dom", "network"], default=FEED_INGESTION,
+                        help=f"Feed ingestion: rendered DOM or the page's own API responses (default: {FEED_INGESTION})")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted feed run from its checkpoint instead of scraping again")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the run and write .prof and collapsed-stack files to data/profiles")
+    parser.add_argument("--browser-perf", action="store_true",
+                        help="Record browser-side layout, script, heap and navigation timings in the run metrics")
+    parser.add_argument("--days", type=int, default=7,
+                        help="stats: size of the reporting window in days (default: 7)")
+    parser.add_argument("--export",
+                        help="stats: export the full history to a .csv or .parquet file")
+    parser.add_argument("--input", default=str(CORPUS_PATH),
+                        help=f"analyze: post corpus to read, .jsonl or .jsonl.zst (default: {CORPUS_PATH})")
+    parser.add_argument("--output",
+                        help="analyze: results file (default: a new file in data/analysis)")
+    parser.add_argument("--workers", type=int, default=ANALYZE_WORKERS,
+                        help=f"analyze: concurrent LLM calls (default: {ANALYZE_WORKERS})")
+    parser.add_argument("--limit", type=int,
+                        help="analyze: only the first N posts of the corpus")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="analyze: ignore cached and near-duplicate analyses, call the LLM for every post")
+    parser.add_argument("--fake-llm", action="store_true",
+                        help="analyze: use the offline fake LLM client to load-test the pipeline")
     
     return parser.parse_args()
 
@@ -51,15 +94,40 @@ def main():
     print("Starting LinkedIntel...")
     args = parse_arguments()
     
+    # Stats only read the local history, no browser needed
+    if args.command == "stats":
+        with profiled("stats", args.profile):
+            print_stats(args.days, args.export)
+        return
+    
+    if args.command == "analyze":
+        with profiled("analyze", args.profile):
+            analyze_corpus(args)
+        return
+    
+    if args.browser_perf:
+        browser_perf.enabled = True
+    
+    with profiled(args.mode, args.profile):
+        run(args)
+
+def run(args):
+    """Run the selected automation mode"""
+    driver = None
+    ai_filter = None
     try:
         # Initialize WebDriver
-        driver = setup_driver()
+        driver = setup_driver(capture_network=args.ingest == "network")
         
         # Initialize components
         auth = LinkedInAuth()
-        feed_scraper = FeedScraper()
+        pruner = FeedPruner()
+        seen = SeenPosts() if SEEN_POSTS_ENABLED else None
+        scraper_class = NetworkFeedScraper if args.ingest == "network" else FeedScraper
+        feed_scraper = scraper_class(pruner, seen=seen)
         ai_filter = AIFilter()
         action_engine = ActionEngine()
+        prefilter = PostPreFilter()
         
         # Login to LinkedIn
         if not auth.login(driver):
@@ -69,7 +137,8 @@ def main():
         
         # Process feed
         if args.mode == "feed":
-            process_feed(driver, feed_scraper, ai_filter, action_engine, args.posts, args.dry_run)
+            process_feed(driver, feed_scraper, ai_filter, action_engine, args.posts, args.dry_run, prefilter,
+                         resume=args.resume, pruner=pruner, seen=seen)
         # Add other modes here as they're implemented
         
         # Clean up
@@ -80,31 +149,123 @@ def main():
     except Exception as e:
         print(f"Error in main execution: {e}")
     finally:
+        # Persist selector ordering so the next run starts with what worked
+        try:
+            selectors.report()
+            selectors.save()
+        except Exception as e:
+            print(f"Error saving selector stats: {e}")
+        
+        # Keep observed wait latencies so the next run starts with adaptive timeouts
+        try:
+            wait_latencies.report()
+            wait_latencies.save()
+        except Exception as e:
+            print(f"Error saving wait latencies: {e}")
+        
+        # Drop the cached analysis instructions instead of waiting for their TTL
+        if ai_filter is not None:
+            ai_filter.release_context()
+        
         # Always close the driver
         try:
             driver.quit()
         except:
             pass
 
-def process_feed(driver, feed_scraper, ai_filter, action_engine, max_posts=10, dry_run=False):
+def analyze_corpus(args):
+    """Run the analysis pipeline over the stored post corpus, no browser needed"""
+    corpus = PostCorpus(args.input)
+    posts = corpus.posts(limit=args.limit)
+    if not posts:
+        print(f"No posts in corpus {corpus.path}")
+        return
+    
+    llm_client = None
+    if args.fake_llm:
+        from utils.fake_llm import FakeLLMClient
+        llm_client = FakeLLMClient()
+    ai_filter = AIFilter(llm_client=llm_client)
+    ai_filter.use_cache = not args.no_cache
+    
+    print(f"Analyzing {len(posts)} posts from {corpus.path} with {args.workers} workers...")
+    try:
+        summary = BulkAnalyzer(ai_filter, workers=args.workers).run(posts, args.output)
+    finally:
+        ai_filter.release_context()
+    print_summary(summary)
+    metrics.report()
+
+def process_feed(driver, feed_scraper, ai_filter, action_engine, max_posts=10, dry_run=False, prefilter=None,
+                 checkpoint=None, resume=False, corpus=None, pruner=None, clock=None, seen=None):
     """Process LinkedIn feed posts with AI analysis"""
-    print(f"Processing feed - will analyze up to {max_posts} posts")
+    clock = clock or system_clock
+    checkpoint = checkpoint or RunCheckpoint("feed", clock=clock)
+    pruner = pruner or FeedPruner(clock=clock)
+    if corpus is None and SAVE_CORPUS:
+        corpus = PostCorpus(clock=clock)
     
-    # Scrape feed posts
-    posts = feed_scraper.scrape_feed(driver)
+    resumed = resume and checkpoint.load()
+    if resumed:
+        # Continue from the saved queue without scrolling the feed again
+        posts = checkpoint.posts
+        decisions = checkpoint.decisions
+        if checkpoint.dry_run != dry_run:
+            # Done steps of a dry run acted on nothing, only the analyses carry over
+            print(f"Checkpoint was written by a {'dry' if checkpoint.dry_run else 'live'} run, "
+                  f"redoing every post in {'dry' if dry_run else 'live'} mode")
+            checkpoint.restart_steps(dry_run)
+        print(f"Resuming feed run - {checkpoint.completed_count()}/{len(posts)} posts already handled")
+    else:
+        if resume:
+            print("No checkpoint to resume, starting a fresh run")
+        print(f"Processing feed - will analyze up to {max_posts} posts")
+        
+        # Scrape feed posts
+        with stage("scrape"):
+            posts = feed_scraper.scrape_feed(driver, max_posts)[:max_posts]
+        
+        # Keep every scraped post for later browser-free analysis
+        if corpus and posts:
+            corpus.append(posts)
+        
+        # Score every scraped post locally in one batch before any LLM call
+        prefilter = prefilter or PostPreFilter()
+        with stage("analyze"):
+            decisions = prefilter.filter_posts(posts)
+        
+        checkpoint.start(posts, decisions, dry_run)
     
     # Process each post
     processed_count = 0
     
-    for post in posts[:max_posts]:
-        post_id = post.get("post_id", "unknown").split(":")[-1]
-        author = post.get("author_name", "Unknown")
+    for post, (passed, reason) in zip(posts, decisions):
+        post_id = post.short_id
+        author = post.author_name
+        step = checkpoint.step(post.post_id)
+        
+        if step.get("done"):
+            processed_count += 1
+            continue
+        
+        print(f"\nProcessing post {processed_count + 1}/{len(posts)} by {author} (ID: {post_id})")
         
-        print(f"\nProcessing post {processed_count + 1}/{max_posts} by {author} (ID: {post_id})")
+        if not passed:
+            print(f"Skipped by pre-filter: {reason}")
+            checkpoint.record_done(post.post_id)
+            if seen is not None and not dry_run:
+                seen.add(post.post_id)
+            pruner.mark_done(driver, post.post_id)
+            processed_count += 1
+            continue
         
-        # Analyze post with AI
-        print("Analyzing post with AI...")
-        analysis = ai_filter.analyze_post(post)
+        # Analyze post with AI, unless the interrupted run already did
+        analysis = step.get("analysis")
+        if analysis is None:
+            print("Analyzing post with AI...")
+            with stage("analyze"):
+                analysis = ai_filter.analyze_post(post)
+            checkpoint.record_analysis(post.post_id, analysis)
         
         # Display analysis results
         print(f"Analysis results:")
@@ -117,7 +278,8 @@ def process_feed(driver, feed_scraper, ai_filter, action_engine, max_posts=10, d
         # Perform actions if not in dry run mode
         if not dry_run:
             print("Performing actions...")
-            results = action_engine.perform_actions(driver, post, analysis)
+            with stage("act"):
+                results = action_engine.perform_actions(driver, post, analysis, resumed=resumed)
             
             print(f"Action results:")
             print(f"  Liked: {results.get('liked', False)}")
@@ -125,17 +287,33 @@ def process_feed(driver, feed_scraper, ai_filter, action_engine, max_posts=10, d
             if results.get("errors"):
                 print(f"  Errors: {', '.join(results.get('errors', []))}")
         else:
+            results = None
             print("Dry run mode - no actions performed")
         
+        checkpoint.record_done(post.post_id, results)
+        # Fallback analyses and failed actions leave the post to be tried again in a later run
+        if seen is not None and not dry_run and "fallback" not in analysis and not results["errors"]:
+            seen.add(post.post_id)
+        pruner.mark_done(driver, post.post_id)
         processed_count += 1
         
         # Random delay between posts
-        if processed_count < max_posts:
-            delay = random.uniform(5, 10)
+        if processed_count < len(posts):
+            delay = clock.uniform(5, 10)
             print(f"Waiting {delay:.1f} seconds before processing next post...")
-            time.sleep(delay)
+            clock.sleep(delay)
     
+    checkpoint.finish()
+    pruner.flush(driver)
+    if seen is not None:
+        seen.save()
     print(f"\nProcessed {processed_count} posts")
+    print(f"Pre-filter skip rate: {metrics.rate('prefilter.skipped', 'prefilter.scored'):.0%}")
+    print("Analysis tiers: " + ", ".join(f"{tier} {rate:.0%}" for tier, rate in tier_rates().items()))
+    if seen is not None:
+        print(f"Skipped unread as seen in earlier runs: {metrics.counters.get('feed.seen_skipped', 0)}")
+    pruner.report()
+    metrics.report()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,22 @@
+import os
+import time
+
+import pytest
+
+# The Gemini client is created on import of core.ai_filter, the tests never call it
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+from core.message_writer import MessageWriter
+from utils.clock import VirtualClock
+from utils.fake_llm import FakeLLMClient
+
+
+@pytest.fixture
+def clock():
+    # Midday, so the simulated delays of one run never cross into the next day
+    return VirtualClock(start=time.mktime((2025, 6, 2, 12, 0, 0, 0, 0, -1)))
+
+
+@pytest.fixture
+def writer(tmp_path):
+    return MessageWriter(llm_client=FakeLLMClient(latency=0), cache_dir=tmp_path / "outreach")
@@ -0,0 +1,105 @@
+from config import LINKEDIN_FEED_URL
+from core.action_engine import ActionEngine
+from core.post import Post
+from core.selector_registry import selectors
+from utils.fake_driver import FakeDriver
+from benchmarks import fixtures
+from benchmarks.harness import isolate_history
+
+LIKE_AND_COMMENT = {
+    "should_like": True,
+    "should_comment": True,
+    "comment_text": "Great insights, thanks for sharing!",
+    "reasoning": "test"
+}
+
+
+def feed(post_count=3):
+    driver = FakeDriver({LINKEDIN_FEED_URL: fixtures.feed_page_html(post_count)})
+    driver.get(LINKEDIN_FEED_URL)
+    posts = [Post(post_id=element.get_attribute("data-urn")) for element in selectors.find_all(driver, "feed.post")]
+    return driver, posts
+
+
+def test_likes_and_comments_a_post(tmp_path, clock):
+    driver, posts = feed()
+    engine = isolate_history(ActionEngine(clock), tmp_path)
+
+    results = engine.perform_actions(driver, posts[1], LIKE_AND_COMMENT)
+
+    assert results["liked"] and results["commented"]
+    assert results["errors"] == []
+    assert driver.likes == [posts[1].post_id]
+    assert driver.comments == [(posts[1].post_id, LIKE_AND_COMMENT["comment_text"])]
+    assert posts[1].short_id in engine.action_history["likes"]
+    assert posts[1].short_id in engine.action_history["comments"]
+
+
+def test_follows_the_analysis(tmp_path, clock):
+    driver, posts = feed()
+    engine = isolate_history(ActionEngine(clock), tmp_path)
+
+    results = engine.perform_actions(driver, posts[0], {"should_like": False, "should_comment": True,
+                                                        "comment_text": "[N/A]"})
+
+    assert not results["liked"] and not results["commented"]
+    assert driver.likes == [] and driver.comments == []
+
+
+def test_never_acts_on_a_post_twice(tmp_path, clock):
+    driver, posts = feed()
+    engine = isolate_history(ActionEngine(clock), tmp_path)
+
+    engine.perform_actions(driver, posts[0], LIKE_AND_COMMENT)
+    clock.advance(60)
+    results = engine.perform_actions(driver, posts[0], LIKE_AND_COMMENT)
+
+    assert not results["liked"] and not results["commented"]
+    assert len(driver.likes) == 1 and len(driver.comments) == 1
+
+
+def test_missing_post_is_reported_without_navigating(tmp_path, clock):
+    driver, _ = feed()
+    engine = isolate_history(ActionEngine(clock), tmp_path)
+    post = Post(post_id="urn:li:activity:1", post_url="https://www.linkedin.com/feed/update/urn:li:activity:1")
+    driver.commands.clear()
+
+    results = engine.perform_actions(driver, post, LIKE_AND_COMMENT)
+
+    assert results["errors"] == ["Post element not found"]
+    assert driver.commands["get"] == 0
+
+
+def test_stops_at_the_daily_limits(tmp_path, clock):
+    driver, posts = feed(post_count=4)
+    engine = isolate_history(ActionEngine(clock), tmp_path)
+    engine.daily_limits = {"likes": (2, None), "comments": (1, None)}
+    for index, post in enumerate(posts):
+        post.author_name = f"Author {index}"
+
+    for post in posts[:3]:
+        engine.perform_actions(driver, post, LIKE_AND_COMMENT)
+
+    assert driver.likes == [posts[0].post_id, posts[1].post_id]
+    assert [post_id for post_id, _ in driver.comments] == [posts[0].post_id]
+
+    # A new day starts the count over
+    clock.advance(24 * 60 * 60)
+    results = engine.perform_actions(driver, posts[3], LIKE_AND_COMMENT)
+
+    assert results["liked"] and results["commented"]
+
+
+def test_limits_actions_per_author(tmp_path, clock):
+    driver, posts = feed()
+    engine = isolate_history(ActionEngine(clock), tmp_path)
+    engine.daily_limits = {"likes": (None, 2), "comments": (None, 1)}
+    posts[0].author_name = posts[1].author_name = posts[2].author_name = "Jane Doe"
+
+    first = engine.perform_actions(driver, posts[0], LIKE_AND_COMMENT)
+    second = engine.perform_actions(driver, posts[1], LIKE_AND_COMMENT)
+    third = engine.perform_actions(driver, posts[2], LIKE_AND_COMMENT)
+
+    assert first["liked"] and first["commented"]
+    assert second["liked"] and not second["commented"]
+    assert not third["liked"] and not third["commented"]
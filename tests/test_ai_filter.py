@@ -0,0 +1,42 @@
+import json
+
+from core.ai_filter import AIFilter
+from core.post import Post
+from utils.fake_llm import FakeLLMClient
+from utils.metrics import metrics
+
+ROUTINE_POST = Post(post_id="urn:li:activity:1", author_name="Jane Doe",
+                    post_text="Happy to share that I'm starting a new position as Staff Engineer at Acme!")
+
+
+def ai_filter_for(tmp_path):
+    llm = FakeLLMClient(latency=0)
+    ai_filter = AIFilter(llm_client=llm)
+    ai_filter.cache_dir = tmp_path
+    ai_filter.near_duplicates = None
+    return ai_filter, llm
+
+
+def test_template_analyses_are_cached(tmp_path):
+    ai_filter, llm = ai_filter_for(tmp_path)
+    before = metrics.counters["ai_filter.tier.cache"]
+
+    first = ai_filter.analyze_post(ROUTINE_POST)
+    second = ai_filter.analyze_post(ROUTINE_POST)
+
+    assert first["tier"] == "template"
+    assert second["comment_text"] == first["comment_text"]
+    assert metrics.counters["ai_filter.tier.cache"] == before + 1
+    [cache_file] = tmp_path.glob("post_*.json")
+    assert json.loads(cache_file.read_text())["comment_text"] == first["comment_text"]
+    assert llm.calls == 0
+
+
+def test_template_actions_follow_the_config(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.ai_filter.COMMENT_TEMPLATE_LIKE", False)
+    ai_filter, _ = ai_filter_for(tmp_path)
+
+    analysis = ai_filter.analyze_post(ROUTINE_POST)
+
+    assert analysis["tier"] == "template"
+    assert not analysis["should_like"] and analysis["should_comment"]
@@ -0,0 +1,20 @@
+from core.ai_filter import AIFilter
+from core.bulk_analysis import BulkAnalyzer
+from core.post import Post
+from utils.fake_llm import FakeLLMClient
+
+
+def test_reports_the_analysis_rate_apart_from_prefiltered_posts(tmp_path, clock):
+    ai_filter = AIFilter(llm_client=FakeLLMClient(latency=0))
+    ai_filter.cache_dir = tmp_path
+    ai_filter.near_duplicates = None
+    posts = [Post(post_id=f"urn:li:activity:{index}", author_name="Jane Doe",
+                  post_text=f"We're hiring! Apply now for opening number {index}") for index in range(8)]
+    posts += [Post(post_id="urn:li:activity:100", author_name="Jane Doe",
+                   post_text="What I learned building a Python compiler for our research team")]
+
+    summary = BulkAnalyzer(ai_filter, workers=2, clock=clock).run(posts, tmp_path / "analysis.jsonl")
+
+    assert summary["posts"] == 9 and summary["prefiltered"] == 8 and summary["analyzed"] == 1
+    assert summary["analyzed_per_second"] == summary["analyzed"] / summary["analysis_elapsed"]
+    assert summary["analysis_elapsed"] <= summary["elapsed"]
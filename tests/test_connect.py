@@ -0,0 +1,47 @@
+from core.connect import LinkedInConnect
+from utils.fake_driver import FakeDriver
+from benchmarks import fixtures
+from benchmarks.harness import isolate_history
+
+DAY = 24 * 60 * 60
+SEARCH_URL = "https://www.linkedin.com/search/results/people/?keywords=engineer"
+
+
+def test_sends_connection_requests(tmp_path, clock, writer):
+    driver = FakeDriver({SEARCH_URL: fixtures.search_page_html(5)})
+    connect = isolate_history(LinkedInConnect(clock, writer), tmp_path)
+
+    results = connect.search_and_connect(driver, SEARCH_URL, max_connections=3)
+
+    assert results["sent"] == 3
+    assert len(driver.invitations) == 3
+    assert len(connect.action_history["connections"]) == 3
+
+
+def test_daily_limit(tmp_path, clock, writer, monkeypatch):
+    monkeypatch.setattr("core.connect.MAX_CONNECTION_REQUESTS_PER_DAY", 4)
+    driver = FakeDriver({SEARCH_URL: fixtures.search_page_html(12)})
+    connect = isolate_history(LinkedInConnect(clock, writer), tmp_path)
+
+    assert connect.search_and_connect(driver, SEARCH_URL)["sent"] == 4
+    clock.advance(60 * 60)
+    later = connect.search_and_connect(driver, SEARCH_URL)
+    assert later["sent"] == 0
+    assert later["errors"] == ["Daily limit reached"]
+
+    clock.advance(DAY)
+    assert connect.search_and_connect(driver, SEARCH_URL)["sent"] == 4
+    assert len(driver.invitations) == 8
+
+
+def test_never_sends_a_second_request(tmp_path, clock, writer):
+    driver = FakeDriver({SEARCH_URL: fixtures.search_page_html(5)})
+    connect = isolate_history(LinkedInConnect(clock, writer), tmp_path)
+
+    connect.search_and_connect(driver, SEARCH_URL, max_connections=5)
+    clock.advance(DAY)
+    results = connect.search_and_connect(driver, SEARCH_URL, max_connections=5)
+
+    assert results["sent"] == 0
+    assert results["skipped"] == 5
+    assert len(driver.invitations) == 5
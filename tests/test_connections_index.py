@@ -0,0 +1,46 @@
+from core.connections_index import ConnectionsIndex
+from utils.fake_driver import FakeDriver
+from benchmarks import fixtures
+
+DAY = 24 * 60 * 60
+CONNECTIONS_URL = "https://www.linkedin.com/mynetwork/invite-connect/connections/"
+
+
+def connections_page(count, start=0):
+    return FakeDriver({CONNECTIONS_URL: fixtures.connections_page_html(count, start=start)})
+
+
+def test_full_refresh_drops_removed_connections(tmp_path, clock):
+    index = ConnectionsIndex(tmp_path / "connections_index.json", clock=clock)
+    index.refresh(connections_page(10))
+    assert not index.full_refresh_due()
+
+    clock.advance(8 * DAY)
+    assert index.full_refresh_due()
+    index.refresh(connections_page(6))
+
+    assert len(index) == 6
+    assert not index.full_refresh_due()
+
+
+def test_capped_full_refresh_counts_as_done(tmp_path, clock):
+    index = ConnectionsIndex(tmp_path / "connections_index.json", clock=clock)
+    index.refresh(connections_page(10))
+    clock.advance(8 * DAY)
+
+    # A list longer than the scroll cap is never read to the end
+    index.refresh(connections_page(4), max_scrolls=0)
+
+    assert not index.full_refresh_due()
+    assert not ConnectionsIndex(tmp_path / "connections_index.json", clock=clock).full_refresh_due()
+    # Nothing is pruned when the list wasn't read to the end
+    assert len(index) == 10
+
+
+def test_select_skips_messaged_connections(tmp_path, clock):
+    index = ConnectionsIndex(tmp_path / "connections_index.json", clock=clock)
+    entries = index.refresh(connections_page(3))
+    index.record_message(entries[0]["profile_id"])
+
+    assert [entry["profile_id"] for entry in index.select()] == [entry["profile_id"] for entry in entries[1:]]
+    assert len(index.select(include_messaged=True)) == 3
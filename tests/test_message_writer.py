@@ -0,0 +1,33 @@
+import threading
+
+from core.message_writer import TextBatch
+
+
+def test_skipped_targets_dont_leave_texts_to_write_inline():
+    loop_thread = threading.get_ident()
+    inline = []
+
+    def compose(target):
+        if threading.get_ident() == loop_thread:
+            inline.append(target)
+        return f"Hi {target}"
+
+    targets = list(range(20))
+    texts = TextBatch(compose, key=lambda target: target, args=lambda target: (target,), surplus=2)
+    max_sends, sent = 3, 0
+    texts.prefetch(targets, max_sends)
+    for index, target in enumerate(targets):
+        if sent >= max_sends:
+            break
+        texts.prefetch(targets[index:], max_sends - sent)
+        # Every other target is skipped before its text is needed
+        if target % 2:
+            continue
+        assert texts.get(target) == f"Hi {target}"
+        sent += 1
+    texts.close()
+
+    assert sent == max_sends
+    assert inline == []
+    # Written ahead: the remaining sends plus the surplus, not the whole target list
+    assert len(texts.submitted) < len(targets)
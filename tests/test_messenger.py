@@ -0,0 +1,100 @@
+from core.messenger import LinkedInMessenger
+from utils.fake_driver import FakeDriver
+from benchmarks import fixtures
+from benchmarks.harness import isolate_history
+
+DAY = 24 * 60 * 60
+CONNECTIONS_URL = "https://www.linkedin.com/mynetwork/invite-connect/connections/"
+
+
+def messenger_for(tmp_path, clock, writer):
+    return isolate_history(LinkedInMessenger(clock, writer), tmp_path)
+
+
+def connections_page(count):
+    return FakeDriver({CONNECTIONS_URL: fixtures.connections_page_html(count)})
+
+
+def test_sends_messages(tmp_path, clock, writer):
+    driver = connections_page(5)
+    messenger = messenger_for(tmp_path, clock, writer)
+
+    results = messenger.send_messages_to_connections(driver, max_messages=3)
+
+    assert results["sent"] == 3
+    assert len(driver.messages) == 3
+    assert all(text for _, text in driver.messages)
+    assert len(messenger.action_history["messages"]) == 3
+
+
+def test_daily_limit(tmp_path, clock, writer, monkeypatch):
+    monkeypatch.setattr("core.messenger.MAX_MESSAGES_PER_DAY", 4)
+    driver = connections_page(12)
+    messenger = messenger_for(tmp_path, clock, writer)
+
+    assert messenger.send_messages_to_connections(driver)["sent"] == 4
+    clock.advance(60 * 60)
+    later = messenger.send_messages_to_connections(driver)
+    assert later["sent"] == 0
+    assert later["errors"] == ["Daily limit reached"]
+
+    clock.advance(DAY)
+    assert messenger.send_messages_to_connections(driver)["sent"] == 4
+    assert len(driver.messages) == 8
+    assert len(messenger.action_history["messages"]) == 8
+
+
+def test_never_messages_a_connection_twice(tmp_path, clock, writer):
+    driver = connections_page(3)
+    messenger = messenger_for(tmp_path, clock, writer)
+
+    for _ in range(3):
+        messenger.send_messages_to_connections(driver, max_messages=10)
+        clock.advance(DAY)
+
+    assert len(driver.messages) == 3
+
+
+def test_records_without_timestamp_count_as_sent(tmp_path, clock, writer):
+    driver = connections_page(2)
+    messenger = messenger_for(tmp_path, clock, writer)
+    profile_ids = [entry["profile_id"] for entry in messenger.connections.refresh(driver)]
+    messenger.action_history["messages"][profile_ids[0]] = {"name": "", "message": ""}
+
+    results = messenger.send_messages_to_connections(driver, max_messages=10)
+
+    assert results["sent"] == 1
+    assert set(messenger.action_history["messages"]) == set(profile_ids)
+
+
+def test_cooldown_allows_messaging_again(tmp_path, clock, writer, monkeypatch):
+    monkeypatch.setattr("core.messenger.MESSAGE_COOLDOWN_DAYS", 7)
+    driver = connections_page(2)
+    messenger = messenger_for(tmp_path, clock, writer)
+
+    messenger.send_messages_to_connections(driver, max_messages=10)
+    clock.advance(3 * DAY)
+    assert messenger.send_messages_to_connections(driver, max_messages=10)["sent"] == 0
+    clock.advance(5 * DAY)
+    assert messenger.send_messages_to_connections(driver, max_messages=10)["sent"] == 2
+
+
+def test_acceptance_is_not_recorded_on_first_index_build(tmp_path, clock, writer):
+    profiles = [{"name": f"Jane Doe{index}", "profile_id": f"jane-doe-{index}", "occupation": "Engineer",
+                 "company": "Acme"} for index in range(3)]
+    page = "".join(fixtures.connection_card_html(profile) for profile in profiles[1:])
+    messenger = messenger_for(tmp_path, clock, writer)
+    for profile in profiles:
+        messenger.action_history["connections"][profile["profile_id"]] = {"timestamp": clock.time() - DAY,
+                                                                          "details": profile}
+
+    html = f'<html><body><ul class="mn-connection-grid">{page}</ul></body></html>'
+    messenger.send_messages_to_connections(FakeDriver({CONNECTIONS_URL: html}), max_messages=1)
+    assert not any(request.get("accepted_at") for request in messenger.action_history["connections"].values())
+
+    # A connection that shows up after the first build accepted the request in between
+    page = fixtures.connection_card_html(profiles[0]) + page
+    html = f'<html><body><ul class="mn-connection-grid">{page}</ul></body></html>'
+    messenger.send_messages_to_connections(FakeDriver({CONNECTIONS_URL: html}), max_messages=1)
+    assert messenger.action_history["connections"]["jane-doe-0"].get("accepted_at")
+    assert not messenger.action_history["connections"]["jane-doe-1"].get("accepted_at")
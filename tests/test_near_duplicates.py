@@ -0,0 +1,35 @@
+import json
+
+from utils.near_duplicates import NearDuplicateIndex
+from utils.prompt_compiler import PROMPT_VERSION
+
+TEXT = "Three lessons about data engineering that nobody told me when I started my career as an engineer"
+ANALYSIS = {"should_like": True, "should_comment": False, "comment_text": "", "reasoning": "test"}
+
+
+def test_entries_survive_a_reload(tmp_path):
+    index = NearDuplicateIndex(index_path=tmp_path / "near_duplicates.json")
+    index.add(TEXT, "Jane Doe", ANALYSIS)
+    index.save()
+
+    match = NearDuplicateIndex(index_path=tmp_path / "near_duplicates.json").lookup(TEXT)
+
+    assert match == ("Jane Doe", ANALYSIS, 0)
+
+
+def test_entries_of_another_prompt_version_are_dropped(tmp_path):
+    path = tmp_path / "near_duplicates.json"
+    index = NearDuplicateIndex(index_path=path)
+    index.add(TEXT, "Jane Doe", ANALYSIS)
+    index.save()
+    with open(path, 'r') as f:
+        entries = json.load(f)
+    assert entries[0]["prompt_version"] == PROMPT_VERSION
+    entries[0]["prompt_version"] = f"old-{PROMPT_VERSION}"
+    with open(path, 'w') as f:
+        json.dump(entries, f)
+
+    reloaded = NearDuplicateIndex(index_path=path)
+
+    assert len(reloaded.entries) == 0
+    assert reloaded.lookup(TEXT) is None
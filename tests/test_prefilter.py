@@ -0,0 +1,30 @@
+import lxml.html
+
+from core.feed_scrapper import FeedScraper
+from core.feed_pruner import FeedPruner
+from core.post import Post
+from core.prefilter import PostPreFilter
+from utils.html_snapshot import HtmlNode
+from benchmarks import fixtures
+
+AUTHOR = {"name": "Jane Doe", "profile_id": "jane-doe-0", "occupation": "Engineer", "company": "Acme"}
+
+
+def extract(html, clock):
+    scraper = FeedScraper(FeedPruner(enabled=False, clock=clock), clock=clock)
+    return scraper._extract_post_data(None, HtmlNode(lxml.html.fromstring(html), None))
+
+
+def test_promotion_posts_reach_the_llm():
+    post = Post(post_id="urn:li:activity:1", author_name="Jane Doe",
+                post_text="I'm happy to share that I was promoted to Engineering Manager at Acme!")
+
+    assert PostPreFilter()._rule_decision(post) is None
+
+
+def test_sponsored_posts_are_skipped(clock):
+    ad = extract(fixtures.feed_post_html("urn:li:activity:1", AUTHOR, "Try our new platform", sponsored=True), clock)
+    post = extract(fixtures.feed_post_html("urn:li:activity:2", AUTHOR, "Try our new platform"), clock)
+
+    assert ad.sponsored and not post.sponsored
+    assert PostPreFilter()._rule_decision(ad) == (False, "sponsored post")
@@ -0,0 +1,35 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from utils.fake_driver import FakeDriver
+from utils.waits import WaitLatencies, WaitManager
+
+
+def fast_waits(tmp_path, clock):
+    latencies = WaitLatencies(path=tmp_path / "wait_latencies.json")
+    for _ in range(50):
+        latencies.observe("feed.post", 0.1)
+    return WaitManager(clock, latencies=latencies)
+
+
+def waited(waits, clock, **kwargs):
+    start = clock.monotonic()
+    with pytest.raises(TimeoutException):
+        waits.until(FakeDriver(), "feed.post", 20, **kwargs)
+    return clock.monotonic() - start
+
+
+def test_timeout_adapts_to_observed_latencies(tmp_path, clock):
+    assert waited(fast_waits(tmp_path, clock), clock) < 20
+
+
+def test_page_loads_keep_the_full_ceiling(tmp_path, clock):
+    assert waited(fast_waits(tmp_path, clock), clock, page_load=True) >= 20
+
+
+def test_until_condition_times_out_on_the_clock(tmp_path, clock):
+    waits = WaitManager(clock, latencies=WaitLatencies(path=tmp_path / "wait_latencies.json"))
+    start = clock.monotonic()
+    with pytest.raises(TimeoutException):
+        waits.until_condition(FakeDriver(), lambda driver: "/feed/" in driver.current_url, 300)
+    assert clock.monotonic() - start >= 300
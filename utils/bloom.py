@@ -0,0 +1,171 @@
+import os
+import math
+import json
+import base64
+import hashlib
+from pathlib import Path
+
+from config import (
+    DATA_DIR,
+    SEEN_POSTS_PATH,
+    SEEN_POSTS_CAPACITY,
+    SEEN_POSTS_ERROR_RATE,
+    SEEN_POSTS_GENERATION_DAYS
+)
+from utils.clock import system_clock
+from utils.metrics import metrics
+
+DAY = 24 * 60 * 60
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    Membership tests can return false positives at roughly `error_rate` once
+    `capacity` keys are in, never false negatives.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        """Add a key, returns False if it was (probably) present already"""
+        added = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def is_full(self):
+        return self.count >= self.capacity
+
+    def to_dict(self):
+        return {
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "count": self.count,
+            "bits": base64.b64encode(bytes(self.bits)).decode("ascii")
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        bloom = cls(data["capacity"], data["error_rate"])
+        bits = base64.b64decode(data["bits"])
+        if len(bits) != len(bloom.bits):
+            raise ValueError("Bloom filter size does not match its parameters")
+        bloom.bits = bytearray(bits)
+        bloom.count = data.get("count", 0)
+        return bloom
+
+
+class SeenPosts:
+    """
+    Persisted set of feed posts already analyzed or acted on, keyed by the
+    activity id of their data-urn so the scraper can skip them before
+    extracting anything.
+
+    Two Bloom filter generations are kept. New posts go into the current one,
+    which is rotated out once it holds `capacity` posts or is older than
+    `generation_days`, so the file stays a fixed size and posts that have
+    long left the feed age out. Without a saved filter it is rebuilt from
+    the interaction history.
+    """
+
+    def __init__(self, path=None, capacity=None, error_rate=None, generation_days=None, clock=None,
+                 history_path=None):
+        self.path = Path(path or SEEN_POSTS_PATH)
+        self.history_path = Path(history_path or Path(DATA_DIR) / "history.json")
+        self.capacity = capacity or SEEN_POSTS_CAPACITY
+        self.error_rate = error_rate or SEEN_POSTS_ERROR_RATE
+        self.generation_days = generation_days or SEEN_POSTS_GENERATION_DAYS
+        self.clock = clock or system_clock
+        self.current = None
+        self.previous = None
+        self.started_at = None
+        self._load()
+
+    @staticmethod
+    def key(post_id):
+        """Activity id of a post URN, the same id the interaction history uses"""
+        return (post_id or "").split(":")[-1]
+
+    def _new_generation(self):
+        self.previous = self.current
+        self.current = BloomFilter(self.capacity, self.error_rate)
+        self.started_at = self.clock.time()
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    saved = json.load(f)
+                self.current = BloomFilter.from_dict(saved["current"])
+                self.previous = BloomFilter.from_dict(saved["previous"]) if saved.get("previous") else None
+                self.started_at = saved.get("started_at") or self.clock.time()
+                return
+            except Exception as e:
+                print(f"Error loading seen posts filter, rebuilding it: {e}")
+        self.rebuild()
+
+    def rebuild(self):
+        """Start over from the posts recorded in the interaction history"""
+        self.current = None
+        self._new_generation()
+        self.previous = None
+        if not self.history_path.exists():
+            return
+        try:
+            with open(self.history_path, 'r') as f:
+                history = json.load(f)
+        except Exception as e:
+            print(f"Error reading history for the seen posts filter: {e}")
+            return
+        for action_type in ("likes", "comments"):
+            for post_id in history.get(action_type, {}):
+                self.current.add(self.key(post_id))
+
+    def __contains__(self, post_id):
+        key = self.key(post_id)
+        if not key:
+            return False
+        return key in self.current or (self.previous is not None and key in self.previous)
+
+    def add(self, post_id):
+        key = self.key(post_id)
+        if not key or key in self:
+            return
+        if self.current.is_full() or self.clock.time() - self.started_at > self.generation_days * DAY:
+            self._new_generation()
+            metrics.incr("seen_posts.rotations")
+        self.current.add(key)
+
+    def save(self):
+        """Persist both generations to file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump({
+                "started_at": self.started_at,
+                "current": self.current.to_dict(),
+                "previous": self.previous.to_dict() if self.previous else None
+            }, f)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,102 @@
+from contextlib import contextmanager
+
+from config import BROWSER_PERF_ENABLED
+from utils.metrics import metrics
+
+# Cumulative Performance.getMetrics counters, recorded as deltas per measured step
+DURATION_METRICS = {
+    "LayoutDuration": "layout",
+    "RecalcStyleDuration": "style",
+    "ScriptDuration": "script",
+    "TaskDuration": "task",
+}
+
+# Navigation timing of the current document, relative to its navigation start
+NAVIGATION_SCRIPT = """
+var entry = window.performance && performance.getEntriesByType
+    ? performance.getEntriesByType('navigation')[0] : null;
+if (!entry) return null;
+return {
+  response_end: entry.responseEnd,
+  dom_content_loaded: entry.domContentLoadedEventEnd,
+  load: entry.loadEventEnd,
+  transfer_size: entry.transferSize
+};
+"""
+
+
+class BrowserPerf:
+    """
+    Browser-side cost of pipeline steps, from the DevTools Performance domain.
+
+    Around each measured step (a navigation, a scroll batch, an action) the
+    tab's layout, style, script and task time are sampled before and after
+    and the deltas recorded in the run metrics as browser.<step>.<kind>,
+    together with the JS heap and DOM node count after the step. Navigations
+    also record the page's navigation timing.
+
+    A shared instance is exposed as `browser_perf`; it is off unless enabled
+    (BROWSER_PERF_ENABLED or main.py --browser-perf) and turns itself off for
+    drivers without CDP access.
+    """
+
+    def __init__(self, enabled=None):
+        self.enabled = BROWSER_PERF_ENABLED if enabled is None else enabled
+        self._enabled_on = set()
+
+    def _metrics(self, driver):
+        if id(driver) not in self._enabled_on:
+            driver.execute_cdp_cmd("Performance.enable", {"timeDomain": "timeTicks"})
+            self._enabled_on.add(id(driver))
+        result = driver.execute_cdp_cmd("Performance.getMetrics", {})
+        return {entry["name"]: entry["value"] for entry in result.get("metrics", [])}
+
+    def _sample(self, driver):
+        try:
+            return self._metrics(driver)
+        except Exception as e:
+            print(f"Browser performance capture unavailable, disabling it: {e}")
+            self.enabled = False
+            return None
+
+    def _record_navigation(self, driver, name):
+        try:
+            timing = driver.execute_script(NAVIGATION_SCRIPT)
+        except Exception:
+            return
+        if not timing:
+            return
+        for key in ("response_end", "dom_content_loaded", "load"):
+            if timing.get(key):
+                metrics.observe(f"browser.{name}.{key}", timing[key] / 1000)
+        if timing.get("transfer_size") is not None:
+            metrics.histogram(f"browser.{name}.transfer_kb", timing["transfer_size"] / 1024, "KB")
+
+    @contextmanager
+    def measure(self, driver, name, navigation=False):
+        """
+        Record the browser-side cost of the wrapped step
+
+        Args:
+            driver: Selenium WebDriver instance the step runs in
+            name: Step name used in the metric names (e.g. "feed.scroll")
+            navigation: Also record the navigation timing of the page loaded by the step
+        """
+        before = self._sample(driver) if self.enabled else None
+        try:
+            yield
+        finally:
+            after = self._sample(driver) if before is not None else None
+            if after is not None:
+                for key, kind in DURATION_METRICS.items():
+                    if key in after and key in before:
+                        metrics.observe(f"browser.{name}.{kind}", max(0.0, after[key] - before[key]))
+                if "JSHeapUsedSize" in after:
+                    metrics.histogram("browser.js_heap_mb", after["JSHeapUsedSize"] / 1024 / 1024, "MB")
+                if "Nodes" in after:
+                    metrics.histogram("browser.dom_nodes", after["Nodes"], "nodes")
+                if navigation:
+                    self._record_navigation(driver, name)
+
+
+browser_perf = BrowserPerf()
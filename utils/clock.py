@@ -0,0 +1,74 @@
+import time
+import random
+import threading
+
+
+class Clock:
+    """
+    Wall clock, sleeper and random source used by the automation components.
+
+    Components take a `clock` argument and fall back to the shared
+    `system_clock`, so tests and benchmarks can hand them a VirtualClock
+    instead and skip the human-like delays without patching the time module.
+    """
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def uniform(self, low, high):
+        return self.rng.uniform(low, high)
+
+    def choice(self, sequence):
+        return self.rng.choice(sequence)
+
+    def pause(self, low, high):
+        """Sleep for a random duration between low and high seconds"""
+        delay = self.uniform(low, high)
+        self.sleep(delay)
+        return delay
+
+    def today(self):
+        """Local date of the clock's current time, as YYYY-MM-DD"""
+        return time.strftime("%Y-%m-%d", time.localtime(self.time()))
+
+
+class VirtualClock(Clock):
+    """
+    Simulated clock for tests and benchmarks: sleeping advances time
+    instantly, and the random source is seeded so runs are repeatable.
+    """
+
+    def __init__(self, start=None, seed=0):
+        super().__init__(seed)
+        self.now = time.time() if start is None else start
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.elapsed
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        """Move the clock forward by a number of seconds"""
+        seconds = max(0.0, seconds)
+        with self._lock:
+            self.now += seconds
+            self.elapsed += seconds
+
+
+# Shared real-time clock, the default for every component
+system_clock = Clock()
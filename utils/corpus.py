@@ -0,0 +1,103 @@
+import io
+import json
+from pathlib import Path
+
+from config import CORPUS_PATH
+from core.post import Post
+from utils.clock import system_clock
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("Compressed corpora (.zst) need zstandard: pip install zstandard")
+    return zstandard
+
+
+class PostCorpus:
+    """
+    Append-only store of scraped posts, one JSON record per line.
+
+    A path ending in ".zst" is zstd compressed: every append writes its own
+    frame, and frames are read back as one continuous stream.
+    """
+
+    def __init__(self, path=None, clock=None):
+        self.clock = clock or system_clock
+        self.path = Path(path or CORPUS_PATH)
+        self.compressed = self.path.suffix == ".zst"
+
+    def append(self, posts, source="feed"):
+        """
+        Add scraped posts to the end of the corpus
+
+        Args:
+            posts: Post records
+            source: Where the posts came from, stored with every record
+
+        Returns:
+            int: Number of records written
+        """
+        scraped_at = self.clock.time()
+        lines = "".join(
+            json.dumps({**post.to_dict(), "source": source, "scraped_at": scraped_at}) + "\n"
+            for post in posts
+        )
+        if not lines:
+            return 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = lines.encode("utf-8")
+        if self.compressed:
+            data = _zstd().ZstdCompressor(level=10).compress(data)
+        with open(self.path, 'ab') as f:
+            f.write(data)
+        return len(posts)
+
+    def _lines(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb') as raw:
+            if self.compressed:
+                reader = _zstd().ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+                stream = io.TextIOWrapper(reader, encoding="utf-8")
+            else:
+                stream = io.TextIOWrapper(raw, encoding="utf-8")
+            for line in stream:
+                if line.strip():
+                    yield line
+
+    def records(self):
+        """Yield raw records in file order, skipping lines that don't parse (e.g. a torn last write)"""
+        for line in self._lines():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+    def posts(self, unique=True, limit=None):
+        """
+        Read posts back from the corpus
+
+        Args:
+            unique: Keep only the latest record of each post_id
+            limit: Stop after this many posts
+
+        Returns:
+            list: Post records, in the order they were first scraped
+        """
+        if unique:
+            latest = {}
+            for record in self.records():
+                latest[record.get("post_id")] = record
+            records = latest.values()
+        else:
+            records = self.records()
+
+        posts = []
+        for record in records:
+            if limit is not None and len(posts) >= limit:
+                break
+            posts.append(Post.from_dict(record))
+        return posts
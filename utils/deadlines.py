@@ -0,0 +1,111 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from config import (
+    LLM_CALL_DEADLINE,
+    LLM_CALL_WORKERS,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_SAMPLES,
+    METRICS_MAX_SAMPLES
+)
+from utils.metrics import metrics
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when no attempt of a call finished before its deadline"""
+
+
+class DeadlineCaller:
+    """
+    Runs provider calls (LLM requests) with a deadline.
+
+    Each call runs on a shared worker pool and the caller gives up on it
+    once the deadline passes; the abandoned request finishes in the
+    background and its result is dropped. With hedging enabled, a call that
+    is still running after the usual latency (a percentile of the recent
+    successful calls under the same name) gets a second, identical attempt
+    and whichever finishes first wins.
+
+    A shared instance is exposed as `deadline_caller`.
+    """
+
+    def __init__(self, deadline=None, hedge=None, hedge_percentile=None, workers=None):
+        self.deadline = deadline or LLM_CALL_DEADLINE
+        self.hedge = LLM_HEDGE_ENABLED if hedge is None else hedge
+        self.hedge_percentile = hedge_percentile or LLM_HEDGE_PERCENTILE
+        self.pool = ThreadPoolExecutor(max_workers=workers or LLM_CALL_WORKERS, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self.latencies = {}
+
+    def hedge_delay(self, name):
+        """Seconds after which a call gets a second attempt, None without enough samples"""
+        if not self.hedge:
+            return None
+        with self._lock:
+            values = self.latencies.get(name)
+            if not values or len(values) < LLM_HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile))]
+
+    def _observe(self, name, seconds):
+        with self._lock:
+            self.latencies.setdefault(name, deque(maxlen=METRICS_MAX_SAMPLES)).append(seconds)
+
+    def call(self, name, function, *args, **kwargs):
+        """
+        Call a function within the deadline
+
+        Args:
+            name: Metric prefix and latency group of the call (e.g. "ai_filter")
+            function: The provider call, run on a worker thread
+            *args, **kwargs: Passed on to the function
+
+        Returns:
+            The result of the first attempt that succeeds
+
+        Raises:
+            DeadlineExceeded: If no attempt finished in time
+            Exception: Whatever the last attempt raised, if all attempts failed
+        """
+        start = time.monotonic()
+        end = start + self.deadline
+        hedge_at = self.hedge_delay(name)
+        pending = {self.pool.submit(function, *args, **kwargs)}
+        hedged = False
+        error = None
+
+        while pending:
+            now = time.monotonic()
+            timeout = end - now
+            if hedge_at is not None and not hedged:
+                timeout = min(timeout, start + hedge_at - now)
+            done, pending = wait(pending, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                self._observe(name, time.monotonic() - start)
+                return result
+
+            now = time.monotonic()
+            if now >= end:
+                break
+            if hedge_at is not None and not hedged and now >= start + hedge_at:
+                hedged = True
+                metrics.incr(f"{name}.hedged")
+                pending.add(self.pool.submit(function, *args, **kwargs))
+
+        if not pending and error is not None:
+            raise error
+        metrics.incr(f"{name}.deadline_exceeded")
+        raise DeadlineExceeded(f"{name} call did not finish within {self.deadline:.1f}s")
+
+
+deadline_caller = DeadlineCaller()
@@ -0,0 +1,419 @@
+import re
+import json
+from collections import Counter
+
+import lxml.html
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+
+from utils.html_snapshot import HtmlNode
+
+SCROLL_BY_PATTERN = re.compile(r"window\.scrollBy\(\s*(-?\d+)\s*,\s*(-?\d+)\s*\)")
+QUERY_CLICK_PATTERN = re.compile(r"document\.querySelector\(['\"](.+?)['\"]\)\.click\(\)")
+PAGE_HELPER_PATTERN = re.compile(r"window\.__linkedintel\.(\w+)\.apply")
+
+BLANK_PAGE = "<html><head></head><body></body></html>"
+
+
+class FakeElement(HtmlNode):
+    """
+    WebElement stand-in backed by an element of the FakeDriver's in-memory DOM.
+    Every call that would be a WebDriver round trip is recorded on the driver.
+    """
+
+    __slots__ = ()
+
+    def _wrap(self, element):
+        return FakeElement(element, self.snapshot)
+
+    @property
+    def driver(self):
+        return self.snapshot
+
+    def find_elements(self, by, value):
+        self.driver._record("find_elements")
+        return super().find_elements(by, value)
+
+    def find_element(self, by, value):
+        self.driver._record("find_element")
+        matches = super().find_elements(by, value)
+        if not matches:
+            raise NoSuchElementException(f"No element matching {by}={value}")
+        return matches[0]
+
+    def get_attribute(self, name):
+        self.driver._record("get_attribute")
+        return super().get_attribute(name)
+
+    @property
+    def text(self):
+        self.driver._record("text")
+        return super().text
+
+    def is_displayed(self):
+        self.driver._record("is_displayed")
+        return super().is_displayed()
+
+    def click(self):
+        self.driver._record("click")
+        self.driver._click(self.element)
+
+    def send_keys(self, *values):
+        self.driver._record("send_keys")
+        typed = "".join(str(value) for value in values)
+        if self.element.tag in ("input", "textarea"):
+            self.element.set("value", (self.element.get("value") or "") + typed)
+        else:
+            self.element.text = (self.element.text or "") + typed
+
+    def clear(self):
+        self.driver._record("clear")
+        if self.element.tag in ("input", "textarea"):
+            self.element.set("value", "")
+        else:
+            self.element.text = ""
+
+
+class FakeDriver:
+    """
+    In-memory WebDriver stand-in for exercising the automation logic without Chrome.
+
+    Pages are built from fixture HTML. The driver implements the subset of the
+    WebDriver API the core modules use (get, find_element(s), execute_script
+    clicks and scrolls, send_keys, cookies, page_source, the performance log
+    and Network.getResponseBody) and records every command so benchmarks can
+    count round trips. Fixtures feed simulated API responses in with
+    `emit_response`. Clicks on LinkedIn controls
+    (like, comment, connect, message) mutate the DOM the way the real page
+    does and are collected in `likes`, `comments`, `invitations` and `messages`.
+    """
+
+    def __init__(self, pages=None, on_scroll=None, invite_note=True):
+        self.pages = pages or {}
+        self.on_scroll = on_scroll
+        # Whether the invite dialog offers "Add a note" (LinkedIn limits notes on free accounts)
+        self.invite_note = invite_note
+        self.current_url = "about:blank"
+        self.scroll_y = 0
+        self.cookies = []
+        self.commands = Counter()
+        self.command_log = []
+        self.record_log = False
+        self.likes = []
+        self.comments = []
+        self.invitations = []
+        self.messages = []
+        self._pending_invite = None
+        self._pending_recipient = None
+        self._helpers_installed = False
+        self._performance_log = []
+        self._response_bodies = {}
+        self.root = lxml.html.fromstring(BLANK_PAGE)
+
+    def _record(self, command):
+        self.commands[command] += 1
+        if self.record_log:
+            self.command_log.append(command)
+
+    def _node(self):
+        return FakeElement(self.root, self)
+
+    # Navigation
+
+    def get(self, url):
+        self._record("get")
+        page = self.pages.get(url)
+        if page is None:
+            page = next((html for prefix, html in self.pages.items() if url.startswith(prefix)), BLANK_PAGE)
+        self.root = lxml.html.fromstring(page(url) if callable(page) else page)
+        self.current_url = url
+        self.scroll_y = 0
+        self._helpers_installed = False
+
+    def load_html(self, html, url="about:fixture"):
+        """Replace the current document without recording a navigation"""
+        self.root = lxml.html.fromstring(html)
+        self.current_url = url
+        self._helpers_installed = False
+
+    @property
+    def page_source(self):
+        self._record("page_source")
+        return lxml.html.tostring(self.root, encoding="unicode")
+
+    # Element lookup
+
+    def find_elements(self, by, value):
+        self._record("find_elements")
+        return HtmlNode.find_elements(self._node(), by, value)
+
+    def find_element(self, by, value):
+        self._record("find_element")
+        matches = HtmlNode.find_elements(self._node(), by, value)
+        if not matches:
+            raise NoSuchElementException(f"No element matching {by}={value}")
+        return matches[0]
+
+    # Scripts
+
+    def execute_script(self, script, *args):
+        self._record("execute_script")
+        if "__linkedintel" in script:
+            return self._page_helper(script, args)
+        if "linkedintel-pruned" in script:
+            return self._prune_posts(args[0])
+        if "getEntriesByType('navigation')" in script:
+            return self._navigation_timing()
+
+        if "arguments[0].click()" in script and args:
+            self._click(args[0].element)
+            return None
+
+        query_click = QUERY_CLICK_PATTERN.search(script)
+        if query_click:
+            matches = self.root.cssselect(query_click.group(1))
+            if matches:
+                self._click(matches[0])
+            return None
+
+        scroll = SCROLL_BY_PATTERN.search(script)
+        if scroll:
+            self.scroll_y = max(0, self.scroll_y + int(scroll.group(2)))
+            if self.on_scroll and "scrollIntoView" not in script:
+                self.on_scroll(self)
+            return None
+
+        if "scrollHeight" in script:
+            return len(self.root.cssselect("*")) * 10
+        if "pageYOffset" in script or "scrollY" in script:
+            return self.scroll_y
+        # scrollIntoView, focus and anything else are accepted as no-ops
+        return None
+
+    def execute_async_script(self, script, *args):
+        self._record("execute_async_script")
+        if "__linkedintel" in script:
+            return self._page_helper(script, args)
+        return None
+
+    # In-page helpers (core.js_actions), emulated over the in-memory DOM
+
+    def _page_helper(self, script, args):
+        if "window.__linkedintel = {" in script:
+            self._helpers_installed = True
+        if not self._helpers_installed:
+            return {"status": "not_installed"}
+
+        function = PAGE_HELPER_PATTERN.search(script).group(1)
+        post, locators = args[0], args[1]
+        matched = {}
+        if function == "likePost":
+            bars = self._helper_find(post, "action.social_bar", locators, matched)
+            for button in self._helper_find(bars[0] if bars else post, "action.like_button", locators, matched):
+                label = button.element.get("aria-label") or ""
+                if "like" not in label.lower():
+                    continue
+                if button.element.get("aria-pressed") == "true":
+                    return {"status": "already_liked", "label": label, "matched": matched}
+                self._click(button.element)
+                return {"status": "liked", "label": label, "matched": matched}
+            return {"status": "not_found", "matched": matched}
+
+        if function == "openCommentBox":
+            editor = self._helper_visible(self._helper_find(post, "action.comment_editor", locators, matched))
+            if editor is None:
+                buttons = self._helper_find(post, "action.comment_button", locators, matched)
+                if not buttons:
+                    return {"status": "not_found", "matched": matched}
+                self._click(buttons[0].element)
+                editor = self._helper_visible(self._helper_find(post, "action.comment_editor", locators, matched))
+            if editor is None:
+                return {"status": "timeout", "matched": matched}
+            return {"status": "ok", "editor": editor, "matched": matched}
+
+        if function == "submitComment":
+            buttons = self._helper_find(post, "action.comment_submit", locators, matched)
+            if not buttons:
+                return {"status": "not_found", "matched": matched}
+            if buttons[0].element.get("disabled") is not None:
+                return {"status": "disabled", "matched": matched}
+            self._click(buttons[0].element)
+            return {"status": "submitted", "matched": matched}
+
+        raise ValueError(f"Unknown page helper {function}")
+
+    def _helper_find(self, root, name, locators, matched):
+        """Element lookups inside a page script cost no extra round trips"""
+        for index, (by, value) in enumerate(locators.get(name, [])):
+            found = HtmlNode.find_elements(root, by, value)
+            if found:
+                matched[name] = index
+                return found
+        matched[name] = -1
+        return []
+
+    def _helper_visible(self, elements):
+        return next((element for element in elements if HtmlNode.is_displayed(element)), None)
+
+    def _prune_posts(self, urns):
+        """Emulates core.feed_pruner's script: empty finished posts, keep the element"""
+        pruned = 0
+        for urn in urns:
+            for post in self.root.xpath("//*[@data-urn=$urn]", urn=urn):
+                if post.get("class") == "linkedintel-pruned":
+                    continue
+                for child in list(post):
+                    post.remove(child)
+                post.text = None
+                post.set("class", "linkedintel-pruned")
+                pruned += 1
+        return {"pruned": pruned, "nodes": sum(1 for _ in self.root.iter()), "heap": None}
+
+    # Network (Chrome performance log and DevTools commands)
+
+    def emit_response(self, url, body):
+        """Log a finished response the way Chrome's performance log reports it"""
+        request_id = str(len(self._response_bodies) + 1)
+        self._response_bodies[request_id] = body
+        for method, params in (
+            ("Network.responseReceived", {"requestId": request_id, "response": {"url": url, "status": 200}}),
+            ("Network.loadingFinished", {"requestId": request_id}),
+        ):
+            self._performance_log.append({"message": json.dumps({"message": {"method": method, "params": params}})})
+
+    def get_log(self, log_type):
+        self._record("get_log")
+        if log_type != "performance":
+            return []
+        entries, self._performance_log = self._performance_log, []
+        return entries
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self._record("execute_cdp_cmd")
+        if cmd == "Network.getResponseBody":
+            return {"body": self._response_bodies.pop(cmd_args["requestId"]), "base64Encoded": False}
+        if cmd == "Performance.getMetrics":
+            return {"metrics": [{"name": name, "value": value} for name, value in self._performance_metrics().items()]}
+        return {}
+
+    def _performance_metrics(self):
+        """Synthetic browser counters: heap and node count follow the DOM, durations the commands issued"""
+        nodes = sum(1 for _ in self.root.iter())
+        work = sum(self.commands.values())
+        return {
+            "Nodes": nodes,
+            "JSHeapUsedSize": 2 * 1024 * 1024 + nodes * 150,
+            "LayoutDuration": work * 0.0002,
+            "RecalcStyleDuration": work * 0.0001,
+            "ScriptDuration": work * 0.0003,
+            "TaskDuration": work * 0.0008,
+        }
+
+    def _navigation_timing(self):
+        nodes = sum(1 for _ in self.root.iter())
+        return {
+            "response_end": 120.0,
+            "dom_content_loaded": 120.0 + nodes * 0.05,
+            "load": 150.0 + nodes * 0.05,
+            "transfer_size": len(lxml.html.tostring(self.root)),
+        }
+
+    # Cookies and session
+
+    def add_cookie(self, cookie):
+        self._record("add_cookie")
+        self.cookies.append(dict(cookie))
+
+    def get_cookies(self):
+        self._record("get_cookies")
+        return list(self.cookies)
+
+    def delete_all_cookies(self):
+        self._record("delete_all_cookies")
+        self.cookies = []
+
+    def quit(self):
+        self._record("quit")
+
+    # Simulated page behaviour
+
+    def _post_of(self, element):
+        for ancestor in element.iterancestors():
+            if "feed-shared-update-v2" in (ancestor.get("class") or "") and ancestor.get("data-urn"):
+                return ancestor
+        return None
+
+    def _body(self):
+        bodies = self.root.cssselect("body")
+        return bodies[0] if bodies else self.root
+
+    def _append_html(self, html):
+        fragment = lxml.html.fragment_fromstring(html)
+        self._body().append(fragment)
+        return fragment
+
+    def _remove(self, css):
+        for element in self.root.cssselect(css):
+            element.getparent().remove(element)
+
+    def _click(self, element):
+        """Apply the effect a click on `element` would have on LinkedIn"""
+        label = element.get("aria-label") or ""
+        classes = element.get("class") or ""
+        post = self._post_of(element)
+
+        if "like" in label.lower() and element.get("aria-pressed") != "true" and post is not None:
+            element.set("aria-pressed", "true")
+            self.likes.append(post.get("data-urn"))
+        elif ("comment-button" in classes or element.get("data-control-name") == "comment") and post is not None:
+            for box in post.cssselect(".comments-comment-box"):
+                box.attrib.pop("style", None)
+        elif "comments-comment-box__submit-button--cr" in classes and post is not None:
+            editors = post.cssselect("div.ql-editor")
+            if editors:
+                self.comments.append((post.get("data-urn"), editors[0].text or ""))
+                editors[0].text = ""
+        elif label.startswith("Connect with"):
+            self._pending_invite = {"name": label[len("Connect with"):].strip(), "note": ""}
+            self._remove(".send-invite")
+            add_note = '<button aria-label="Add a note">Add a note</button>' if self.invite_note else ''
+            self._append_html(
+                '<div class="artdeco-modal send-invite">'
+                f'{add_note}'
+                '<button aria-label="Send now">Send</button>'
+                '</div>'
+            )
+        elif label == "Add a note":
+            self._remove(".send-invite")
+            self._append_html(
+                '<div class="artdeco-modal send-invite">'
+                '<textarea class="send-invite__custom-message"></textarea>'
+                '<button aria-label="Send invitation">Send</button>'
+                '</div>'
+            )
+        elif label in ("Send invitation", "Send now") and self._pending_invite is not None:
+            notes = self.root.cssselect(".send-invite__custom-message")
+            if notes:
+                self._pending_invite["note"] = notes[0].get("value") or ""
+            self.invitations.append(self._pending_invite)
+            self._pending_invite = None
+            self._remove(".send-invite")
+        elif label.startswith("Message"):
+            self._pending_recipient = label[len("Message"):].strip()
+            self._remove(".msg-overlay-conversation-bubble")
+            self._append_html(
+                '<div class="msg-overlay-conversation-bubble">'
+                '<div class="msg-overlay-bubble-header"></div>'
+                '<div class="msg-form__contenteditable" contenteditable="true"></div>'
+                '<button class="msg-form__send-button">Send</button>'
+                '<button data-control-name="overlay.close_conversation_window">Close</button>'
+                '</div>'
+            )
+        elif "msg-form__send-button" in classes:
+            boxes = self.root.cssselect(".msg-form__contenteditable")
+            if boxes:
+                self.messages.append((self._pending_recipient, boxes[0].text or ""))
+                boxes[0].text = ""
+        elif (element.get("data-control-name") == "overlay.close_conversation_window"
+              or "msg-overlay-bubble-header" in classes):
+            self._remove(".msg-overlay-conversation-bubble")
@@ -0,0 +1,135 @@
+import re
+import random
+import threading
+
+from utils.clock import system_clock
+
+POSITIVE_WORDS = ("launched", "learned", "built", "happy to share", "excited", "lessons", "research")
+NEGATIVE_WORDS = ("hiring", "apply now", "register", "webinar", "discount")
+
+
+# Cached input tokens are billed and prefilled at a fraction of the regular price
+CACHED_TOKEN_FACTOR = 0.25
+CHARS_PER_TOKEN = 4
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeCachedContent:
+    def __init__(self, name):
+        self.name = name
+
+
+def _config_value(config, key):
+    # genai accepts configs as dicts or as typed objects
+    if config is None:
+        return None
+    if isinstance(config, dict):
+        return config.get(key)
+    return getattr(config, key, None)
+
+
+class FakeCaches:
+    """Emulates client.caches: cached context holding a system instruction"""
+
+    def __init__(self, client):
+        self.client = client
+        self.created = 0
+
+    def create(self, model, config=None):
+        instruction = _config_value(config, "system_instruction") or ""
+        if len(instruction) // CHARS_PER_TOKEN < self.client.cache_min_tokens:
+            raise RuntimeError(f"400 Cached content is too small, min_total_token_count is {self.client.cache_min_tokens}")
+        with self.client.lock:
+            self.created += 1
+            name = f"cachedContents/fake-{self.created}"
+            self.client.contexts[name] = instruction
+        return FakeCachedContent(name)
+
+    def delete(self, name, config=None):
+        with self.client.lock:
+            self.client.contexts.pop(name, None)
+
+
+class FakeModels:
+    def __init__(self, client):
+        self.client = client
+
+    def generate_content(self, model, contents, config=None):
+        """Return a deterministic analysis in the structured format parse_ai_response expects"""
+        prompt = contents if isinstance(contents, str) else str(contents)
+        # Outreach texts are written from several threads at once
+        with self.client.lock:
+            cached_name = _config_value(config, "cached_content")
+            if cached_name and cached_name not in self.client.contexts:
+                raise RuntimeError(f"404 CachedContent not found: {cached_name}")
+            cached_chars = len(self.client.contexts[cached_name]) if cached_name else 0
+            # A system instruction is sent and billed with every request
+            input_chars = len(prompt) + len(_config_value(config, "system_instruction") or "")
+            self.client.calls += 1
+            self.client.prompt_chars += input_chars
+            self.client.cached_chars += cached_chars
+            latency = max(0.0, self.client.rng.gauss(self.client.latency, self.client.latency * 0.3))
+            latency += self.client.prefill_latency * (input_chars + cached_chars * CACHED_TOKEN_FACTOR) / CHARS_PER_TOKEN / 1000
+            if self.client.rng.random() < self.client.slow_rate:
+                latency = self.client.slow_latency
+            failed = self.client.rng.random() < self.client.failure_rate
+        self.client.clock.sleep(latency)
+
+        if failed:
+            raise RuntimeError("Simulated LLM failure")
+
+        # Outreach rewrite (core.message_writer): hand the draft back as the personalized text
+        draft = re.search(r"DRAFT:\n(.*?)\n\nKeep the meaning", prompt, re.S)
+        if draft:
+            return FakeResponse(draft.group(1).strip())
+
+        match = re.search(r"POST AUTHOR: (.*)", prompt)
+        author = match.group(1).strip() if match else "there"
+        first_name = author.split(" ")[0]
+        lowered = prompt.lower()
+        should_like = any(word in lowered for word in POSITIVE_WORDS) and not any(word in lowered for word in NEGATIVE_WORDS)
+        should_comment = should_like and "lessons" in lowered
+
+        comment = f"Thanks for sharing this, {first_name}! Really useful perspective." if should_comment else "[N/A]"
+        return FakeResponse(
+            f"LIKE: {'Yes' if should_like else 'No'}\n"
+            f"COMMENT: {'Yes' if should_comment else 'No'}\n"
+            f"COMMENT_TEXT: {comment}\n"
+            f"REASONING: Simulated analysis\n"
+        )
+
+
+class FakeLLMClient:
+    """
+    Offline stand-in for google.genai.Client used by benchmarks.
+    Latency is simulated by sleeping on the given clock, so a VirtualClock makes it free.
+    A `slow_rate` share of the calls are stragglers taking `slow_latency` seconds.
+
+    Context caching is emulated: `caches.create` registers a system instruction
+    (refused below `cache_min_tokens`, like the real API) and requests that
+    reference it are billed for it in `cached_chars` instead of `prompt_chars`.
+    `prefill_latency` adds seconds per 1000 input tokens, cached ones at a
+    quarter of the cost, so the savings show up in the latency as well.
+    """
+
+    def __init__(self, latency=0.8, failure_rate=0.0, seed=0, clock=None, slow_rate=0.0, slow_latency=30.0,
+                 prefill_latency=0.0, cache_min_tokens=0):
+        self.clock = clock or system_clock
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.prompt_chars = 0
+        self.cached_chars = 0
+        self.prefill_latency = prefill_latency
+        self.cache_min_tokens = cache_min_tokens
+        self.contexts = {}
+        self.models = FakeModels(self)
+        self.caches = FakeCaches(self)
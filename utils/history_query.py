@@ -0,0 +1,205 @@
+import csv
+import json
+import time
+from bisect import bisect_left
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from config import DATA_DIR
+
+COLUMNS = ["action_type", "key", "timestamp", "author", "count", "accepted_at", "text"]
+
+
+class HistoryIndex:
+    """
+    Read-only, indexed view over history.json.
+
+    The nested {action_type: {id: record}} structure is flattened once into
+    columns, with secondary indexes by timestamp, author/profile and action
+    type, so queries don't scan the whole file.
+    """
+
+    def __init__(self, history=None, history_path=None):
+        if history is None:
+            history = self._load(Path(history_path or Path(DATA_DIR) / "history.json"))
+
+        self.action_types = []
+        self.keys = []
+        self.timestamps = array("d")
+        self.authors = []
+        self.counts = array("l")
+        self.accepted_at = array("d")
+        self.texts = []
+
+        self.by_action = defaultdict(list)
+        self.by_author = defaultdict(list)
+        self.by_key = defaultdict(list)
+
+        for action_type, records in history.items():
+            if not isinstance(records, dict):
+                continue
+            for key, record in records.items():
+                self._add_row(action_type, key, record or {})
+
+        # Rows sorted by time, with a parallel list of timestamps for bisect
+        self.time_order = sorted(range(len(self.keys)), key=self.timestamps.__getitem__)
+        self.sorted_timestamps = [self.timestamps[row] for row in self.time_order]
+
+    def _load(self, history_path):
+        if not history_path.exists():
+            return {}
+        with open(history_path, 'r') as f:
+            return json.load(f)
+
+    def _add_row(self, action_type, key, record):
+        details = record.get("details") or {}
+        author = details.get("author_name") or details.get("name") or record.get("name") or ""
+        text = details.get("text") or record.get("message") or ""
+
+        row = len(self.keys)
+        self.action_types.append(action_type)
+        self.keys.append(key)
+        self.timestamps.append(float(record.get("timestamp") or 0))
+        self.authors.append(author)
+        self.counts.append(int(record.get("count", 1)))
+        self.accepted_at.append(float(record.get("accepted_at") or 0))
+        self.texts.append(text)
+
+        self.by_action[action_type].append(row)
+        self.by_key[key].append(row)
+        if author:
+            self.by_author[author.lower()].append(row)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def row(self, row):
+        """Return one record as a dictionary"""
+        return {
+            "action_type": self.action_types[row],
+            "key": self.keys[row],
+            "timestamp": self.timestamps[row],
+            "author": self.authors[row],
+            "count": self.counts[row],
+            "accepted_at": self.accepted_at[row],
+            "text": self.texts[row]
+        }
+
+    # Queries
+
+    def rows_between(self, start=None, end=None, action_type=None):
+        """Row ids with start <= timestamp < end, optionally of one action type"""
+        low = 0 if start is None else bisect_left(self.sorted_timestamps, start)
+        high = len(self.sorted_timestamps) if end is None else bisect_left(self.sorted_timestamps, end)
+        rows = self.time_order[low:high]
+        if action_type:
+            rows = [row for row in rows if self.action_types[row] == action_type]
+        return rows
+
+    def rows_for_author(self, author, action_type=None):
+        rows = self.by_author.get(author.lower(), [])
+        if action_type:
+            rows = [row for row in rows if self.action_types[row] == action_type]
+        return rows
+
+    def counts_by_action(self, since=None):
+        if since is None:
+            return {action_type: len(rows) for action_type, rows in self.by_action.items()}
+        return dict(Counter(self.action_types[row] for row in self.rows_between(since)))
+
+    def counts_by_author(self, action_type, since=None, limit=None):
+        """Most frequent authors/profiles for one action type, e.g. comments this week"""
+        counter = Counter(
+            self.authors[row] for row in self.rows_between(since, action_type=action_type) if self.authors[row]
+        )
+        return counter.most_common(limit)
+
+    def repeated(self, action_type):
+        """Keys that were acted on more than once for the same action type"""
+        return [
+            (self.keys[row], self.counts[row])
+            for row in self.by_action.get(action_type, [])
+            if self.counts[row] > 1
+        ]
+
+    def acceptance_lags(self):
+        """Seconds between sending a connection request and first seeing the profile as a connection"""
+        return [
+            self.accepted_at[row] - self.timestamps[row]
+            for row in self.by_action.get("connections", [])
+            if self.accepted_at[row] and self.timestamps[row]
+        ]
+
+    # Export
+
+    def export_csv(self, path, rows=None):
+        rows = range(len(self)) if rows is None else rows
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for row in rows:
+                record = self.row(row)
+                writer.writerow([record[column] for column in COLUMNS])
+
+    def export_parquet(self, path, rows=None):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("Parquet export needs pyarrow: pip install pyarrow")
+            return False
+
+        rows = list(range(len(self))) if rows is None else list(rows)
+        table = pa.table({
+            "action_type": [self.action_types[row] for row in rows],
+            "key": [self.keys[row] for row in rows],
+            "timestamp": [self.timestamps[row] for row in rows],
+            "author": [self.authors[row] for row in rows],
+            "count": [self.counts[row] for row in rows],
+            "accepted_at": [self.accepted_at[row] for row in rows],
+            "text": [self.texts[row] for row in rows]
+        })
+        pq.write_table(table, path)
+        return True
+
+    def export(self, path, rows=None):
+        """Export to CSV or Parquet depending on the file extension"""
+        if str(path).endswith(".parquet"):
+            return self.export_parquet(path, rows)
+        self.export_csv(path, rows)
+        return True
+
+
+def print_stats(days=7, export_path=None, history_path=None):
+    """Print a summary of recent activity, used by `main.py stats`"""
+    index = HistoryIndex(history_path=history_path)
+    since = time.time() - days * 24 * 60 * 60
+
+    print(f"History: {len(index)} records")
+    print(f"\nActions in the last {days} days:")
+    for action_type, count in sorted(index.counts_by_action(since).items()):
+        print(f"  {action_type}: {count}")
+
+    for action_type in ("comments", "likes"):
+        top = index.counts_by_author(action_type, since, limit=10)
+        if top:
+            print(f"\nTop authors by {action_type} in the last {days} days:")
+            for author, count in top:
+                print(f"  {author}: {count}")
+
+    for action_type in ("likes", "comments"):
+        repeated = index.repeated(action_type)
+        if repeated:
+            print(f"\n{action_type.capitalize()} recorded more than once:")
+            for key, count in repeated:
+                print(f"  {key}: {count} times")
+
+    lags = sorted(index.acceptance_lags())
+    if lags:
+        median = lags[len(lags) // 2]
+        print(f"\nConnection acceptance lag: {len(lags)} accepted, median {median / 3600:.1f}h")
+
+    if export_path:
+        if index.export(export_path):
+            print(f"\nExported {len(index)} records to {export_path}")
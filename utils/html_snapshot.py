@@ -0,0 +1,227 @@
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import lxml.html
+from lxml.cssselect import CSSSelector
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+
+from config import EXTRACTION_ENGINE, SNAPSHOT_DIR, SAVE_SNAPSHOTS
+
+# The registry's selectors take a few dozen entries, the rest are one-off lookups
+# (e.g. a post by its data-urn) that would otherwise pile up over a long session
+CSS_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=CSS_CACHE_SIZE)
+def _compiled_css(selector):
+    """CSS to XPath translation is the expensive part, so compile each selector once"""
+    return CSSSelector(selector, translator="html")
+
+
+SKIPPED_TEXT_TAGS = {"script", "style", "noscript", "template"}
+BLOCK_TAGS = {"p", "div", "li", "ul", "ol", "section", "article", "h1", "h2", "h3", "h4", "tr"}
+
+
+class HtmlNode:
+    """
+    Read-only WebElement look-alike over a parsed HTML element.
+
+    It supports the subset of the WebElement API the extraction methods use
+    (find_element(s), get_attribute, text), so the same extraction code runs
+    over a live page or over a parsed snapshot without any round trips.
+    """
+
+    __slots__ = ("element", "snapshot")
+
+    def __init__(self, element, snapshot):
+        self.element = element
+        self.snapshot = snapshot
+
+    def find_elements(self, by, value):
+        if by == By.CSS_SELECTOR:
+            matches = _compiled_css(value)(self.element)
+        elif by == By.XPATH:
+            matches = self.element.xpath(value)
+        elif by == By.ID:
+            matches = _compiled_css(f"#{value}")(self.element)
+        elif by == By.CLASS_NAME:
+            matches = _compiled_css(f".{value}")(self.element)
+        elif by == By.TAG_NAME:
+            matches = self.element.iterdescendants(value)
+        elif by == By.NAME:
+            matches = _compiled_css(f"[name='{value}']")(self.element)
+        elif by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+            matches = [
+                a for a in self.element.iterdescendants("a")
+                if (value == _visible_text(a) if by == By.LINK_TEXT else value in _visible_text(a))
+            ]
+        else:
+            raise ValueError(f"Unsupported locator strategy: {by}")
+        return [self._wrap(match) for match in matches if isinstance(match.tag, str)]
+
+    def _wrap(self, element):
+        return HtmlNode(element, self.snapshot)
+
+    def find_element(self, by, value):
+        matches = self.find_elements(by, value)
+        if not matches:
+            raise NoSuchElementException(f"No element matching {by}={value} in snapshot")
+        return matches[0]
+
+    def get_attribute(self, name):
+        if name == "outerHTML":
+            return lxml.html.tostring(self.element, encoding="unicode")
+        if name in ("textContent", "innerText"):
+            return self.element.text_content()
+        return self.element.get(name)
+
+    @property
+    def text(self):
+        return _visible_text(self.element)
+
+    @property
+    def tag_name(self):
+        return self.element.tag
+
+    def is_displayed(self):
+        return not any(_is_hidden(element) for element in self.element.iterancestors()) and not _is_hidden(self.element)
+
+    def __eq__(self, other):
+        return isinstance(other, HtmlNode) and other.element is self.element
+
+    def __hash__(self):
+        return id(self.element)
+
+
+def _is_hidden(element):
+    style = (element.get("style") or "").replace(" ", "").lower()
+    return element.get("hidden") is not None or "display:none" in style
+
+
+def _visible_text(element):
+    """Approximate Selenium's .text: visible text, whitespace collapsed, one line per block"""
+    parts = []
+
+    def _inline(text):
+        return " ".join(text.split()) + (" " if text[-1:].isspace() else "")
+
+    def _walk(node):
+        if not isinstance(node.tag, str) or node.tag in SKIPPED_TEXT_TAGS or _is_hidden(node):
+            if node.tail and node is not element:
+                parts.append(_inline(node.tail))
+            return
+        if node.tag == "br":
+            parts.append("\n")
+        if node.text:
+            parts.append((" " if node.text[:1].isspace() else "") + _inline(node.text))
+        for child in node:
+            _walk(child)
+        if node.tag in BLOCK_TAGS:
+            parts.append("\n")
+        if node.tail and node is not element:
+            parts.append((" " if node.tail[:1].isspace() else "") + _inline(node.tail))
+
+    _walk(element)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+class PageSnapshot(HtmlNode):
+    """
+    Parsed copy of a page (or of one container) taken with a single round trip.
+
+    Extraction runs locally against the snapshot; `resolve` turns a snapshot
+    node back into a live WebElement only for the few nodes we act on.
+    """
+
+    __slots__ = ("container", "source")
+
+    def __init__(self, html, container=None):
+        root = lxml.html.fromstring(html)
+        super().__init__(root, self)
+        self.container = container
+        self.source = html
+
+    @classmethod
+    def from_driver(cls, driver, container=None):
+        """Snapshot the whole page, or only `container` via its outerHTML"""
+        if container is not None:
+            return cls(container.get_attribute("outerHTML"), container)
+        return cls(driver.page_source)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a saved snapshot for offline replay"""
+        with open(path, 'r', encoding="utf-8") as f:
+            return cls(f.read())
+
+    def save(self, path):
+        """Write the raw HTML so the snapshot can be replayed later"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding="utf-8") as f:
+            f.write(self.source)
+
+    def _relative_path(self, node):
+        """XPath steps from the snapshot root down to `node`"""
+        steps = []
+        element = node.element
+        while element is not None and element is not self.element:
+            parent = element.getparent()
+            if parent is None:
+                break
+            same_tag = [sibling for sibling in parent if sibling.tag == element.tag]
+            steps.append(f"{element.tag}[{same_tag.index(element) + 1}]")
+            element = parent
+        return "/".join(reversed(steps))
+
+    def resolve(self, driver, node):
+        """
+        Find the live element that corresponds to a snapshot node
+
+        Args:
+            driver: Selenium WebDriver instance the snapshot was taken from
+            node: HtmlNode from this snapshot
+
+        Returns:
+            WebElement or None if the page changed since the snapshot
+        """
+        relative = self._relative_path(node)
+        if self.container is not None:
+            root, path = self.container, f"./{relative}" if relative else "."
+        else:
+            root, path = driver, f"/{self.element.tag}/{relative}" if relative else f"/{self.element.tag}"
+
+        matches = root.find_elements(By.XPATH, path)
+        if not matches:
+            return None
+        live = matches[0]
+        # Guard against the DOM having shifted since the snapshot was taken
+        if (live.get_attribute("class") or "") != (node.get_attribute("class") or ""):
+            return None
+        return live
+
+
+def take_snapshot(driver, label):
+    """
+    Snapshot the current page when the snapshot extraction engine is enabled
+
+    Args:
+        driver: Selenium WebDriver instance
+        label: Short page name, used for the saved file name
+
+    Returns:
+        PageSnapshot or None when the live WebDriver engine is configured
+    """
+    if EXTRACTION_ENGINE != "snapshot":
+        return None
+    try:
+        snapshot = PageSnapshot.from_driver(driver)
+    except Exception as e:
+        print(f"Error taking page snapshot, falling back to live extraction: {e}")
+        return None
+    if SAVE_SNAPSHOTS:
+        snapshot.save(Path(SNAPSHOT_DIR) / f"{label}_{int(time.time())}.html")
+    return snapshot
@@ -0,0 +1,123 @@
+import time
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from config import METRICS_MAX_SAMPLES
+
+
+class RunMetrics:
+    """
+    Collects counters, timings and value histograms for a single run.
+    Timings are durations in seconds; histograms hold any other measured
+    quantity (tokens, DOM nodes, megabytes) together with its unit.
+    A shared instance is exposed as `metrics` so every component reports
+    into the same place without having to pass it around.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(int)
+        # Only the most recent samples are kept for percentiles so a long-running
+        # daemon doesn't grow without bound; count/total/max cover the whole run
+        self.timings = defaultdict(lambda: deque(maxlen=METRICS_MAX_SAMPLES))
+        self.totals = defaultdict(lambda: [0, 0.0, 0.0])
+        self.histograms = defaultdict(lambda: deque(maxlen=METRICS_MAX_SAMPLES))
+        self.histogram_totals = defaultdict(lambda: [0, 0.0, 0.0])
+        self.units = {}
+
+    def incr(self, name, amount=1):
+        """Increment a named counter"""
+        with self._lock:
+            self.counters[name] += amount
+
+    @staticmethod
+    def _add(samples, totals, value):
+        samples.append(value)
+        totals[0] += 1
+        totals[1] += value
+        totals[2] = max(totals[2], value)
+
+    def observe(self, name, value):
+        """Record a single duration in seconds"""
+        with self._lock:
+            self._add(self.timings[name], self.totals[name], value)
+
+    def histogram(self, name, value, unit):
+        """Record a single value that isn't a duration, e.g. a token or node count"""
+        with self._lock:
+            self.units[name] = unit
+            self._add(self.histograms[name], self.histogram_totals[name], value)
+
+    @contextmanager
+    def timer(self, name):
+        """Time the wrapped block and record it under `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def rate(self, numerator, denominator):
+        """Ratio between two counters, 0.0 when the denominator is empty"""
+        total = self.counters.get(denominator, 0)
+        if not total:
+            return 0.0
+        return self.counters.get(numerator, 0) / total
+
+    @staticmethod
+    def _aggregate(samples, totals):
+        aggregates = {}
+        for name, values in samples.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            count, total, maximum = totals[name]
+            aggregates[name] = {
+                "count": count,
+                "total": total,
+                "mean": total / count,
+                "p50": ordered[len(ordered) // 2],
+                "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+                "max": maximum
+            }
+        return aggregates
+
+    def summary(self):
+        """Return counters, timing and histogram aggregates as a plain dictionary"""
+        with self._lock:
+            histograms = self._aggregate(self.histograms, self.histogram_totals)
+            for name, stats in histograms.items():
+                stats["unit"] = self.units[name]
+            return {
+                "counters": dict(self.counters),
+                "timings": self._aggregate(self.timings, self.totals),
+                "histograms": histograms
+            }
+
+    def report(self):
+        """Print a human readable summary of the run"""
+        summary = self.summary()
+        print("\nRun metrics:")
+        for name, value in sorted(summary["counters"].items()):
+            print(f"  {name}: {value}")
+        for name, stats in sorted(summary["timings"].items()):
+            print(f"  {name}: n={stats['count']} mean={stats['mean']:.3f}s "
+                  f"p99={stats['p99']:.3f}s max={stats['max']:.3f}s")
+        for name, stats in sorted(summary["histograms"].items()):
+            unit = stats["unit"]
+            print(f"  {name}: n={stats['count']} mean={stats['mean']:.1f} {unit} "
+                  f"p99={stats['p99']:.1f} {unit} max={stats['max']:.1f} {unit}")
+
+    def reset(self):
+        """Clear everything recorded so far"""
+        with self._lock:
+            self.counters.clear()
+            self.timings.clear()
+            self.totals.clear()
+            self.histograms.clear()
+            self.histogram_totals.clear()
+            self.units.clear()
+
+
+metrics = RunMetrics()
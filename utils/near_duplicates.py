@@ -0,0 +1,189 @@
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from config import (
+    NEAR_DUPLICATE_INDEX_PATH,
+    NEAR_DUPLICATE_MAX_DISTANCE,
+    NEAR_DUPLICATE_MAX_ENTRIES,
+    NEAR_DUPLICATE_MIN_TOKENS
+)
+from utils.prompt_compiler import PROMPT_VERSION
+
+TOKEN_PATTERN = re.compile(r"\w+")
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def simhash(tokens):
+    """
+    Compute a 64-bit SimHash over word shingles
+
+    Args:
+        tokens: List of lowercase word tokens
+
+    Returns:
+        int: The fingerprint
+    """
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = [" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)]
+
+    vector = [0] * FINGERPRINT_BITS
+    for shingle in shingles:
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(FINGERPRINT_BITS):
+            vector[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(vector):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """
+    Bounded SimHash index over analyzed post texts.
+
+    Fingerprints are split into bands for LSH-style candidate lookup: with
+    more bands than the allowed bit distance, any near-duplicate is
+    guaranteed to match at least one band exactly. The oldest entries are
+    evicted once the index reaches its size limit, entries made under another
+    PROMPT_VERSION are dropped on load. Safe to share between threads.
+    """
+
+    def __init__(self, index_path=None, max_distance=None, max_entries=None):
+        self.index_path = Path(index_path or NEAR_DUPLICATE_INDEX_PATH)
+        self.max_distance = NEAR_DUPLICATE_MAX_DISTANCE if max_distance is None else max_distance
+        self.max_entries = max_entries or NEAR_DUPLICATE_MAX_ENTRIES
+        self.bands = self.max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        self.entries = OrderedDict()
+        self.buckets = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _band_keys(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(band, fingerprint >> (band * self.band_bits) & mask) for band in range(self.bands)]
+
+    def _load(self):
+        """Load persisted entries from file"""
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                for entry in json.load(f):
+                    # Analyses of an older prompt are not reused, like the cache keys they came with
+                    if entry.get("prompt_version") != PROMPT_VERSION:
+                        continue
+                    self._insert(int(entry["fingerprint"]), entry["author_name"], entry["analysis"])
+        except Exception as e:
+            print(f"Error loading near-duplicate index, starting empty: {e}")
+            self.entries.clear()
+            self.buckets.clear()
+
+    def save(self):
+        """Persist entries to file"""
+        with self._lock:
+            entries = [
+                {"fingerprint": str(fingerprint), "author_name": author_name, "analysis": analysis,
+                 "prompt_version": PROMPT_VERSION}
+                for fingerprint, (author_name, analysis) in self.entries.items()
+            ]
+            with open(self.index_path, 'w') as f:
+                json.dump(entries, f)
+
+    def _insert(self, fingerprint, author_name, analysis):
+        if fingerprint in self.entries:
+            self.entries.move_to_end(fingerprint)
+        else:
+            for key in self._band_keys(fingerprint):
+                self.buckets.setdefault(key, set()).add(fingerprint)
+        self.entries[fingerprint] = (author_name, analysis)
+
+        while len(self.entries) > self.max_entries:
+            evicted, _ = self.entries.popitem(last=False)
+            for key in self._band_keys(evicted):
+                bucket = self.buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(evicted)
+                    if not bucket:
+                        del self.buckets[key]
+
+    def add(self, post_text, author_name, analysis):
+        """Index the analysis of a post, returns False if the text is too short"""
+        tokens = tokenize(post_text)
+        if len(tokens) < NEAR_DUPLICATE_MIN_TOKENS:
+            return False
+        fingerprint = simhash(tokens)
+        with self._lock:
+            self._insert(fingerprint, author_name, analysis)
+        return True
+
+    def lookup(self, post_text, max_distance=None):
+        """
+        Find the closest previously analyzed post
+
+        Args:
+            post_text: Text of the post to look up
+            max_distance: Override for the allowed bit distance. Beyond the index's own
+                          distance the match is best effort: only posts sharing a
+                          fingerprint band with this one are compared
+
+        Returns:
+            tuple: (author_name, analysis, distance) of the closest match, or None
+        """
+        tokens = tokenize(post_text)
+        if len(tokens) < NEAR_DUPLICATE_MIN_TOKENS:
+            return None
+
+        max_distance = self.max_distance if max_distance is None else max_distance
+        fingerprint = simhash(tokens)
+        best = None
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(fingerprint):
+                candidates.update(self.buckets.get(key, ()))
+
+            for candidate in candidates:
+                distance = hamming_distance(fingerprint, candidate)
+                if distance <= max_distance and (best is None or distance < best[1]):
+                    best = (candidate, distance)
+
+            if best is None:
+                return None
+
+            self.entries.move_to_end(best[0])
+            author_name, analysis = self.entries[best[0]]
+        return author_name, analysis, best[1]
+
+
+def adapt_analysis(analysis, original_author, new_author, distance):
+    """Reuse an analysis for a near-duplicate post, swapping in the new author's name"""
+    adapted = dict(analysis)
+    comment_text = adapted.get("comment_text", "")
+    if comment_text and original_author and new_author and original_author != new_author:
+        comment_text = comment_text.replace(original_author, new_author)
+        original_first = original_author.split(" ")[0]
+        new_first = new_author.split(" ")[0]
+        if original_first:
+            comment_text = re.sub(rf"\b{re.escape(original_first)}\b", new_first, comment_text)
+        adapted["comment_text"] = comment_text
+
+    adapted["reasoning"] = f"Reused analysis of a near-duplicate post (distance {distance}): {analysis.get('reasoning', '')}"
+    return adapted
@@ -0,0 +1,106 @@
+import json
+import base64
+from pathlib import Path
+
+from utils.clock import system_clock
+from utils.metrics import metrics
+
+
+class NetworkCapture:
+    """
+    Collects response bodies the browser itself loads, through Chrome's
+    performance log and the DevTools Network domain.
+
+    The driver must be started with the "goog:loggingPrefs" capability set to
+    {"performance": "ALL"}. Responses are matched by URL substring; a body is
+    only fetched once its request has finished loading.
+    """
+
+    def __init__(self, driver, url_patterns, record_dir=None, clock=None):
+        self.clock = clock or system_clock
+        self.driver = driver
+        self.url_patterns = tuple(url_patterns)
+        self.record_dir = Path(record_dir) if record_dir else None
+        self._pending = {}
+        self._recorded = 0
+
+    def start(self):
+        """Enable the Network domain, returns False when the driver has no CDP access"""
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            # Drop whatever was logged before capture started
+            self.driver.get_log("performance")
+            return True
+        except Exception as e:
+            print(f"Network capture unavailable: {e}")
+            return False
+
+    def _matches(self, url):
+        return any(pattern in url for pattern in self.url_patterns)
+
+    def _events(self):
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            yield message.get("method"), message.get("params", {})
+
+    def _body(self, request_id):
+        result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        body = result.get("body", "")
+        if result.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8", errors="replace")
+        return body
+
+    def _record(self, url, body):
+        self.record_dir.mkdir(parents=True, exist_ok=True)
+        self._recorded += 1
+        path = self.record_dir / f"feed_{int(self.clock.time())}_{self._recorded}.json"
+        with open(path, 'w') as f:
+            json.dump({"url": url, "body": body}, f)
+
+    def drain(self):
+        """
+        Read new performance log entries and fetch the matching bodies
+
+        Returns:
+            list: (url, body) tuples for responses finished since the last call
+        """
+        responses = []
+        for method, params in self._events():
+            if method == "Network.responseReceived":
+                url = params.get("response", {}).get("url", "")
+                if self._matches(url):
+                    self._pending[params.get("requestId")] = url
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                url = self._pending.pop(params.get("requestId"), None)
+                if url is None or method == "Network.loadingFailed":
+                    continue
+                try:
+                    body = self._body(params["requestId"])
+                except Exception as e:
+                    # Bodies of responses the page already discarded can't be fetched any more
+                    print(f"Could not read response body for {url[:80]}: {e}")
+                    metrics.incr("network.body_errors")
+                    continue
+                metrics.incr("network.responses")
+                if self.record_dir:
+                    self._record(url, body)
+                responses.append((url, body))
+        return responses
+
+
+def load_recorded_responses(directory):
+    """
+    Read responses saved by NetworkCapture for offline replay
+
+    Returns:
+        list: (path, url, body) tuples sorted by file name
+    """
+    recorded = []
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        recorded.append((path, data.get("url", ""), data.get("body", "")))
+    return recorded
@@ -1,5 +1,18 @@
 import re
 
+
+def is_yes(value):
+    """Analysis flags are booleans, older cached analyses hold the model's Yes/No strings"""
+    return value is True or str(value).strip().lower() == "yes"
+
+
+def normalize_analysis(analysis):
+    """Turn the action flags of an analysis into booleans"""
+    analysis["should_like"] = is_yes(analysis.get("should_like"))
+    analysis["should_comment"] = is_yes(analysis.get("should_comment"))
+    return analysis
+
+
 def parse_ai_response(response: str):
     """
     Parses the AI response and extracts the necessary action criteria.
@@ -13,8 +26,8 @@ def parse_ai_response(response: str):
         reasoning_match = re.search(r"REASONING: (.*)", response)
 
         # Extract the values or set default values if not found
-        should_like = like_match.group(1) if like_match else "No"
-        should_comment = comment_match.group(1) if comment_match else "No"
+        should_like = bool(like_match) and like_match.group(1) == "Yes"
+        should_comment = bool(comment_match) and comment_match.group(1) == "Yes"
         comment_text = comment_text_match.group(1).strip() if comment_text_match else ""
         reasoning = reasoning_match.group(1).strip() if reasoning_match else "No reasoning provided"
 
@@ -29,8 +42,8 @@ def parse_ai_response(response: str):
     except Exception as e:
         print(f"Error parsing AI response: {str(e)}")
         return {
-            "should_like": "No",
-            "should_comment": "No",
+            "should_like": False,
+            "should_comment": False,
             "comment_text": "",
             "reasoning": "Error: Unable to parse the response."
         }
@@ -0,0 +1,159 @@
+import sys
+import time
+import cProfile
+import linecache
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from config import PROFILE_DIR, PROFILE_SAMPLE_INTERVAL
+from utils.metrics import metrics
+
+# Files whose frames mean we are blocked on the WebDriver HTTP client
+WEBDRIVER_IO_MARKERS = (
+    "selenium/webdriver/remote/remote_connection.py",
+    "urllib3/",
+    "http/client.py",
+    "socket.py",
+    "ssl.py",
+)
+
+# Active stage stack per thread, read by the sampler thread
+_stages = {}
+
+
+@contextmanager
+def stage(name):
+    """
+    Tag the wrapped block as a pipeline stage (scrape, analyze, act, history_io).
+    The time is always recorded in the run metrics; when a profiler is running,
+    samples taken inside the block are attributed to the stage.
+    """
+    thread_id = threading.get_ident()
+    stack = _stages.setdefault(thread_id, [])
+    stack.append(name)
+    try:
+        with metrics.timer(f"stage.{name}"):
+            yield
+    finally:
+        stack.pop()
+        if not stack:
+            _stages.pop(thread_id, None)
+
+
+def current_stage(thread_id):
+    stack = _stages.get(thread_id)
+    return "/".join(stack) if stack else "other"
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    module = Path(code.co_filename).stem
+    return f"{module}:{code.co_name}"
+
+
+def _classify(frames):
+    """Decide whether a sample is Python CPU, WebDriver I/O or a deliberate sleep"""
+    for frame in frames:
+        filename = frame.f_code.co_filename.replace("\\", "/")
+        if any(marker in filename for marker in WEBDRIVER_IO_MARKERS):
+            return "webdriver_io"
+    leaf = frames[-1]
+    line = linecache.getline(leaf.f_code.co_filename, leaf.f_lineno)
+    if "sleep(" in line:
+        return "sleep"
+    return "cpu"
+
+
+class RunProfiler:
+    """
+    Profiles a whole run in two ways at once:
+    - cProfile for exact per-function totals, written as a .prof file
+    - a sampling thread that writes collapsed stacks (flamegraph.pl / speedscope
+      format), rooted at the active stage and split into cpu, webdriver_io and sleep
+    """
+
+    def __init__(self, label="run", output_dir=None, interval=None):
+        self.output_dir = Path(output_dir or PROFILE_DIR)
+        self.interval = interval or PROFILE_SAMPLE_INTERVAL
+        self.run_id = f"{label}-{time.strftime('%Y%m%d-%H%M%S')}"
+        self.profile = cProfile.Profile()
+        self.stacks = Counter()
+        self.stage_time = defaultdict(Counter)
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+        return self.write()
+
+    def _sample_loop(self):
+        sampler_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed = now - last
+            last = now
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(frame)
+                    frame = frame.f_back
+                frames.reverse()
+                # Skip idle threads that are not inside any stage or our code
+                stage_name = current_stage(thread_id)
+                if stage_name == "other" and thread_id != threading.main_thread().ident:
+                    continue
+                kind = _classify(frames)
+                labels = ";".join(_frame_label(f) for f in frames)
+                self.stacks[f"{stage_name};[{kind}];{labels}"] += 1
+                self.stage_time[stage_name][kind] += elapsed
+
+    def write(self):
+        """Write the .prof and .collapsed files, returns their paths"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        prof_path = self.output_dir / f"{self.run_id}.prof"
+        collapsed_path = self.output_dir / f"{self.run_id}.collapsed"
+
+        self.profile.dump_stats(str(prof_path))
+        with open(collapsed_path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return prof_path, collapsed_path
+
+    def report(self):
+        """Print wall time per stage split into CPU, WebDriver I/O and sleep"""
+        print("\nProfile by stage (sampled wall time):")
+        for stage_name, kinds in sorted(self.stage_time.items()):
+            total = sum(kinds.values())
+            split = ", ".join(f"{kind} {seconds:.1f}s" for kind, seconds in kinds.most_common())
+            print(f"  {stage_name}: {total:.1f}s ({split})")
+
+
+@contextmanager
+def profiled(label="run", enabled=True):
+    """Run the wrapped block under RunProfiler when enabled"""
+    if not enabled:
+        yield None
+        return
+
+    profiler = RunProfiler(label)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        prof_path, collapsed_path = profiler.stop()
+        profiler.report()
+        print(f"Profile written to {prof_path}")
+        print(f"Collapsed stacks written to {collapsed_path} (open with speedscope or flamegraph.pl)")
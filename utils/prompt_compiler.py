@@ -0,0 +1,105 @@
+import re
+import hashlib
+
+from config import (
+    PROMPT_MAX_POST_TOKENS,
+    PROMPT_HEAD_RATIO,
+    PROMPT_MAX_HASHTAGS,
+    PROMPT_MAX_LINKS
+)
+
+# Bump whenever the prompt wording or the normalization rules change,
+# so cached analyses produced by an older prompt are not reused.
+PROMPT_VERSION = "3"
+
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " [...] "
+
+BOILERPLATE_PATTERNS = [
+    re.compile(r"(…|\.\.\.)\s*see more", re.IGNORECASE),
+    re.compile(r"(…|\.\.\.)\s*more\s*$", re.IGNORECASE),
+    re.compile(r"\bsee translation\b", re.IGNORECASE),
+    re.compile(r"\bshow translation\b", re.IGNORECASE),
+]
+LINK_PATTERN = re.compile(r"https?://\S+|lnkd\.in/\S+")
+HASHTAG_PATTERN = re.compile(r"(?:hashtag)?#\w+")
+HASHTAG_RUN_PATTERN = re.compile(r"(?:(?:hashtag)?#\w+\s*){2,}")
+
+
+def estimate_tokens(text):
+    """Rough token estimate, good enough for budgeting prompt size"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _trim_hashtag_run(match):
+    tags = HASHTAG_PATTERN.findall(match.group(0))
+    tags = [tag.replace("hashtag", "", 1) if tag.startswith("hashtag") else tag for tag in tags]
+    return " ".join(tags[:PROMPT_MAX_HASHTAGS]) + " "
+
+
+def normalize_post_text(post_text):
+    """
+    Strip scraping artifacts and boilerplate from a post
+
+    Args:
+        post_text: Raw text as extracted from the feed
+
+    Returns:
+        str: Normalized text
+    """
+    text = post_text or ""
+    for pattern in BOILERPLATE_PATTERNS:
+        text = pattern.sub(" ", text)
+
+    # Keep only the first few links
+    link_count = 0
+
+    def _limit_links(match):
+        nonlocal link_count
+        link_count += 1
+        return match.group(0) if link_count <= PROMPT_MAX_LINKS else ""
+
+    text = LINK_PATTERN.sub(_limit_links, text)
+    text = HASHTAG_RUN_PATTERN.sub(_trim_hashtag_run, text)
+
+    # Collapse whitespace but keep paragraph breaks
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    text = "\n".join(line for line in lines if line)
+    return text.strip()
+
+
+def truncate_to_budget(text, max_tokens=None, head_ratio=None):
+    """
+    Truncate text to a token budget, keeping its beginning and its end
+
+    Args:
+        text: Normalized post text
+        max_tokens: Token budget for the text
+        head_ratio: Share of the budget kept from the start of the text
+
+    Returns:
+        str: Text that fits within the budget
+    """
+    max_tokens = max_tokens or PROMPT_MAX_POST_TOKENS
+    head_ratio = PROMPT_HEAD_RATIO if head_ratio is None else head_ratio
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    budget = max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER)
+    head_chars = int(budget * head_ratio)
+    tail_chars = budget - head_chars
+
+    head = text[:head_chars].rsplit(" ", 1)[0]
+    tail = text[-tail_chars:].split(" ", 1)[-1] if tail_chars > 0 else ""
+    return f"{head}{TRUNCATION_MARKER}{tail}"
+
+
+def compile_post_text(post_text, max_tokens=None):
+    """Normalize and truncate a post so it is ready to embed in a prompt"""
+    return truncate_to_budget(normalize_post_text(post_text), max_tokens)
+
+
+def prompt_cache_key(author_name, compiled_text):
+    """Cache key derived from the compiled prompt inputs and the prompt version"""
+    payload = f"{PROMPT_VERSION}\n{author_name}\n{compiled_text}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
@@ -0,0 +1,175 @@
+import re
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>!=|<=|>=|=|<|>|~|\(|\))
+      | (?P<word>[^\s()=!<>~"']+)
+    )""", re.VERBOSE)
+
+KEYWORDS = ("and", "or", "not")
+
+
+class QueryError(ValueError):
+    pass
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = TOKEN_PATTERN.match(expression, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Unexpected character at {position}: {expression[position:position + 10]!r}")
+        position = match.end()
+        if match.group("string"):
+            raw = match.group("string")[1:-1]
+            tokens.append(("value", re.sub(r"\\(.)", r"\1", raw)))
+        elif match.group("op"):
+            tokens.append(("op", match.group("op")))
+        else:
+            word = match.group("word")
+            if word.lower() in KEYWORDS:
+                tokens.append(("keyword", word.lower()))
+            else:
+                tokens.append(("word", word))
+    return tokens
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compare(field, op, value):
+    """Predicate for a single `field op value` comparison"""
+    wanted = value.lower()
+    wanted_number = _number(value)
+
+    def predicate(record):
+        actual = record.get(field)
+        if actual is None:
+            return op == "!="
+        if op == "~":
+            return wanted in str(actual).lower()
+        if op in ("=", "!="):
+            if isinstance(actual, bool):
+                equal = actual == (wanted in ("true", "yes", "1"))
+            elif isinstance(actual, (int, float)) and wanted_number is not None:
+                equal = actual == wanted_number
+            else:
+                equal = str(actual).lower() == wanted
+            return equal if op == "=" else not equal
+
+        left, right = _number(actual), wanted_number
+        if left is None or right is None:
+            left, right = str(actual).lower(), wanted
+        if op == "<":
+            return left < right
+        if op == "<=":
+            return left <= right
+        if op == ">":
+            return left > right
+        return left >= right
+
+    return predicate
+
+
+class _Parser:
+    """
+    Recursive descent over:
+        expr       := term ("or" term)*
+        term       := factor ("and" factor)*
+        factor     := "not" factor | "(" expr ")" | comparison
+        comparison := FIELD [OP VALUE]
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _next(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        predicate = self._expr()
+        if self.position < len(self.tokens):
+            raise QueryError(f"Unexpected {self._peek()[1]!r}")
+        return predicate
+
+    def _expr(self):
+        parts = [self._term()]
+        while self._peek() == ("keyword", "or"):
+            self._next()
+            parts.append(self._term())
+        return parts[0] if len(parts) == 1 else (lambda record: any(part(record) for part in parts))
+
+    def _term(self):
+        parts = [self._factor()]
+        while self._peek() == ("keyword", "and"):
+            self._next()
+            parts.append(self._factor())
+        return parts[0] if len(parts) == 1 else (lambda record: all(part(record) for part in parts))
+
+    def _factor(self):
+        kind, value = self._next()
+        if (kind, value) == ("keyword", "not"):
+            inner = self._factor()
+            return lambda record: not inner(record)
+        if (kind, value) == ("op", "("):
+            inner = self._expr()
+            if self._next() != ("op", ")"):
+                raise QueryError("Missing closing parenthesis")
+            return inner
+        if kind != "word":
+            raise QueryError(f"Expected a field name, got {value!r}")
+
+        field = value
+        next_kind, op = self._peek()
+        if next_kind != "op" or op in ("(", ")"):
+            # A bare field tests for a truthy value
+            return lambda record: bool(record.get(field))
+        self._next()
+        value_kind, operand = self._next()
+        if value_kind not in ("word", "value"):
+            raise QueryError(f"Expected a value after {field} {op}")
+        return _compare(field, op, operand)
+
+
+def quote(value):
+    """Quote a value for use in a query expression"""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def compile_query(expression):
+    """
+    Compile a filter expression into a predicate over dict records
+
+    Comparisons are `field op value` with =, !=, <, <=, >, >= and ~ (case-insensitive
+    substring), combined with and / or / not and parentheses. Values are bare
+    words, numbers or quoted strings; a bare field name tests that it is set.
+
+        occupation ~ engineer and connected_days < 30 and not messaged
+
+    Args:
+        expression: The filter expression
+
+    Returns:
+        callable: predicate(record) -> bool
+
+    Raises:
+        QueryError: If the expression can't be parsed
+    """
+    tokens = _tokenize(expression)
+    if not tokens:
+        return lambda record: True
+    return _Parser(tokens).parse()
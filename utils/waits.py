@@ -0,0 +1,244 @@
+import json
+import threading
+from collections import deque
+from pathlib import Path
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+
+from config import (
+    WAIT_LATENCIES_PATH,
+    WAIT_MAX_SAMPLES,
+    WAIT_MIN_SAMPLES,
+    WAIT_P99_FACTOR,
+    WAIT_MARGIN,
+    WAIT_MIN_TIMEOUT,
+    WAIT_POLL_INTERVAL
+)
+from utils.clock import system_clock
+from utils.metrics import metrics
+
+HISTOGRAM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20)
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class WaitLatencies:
+    """
+    Observed time until each waited-for element appeared, by selector name.
+
+    Samples are bounded per name and persisted, so timeouts derived from
+    them carry over between runs. A shared instance is exposed as
+    `wait_latencies`.
+    """
+
+    def __init__(self, path=None, max_samples=None):
+        self.path = Path(path or WAIT_LATENCIES_PATH)
+        self.max_samples = max_samples or WAIT_MAX_SAMPLES
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.timeouts = {}
+        self.absent = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+        except Exception as e:
+            print(f"Error loading wait latencies: {e}")
+            return
+        for name, values in saved.get("samples", {}).items():
+            self.samples[name] = deque(values, maxlen=self.max_samples)
+
+    def save(self):
+        """Persist the latency samples to file"""
+        with self._lock:
+            saved = {"samples": {name: list(values) for name, values in self.samples.items()}}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(saved, f)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            self.samples.setdefault(name, deque(maxlen=self.max_samples)).append(seconds)
+        metrics.observe(f"wait.{name}", seconds)
+
+    def record_timeout(self, name, timeout):
+        """A required element did not show up; the timeout is kept as a (censored) sample"""
+        with self._lock:
+            self.timeouts[name] = self.timeouts.get(name, 0) + 1
+        self.observe(name, timeout)
+        metrics.incr(f"wait.{name}.timeouts")
+
+    def record_absent(self, name):
+        """An optional element was not there, which says nothing about its latency"""
+        with self._lock:
+            self.absent[name] = self.absent.get(name, 0) + 1
+        metrics.incr(f"wait.{name}.absent")
+
+    def timeout(self, name, ceiling, optional=False):
+        """
+        Timeout for a wait: p99 of the observed latencies times WAIT_P99_FACTOR
+        plus WAIT_MARGIN, never above the call site's ceiling and never below
+        WAIT_MIN_TIMEOUT. The ceiling is used until WAIT_MIN_SAMPLES are in.
+
+        Optional elements get no margin and only a floor of two poll
+        intervals, so one that usually shows up at once is given up on
+        quickly, while an appearance a little slower than usual is still
+        seen and learned from instead of counted as absent.
+        """
+        with self._lock:
+            values = self.samples.get(name)
+            if not values or len(values) < WAIT_MIN_SAMPLES:
+                return ceiling
+            p99 = _percentile(sorted(values), 0.99)
+        if optional:
+            return min(ceiling, max(WAIT_POLL_INTERVAL * 2, p99 * WAIT_P99_FACTOR))
+        return min(ceiling, max(WAIT_MIN_TIMEOUT, p99 * WAIT_P99_FACTOR + WAIT_MARGIN))
+
+    def histograms(self):
+        """
+        Latency distribution per selector name
+
+        Returns:
+            dict: name -> count, p50, p99, timeouts, absent and bucket counts
+                  (upper bound in seconds -> samples at or below it)
+        """
+        with self._lock:
+            snapshot = {name: sorted(values) for name, values in self.samples.items() if values}
+            timeouts, absent = dict(self.timeouts), dict(self.absent)
+        histograms = {}
+        for name, ordered in snapshot.items():
+            buckets = {bound: sum(1 for value in ordered if value <= bound) for bound in HISTOGRAM_BUCKETS}
+            histograms[name] = {
+                "count": len(ordered),
+                "p50": _percentile(ordered, 0.5),
+                "p99": _percentile(ordered, 0.99),
+                "timeouts": timeouts.get(name, 0),
+                "absent": absent.get(name, 0),
+                "buckets": buckets,
+            }
+        return histograms
+
+    def report(self):
+        """Print the latency distribution and the current timeout of every wait"""
+        histograms = self.histograms()
+        if not histograms:
+            return
+        print("\nWait latencies:")
+        for name, stats in sorted(histograms.items()):
+            print(f"  {name}: n={stats['count']} p50={stats['p50']:.2f}s p99={stats['p99']:.2f}s "
+                  f"timeouts={stats['timeouts']} absent={stats['absent']}")
+
+
+class WaitManager:
+    """
+    Explicit waits with timeouts derived from observed latencies.
+
+    Call sites keep their old fixed timeout as a ceiling; once enough
+    latencies are recorded the wait gives up at p99 plus a margin instead,
+    except right after a navigation, where a page load gets the full ceiling.
+    Optional elements are waited for only as long as they usually take when
+    present, down to two poll intervals, and `first_of` resolves a branch (e.g.
+    a dialog with or without a note field) as soon as either element appears.
+    """
+
+    def __init__(self, clock=None, latencies=None, poll_interval=None, registry=None):
+        if registry is None:
+            # Imported here because core modules import this one while the core package loads
+            from core.selector_registry import selectors as registry
+        self.registry = registry
+        self.clock = clock or system_clock
+        self.latencies = latencies or wait_latencies
+        self.poll_interval = poll_interval or WAIT_POLL_INTERVAL
+
+    def timeout(self, name, ceiling, optional=False):
+        return self.latencies.timeout(name, ceiling, optional)
+
+    def _poll(self, root, conditions, timeout):
+        """First (name, element) whose condition holds within timeout, with the time it took"""
+        start = self.clock.monotonic()
+        while True:
+            for name, condition in conditions:
+                try:
+                    element = condition(root)
+                except (NoSuchElementException, StaleElementReferenceException):
+                    element = None
+                if element:
+                    return name, element, self.clock.monotonic() - start
+            elapsed = self.clock.monotonic() - start
+            if elapsed >= timeout:
+                return None, None, elapsed
+            self.clock.sleep(min(self.poll_interval, timeout - elapsed))
+
+    def until(self, root, name, ceiling, visible=False, optional=False, page_load=False):
+        """
+        Wait for a registry element
+
+        Args:
+            root: WebDriver or WebElement to search in
+            name: Logical selector name
+            ceiling: Longest acceptable wait in seconds (the old fixed timeout)
+            visible: Also require the element to be displayed
+            optional: Return None instead of raising when it doesn't appear
+            page_load: The wait follows a navigation, always give it the full ceiling:
+                       one slow page load must not abort the step it starts
+
+        Returns:
+            WebElement, or None for a missing optional element
+
+        Raises:
+            TimeoutException: If a required element doesn't appear in time
+        """
+        condition = self.registry.presence_of(name, visible=visible)
+        timeout = ceiling if page_load else self.timeout(name, ceiling, optional)
+        _, element, elapsed = self._poll(root, [(name, condition)], timeout)
+        if element:
+            self.latencies.observe(name, elapsed)
+            return element
+        if optional:
+            self.latencies.record_absent(name)
+            return None
+        self.latencies.record_timeout(name, timeout)
+        raise TimeoutException(f"{name} did not appear within {timeout:.1f}s")
+
+    def first_of(self, root, names, ceiling):
+        """
+        Wait until any one of several registry elements appears
+
+        Returns:
+            tuple: (name, element) of the first element found
+
+        Raises:
+            TimeoutException: If none appears in time
+        """
+        timeout = max(self.timeout(name, ceiling) for name in names)
+        conditions = [(name, self.registry.presence_of(name)) for name in names]
+        name, element, elapsed = self._poll(root, conditions, timeout)
+        if element:
+            self.latencies.observe(name, elapsed)
+            return name, element
+        for missing in names:
+            self.latencies.record_timeout(missing, timeout)
+        raise TimeoutException(f"None of {', '.join(names)} appeared within {timeout:.1f}s")
+
+    def until_condition(self, root, condition, timeout, message=""):
+        """
+        Wait for an arbitrary condition (e.g. from expected_conditions) with a fixed timeout
+
+        Returns:
+            The condition's truthy result
+
+        Raises:
+            TimeoutException: If the condition doesn't hold in time
+        """
+        _, value, _ = self._poll(root, [(None, condition)], timeout)
+        if value:
+            return value
+        raise TimeoutException(message or f"Condition not met within {timeout:.1f}s")
+
+
+wait_latencies = WaitLatencies()